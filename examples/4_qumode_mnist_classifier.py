@@ -117,8 +117,8 @@ model = nn.Sequential(
 # shape weights: 4 layers and 32 parameters per layer
 weight_shape = {'var': (4, 32)}
 
-# Define the quantum layer using TorchLayer
-quantum_layer = qml.qnn.TorchLayer(qnn_circuit, weight_shape)
+# Define the quantum layer using TorchLayer (the QNode is built for the configuration set above)
+quantum_layer = qml.qnn.TorchLayer(qnn_circuit.qnode(), weight_shape)
 # add to the classical sequential model
 model.add_module('quantum_layer', quantum_layer)
 
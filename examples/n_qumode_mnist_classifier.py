@@ -16,6 +16,7 @@ src_dir = os.path.abspath(os.path.join(script_dir, '..', 'src'))
 if src_dir not in sys.path:
     sys.path.append(src_dir)
 
+from backends.memory_planner import plan_memory
 from layers.quantum_data_encoder import QuantumDataEncoder
 from layers.qnn_circuit import qnn_circuit
 from utils.utils import train_model, evaluate_model
@@ -33,6 +34,7 @@ config.num_basis = n_basis
 config.probabilities = True
 config.multi_output = False
 config.single_output = False
+memory_budget = 4 * 2 ** 30  # Memory budget of the Fock simulation, in bytes
 
 ### PREPROCESSING ###
 
@@ -93,6 +95,12 @@ device = 'cpu'  # Device to use for training ('cpu' or 'cuda')
 num_epochs = 1 
 num_layers = 4
 
+# The Fock state grows as n_basis ** n_qumodes: check that the circuit fits the memory budget
+# before training (a ValueError is raised otherwise). The device simulates one sample at a time.
+num_gates = (len(QuantumDataEncoder.compile_schedule(n_qumodes, classical_output))
+             + num_layers * len(QuantumNeuralNetworkLayer.compile_schedule(n_qumodes, parameter_count)))
+print(plan_memory(n_qumodes, n_basis, 1, num_gates, budget=memory_budget, requires_grad=False))
+
 # Instantiate classical Model
 #This is an example of a classical model, the user can define internal layering and activation functions (classical parameters: num layers, activation function, input size)
 model = nn.Sequential(
@@ -109,8 +117,8 @@ model = nn.Sequential(
 # shape weights: adjust based on number of layers and qumodes
 weight_shape = {'var': (num_layers, parameter_count)}
 
-# Define the quantum layer using TorchLayer
-quantum_layer = qml.qnn.TorchLayer(qnn_circuit, weight_shape)
+# Define the quantum layer using TorchLayer (the QNode is built for the configuration set above)
+quantum_layer = qml.qnn.TorchLayer(qnn_circuit.qnode(), weight_shape)
 # add to the classical sequential model
 model.add_module('quantum_layer', quantum_layer)
 
@@ -0,0 +1,104 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Compares the wall-clock time of causal self-attention on the CPU over increasing sequence lengths:
+- "unfused": the full (seq, seq) softmax followed by torch.tril, as ScaledDotProduct used to do
+  (its rows are not normalized);
+- "blocked": blocked_causal_attention, masking before the softmax and skipping the blocks above
+  the diagonal;
+- "fused": torch.nn.functional.scaled_dot_product_attention with is_causal=True.
+
+Usage:
+python scripts/benchmark_attention.py --lengths 128 256 512 1024 2048 4096 --repeats 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.scaled_dot_product import FUSED_ATTENTION, ScaledDotProduct
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark causal attention on the CPU")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[128, 256, 512, 1024, 2048, 4096],
+                        help='Sequence lengths to time')
+    parser.add_argument('--batch-size', type=int, default=1, help='Number of sequences')
+    parser.add_argument('--num-heads', type=int, default=8, help='Number of attention heads')
+    parser.add_argument('--head-length', type=int, default=64, help='Dimension of the keys and queries of a head')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of timed passes per configuration')
+    parser.add_argument('--backward', action='store_true', help='Time the forward and backward passes')
+    return parser.parse_args()
+
+
+def unfused_attention(queries, keys, values):
+    compatibility = torch.softmax(torch.matmul(queries, keys.transpose(-2, -1)) / queries.size(-1) ** 0.5, dim=-1)
+    return torch.matmul(torch.tril(compatibility), values)
+
+
+def time_attention(attention, inputs, repeats, backward):
+    """
+    Times passes of an attention function.
+
+    Parameters:
+    - attention (callable): Function of the queries, keys and values.
+    - inputs (tuple): Queries, keys and values.
+    - repeats (int): Number of timed passes.
+    - backward (bool): Whether to time the backward pass as well.
+
+    Returns:
+    - tuple: Best wall-clock time in seconds and the output of the last pass.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if backward:
+            tensors = [x.detach().requires_grad_(True) for x in inputs]
+            output = attention(*tensors)
+            output.sum().backward()
+        else:
+            with torch.no_grad():
+                output = attention(*inputs)
+        best = min(best, time.perf_counter() - start)
+    return best, output.detach()
+
+
+def main(args):
+    torch.manual_seed(0)
+    methods = {
+        "unfused": unfused_attention,
+        "blocked": ScaledDotProduct(args.head_length, mask=True, fused=False),
+    }
+    if FUSED_ATTENTION:
+        methods["fused"] = ScaledDotProduct(args.head_length, mask=True, fused=True)
+
+    print(f"{'length':>7} {'method':>8} {'ms':>10} {'speedup':>9} {'max |diff|':>11}")
+    for length in args.lengths:
+        inputs = tuple(torch.rand(args.batch_size, args.num_heads, length, args.head_length) for _ in range(3))
+        results = {name: time_attention(method, inputs, args.repeats, args.backward) for name, method in methods.items()}
+        baseline, _ = results["unfused"]
+        _, reference = results["blocked"]
+        for name, (seconds, output) in results.items():
+            # The unfused rows are not normalized, so only the masked-before-softmax outputs are compared
+            diff = "-" if name == "unfused" else f"{(output - reference).abs().max().item():.2e}"
+            print(f"{length:>7} {name:>8} {1e3 * seconds:>10.2f} {baseline / seconds:>8.2f}x {diff:>11}")
+
+
+if __name__ == '__main__':
+    main(parse_args())
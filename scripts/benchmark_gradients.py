@@ -0,0 +1,93 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Compares the wall-clock time of one forward and backward pass of the QNN with the default
+differentiation method on the Strawberry Fields device (parameter-shift, evaluated sample by
+sample) and with backpropagation through the batched PyTorch Fock backend.
+
+Usage:
+python scripts/benchmark_gradients.py --batch-sizes 1 4 16 --repeats 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_layers, num_wires
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark QNN gradient computation")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4], help='Batch sizes to time')
+    parser.add_argument('--num-features', type=int, default=10, help='Number of input features per sample')
+    parser.add_argument('--repeats', type=int, default=1, help='Number of timed passes per configuration')
+    parser.add_argument('--skip-strawberryfields', action='store_true',
+                        help='Only time the backprop mode (the Strawberry Fields passes are slow)')
+    return parser.parse_args()
+
+
+def time_gradient(qlayer, inputs, repeats):
+    """
+    Times forward and backward passes of a quantum layer.
+
+    Parameters:
+    - qlayer (torch.nn.Module): The quantum layer.
+    - inputs (torch.Tensor): Input tensor of shape (batch, num_features).
+    - repeats (int): Number of timed passes.
+
+    Returns:
+    - tuple: Best wall-clock time in seconds, gradient of the weights and gradient of the inputs.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        qlayer.zero_grad()
+        x = inputs.clone().requires_grad_(True)
+        start = time.perf_counter()
+        qlayer(x).pow(2).sum().backward()
+        best = min(best, time.perf_counter() - start)
+    return best, qlayer.var.grad.clone(), x.grad
+
+
+def main(args):
+    torch.manual_seed(0)
+    weights = torch.as_tensor(QuantumNeuralNetwork(num_layers, num_wires, qnn_circuit, backend="torch").weights)
+    layers = {"backprop": QuantumNeuralNetwork(num_layers, num_wires, qnn_circuit, backend="torch").qlayers}
+    if not args.skip_strawberryfields:
+        layers["parameter-shift"] = QuantumNeuralNetwork(num_layers, num_wires, qnn_circuit, backend="strawberryfields",
+                                                         diff_method="parameter-shift").qlayers
+    for qlayer in layers.values():
+        with torch.no_grad():
+            qlayer.var.copy_(weights)
+
+    print(f"{'batch':>6} {'diff_method':>16} {'seconds':>10} {'speedup':>9} {'max |dvar|':>11} {'max |dx|':>10}")
+    for batch_size in args.batch_sizes:
+        inputs = torch.rand(batch_size, args.num_features)
+        results = {name: time_gradient(qlayer, inputs, args.repeats) for name, qlayer in layers.items()}
+        reference = results.get("parameter-shift", results["backprop"])
+        for name, (seconds, var_grad, input_grad) in results.items():
+            speedup = reference[0] / seconds
+            var_error = (var_grad - reference[1]).abs().max().item()
+            input_error = (input_grad - reference[2]).abs().max().item()
+            print(f"{batch_size:>6} {name:>16} {seconds:>10.4f} {speedup:>8.1f}x {var_error:>11.2e} {input_error:>10.2e}")
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,96 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Measures the time to import the packages in a fresh interpreter, and checks that importing them
+does not import the heavy dependencies (PyTorch, PennyLane, Strawberry Fields, torchvision and
+scikit-learn), which are only loaded when a class or function is first used. The script exits
+with status 1 if a package imports a heavy dependency or takes longer than --max-seconds, so it
+can guard against import-time regressions.
+
+Usage:
+python scripts/benchmark_import.py --repeats 5 --max-seconds 0.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+HEAVY_MODULES = ("torch", "pennylane", "strawberryfields", "torchvision", "sklearn")
+
+# Runs in a fresh interpreter: times the statement and lists the heavy modules it imported
+PROBE = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(seconds, *[m for m in {heavy!r} if m in sys.modules])
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark package import times")
+    parser.add_argument('--packages', nargs='+', default=["layers", "models", "utils", "backends"],
+                        help='Packages that must import without their heavy dependencies')
+    parser.add_argument('--first-use', nargs='*', default=["from models import QuantumNeuralNetwork"],
+                        help='Statements that load the heavy dependencies, timed for reference')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of fresh interpreters per statement')
+    parser.add_argument('--max-seconds', type=float, default=0.5, help='Maximum import time of a package')
+    return parser.parse_args()
+
+
+def time_import(statement, repeats):
+    """
+    Times a statement in fresh interpreters.
+
+    Parameters:
+    - statement (str): The Python statement, e.g. "import layers".
+    - repeats (int): Number of interpreters.
+
+    Returns:
+    - tuple: Best time in seconds, and the heavy modules imported by the statement.
+    """
+    best, heavy = float("inf"), []
+    for _ in range(repeats):
+        probe = PROBE.format(src=SRC_DIR, statement=statement, heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout
+        seconds, *heavy = output.split()
+        best = min(best, float(seconds))
+    return best, heavy
+
+
+def main(args):
+    failures = []
+    print(f"{'statement':<42} {'seconds':>9}  heavy modules imported")
+    for statement in [f"import {package}" for package in args.packages] + args.first_use:
+        seconds, heavy = time_import(statement, args.repeats)
+        print(f"{statement:<42} {seconds:>9.4f}  {', '.join(heavy) or '-'}")
+        if statement in args.first_use:
+            continue
+        if heavy:
+            failures.append(f"'{statement}' imports {', '.join(heavy)}")
+        if seconds > args.max_seconds:
+            failures.append(f"'{statement}' takes {seconds:.3f} s (limit {args.max_seconds} s)")
+
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,65 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Reports the deviation of the QNN probabilities simulated in single precision (complex64) from
+the double precision (complex128) simulation on a random sample batch, and exits with a non-zero
+status if it exceeds the tolerance.
+
+Usage:
+python scripts/validate_precision.py --batch-size 64 --num-features 10 --tolerance 1e-5
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.precision import validate_precision
+from layers.qnn_circuit import qnn_circuit
+from layers.weight_initializer import WeightInitializer
+from utils.config import num_basis, num_layers, num_wires
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate the single precision Fock simulation")
+    parser.add_argument('--batch-size', type=int, default=64, help='Number of samples in the batch')
+    parser.add_argument('--num-features', type=int, default=10, help='Number of input features per sample')
+    parser.add_argument('--tolerance', type=float, default=1e-5, help='Maximum accepted probability deviation')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the weights and inputs')
+    return parser.parse_args()
+
+
+def main(args):
+    # The weights are drawn by numpy and the inputs by PyTorch
+    np.random.seed(args.seed)
+    torch.manual_seed(args.seed)
+    weights = {"var": torch.as_tensor(WeightInitializer.init_weights(num_layers, num_wires))}
+    inputs = torch.rand(args.batch_size, args.num_features)
+    report = validate_precision(qnn_circuit, weights, inputs, num_wires, num_basis)
+
+    print(f"{num_wires} wires, cutoff {num_basis}, batch of {args.batch_size}")
+    print(f"max probability deviation:  {report['max_deviation']:.3e}")
+    print(f"mean probability deviation: {report['mean_deviation']:.3e}")
+    print(f"forward time: {report['seconds']:.4f} s (complex64), {report['reference_seconds']:.4f} s (complex128)")
+    if report["max_deviation"] > args.tolerance:
+        print(f"Deviation exceeds the tolerance of {args.tolerance:.1e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -39,22 +39,26 @@ Available components:
 """
 
 
-from .layers import (
-    InputEmbedding,
-    MultiHeadedAttention,
-    QuantumDataEncoder,
-    QuantumNeuralNetworkLayer,
-    ScaledDotProduct,
-    WeightInitializer,
-)
+from utils.lazy_import import lazy_exports
 
-from .models import (
-    QuantumDecoder,
-    QuantumEncoder,
-    QuantumFeedForward,
-    QuantumNeuralNetwork,
-    QuantumTransformer,
-)
+# The layers and models are only imported when one of their names is first accessed, so that
+# importing the package does not import PyTorch, PennyLane or Strawberry Fields. Like the
+# subpackages, they are imported by their absolute names (with src on the path), so that they
+# are not loaded a second time as src.layers and src.models
+lazy_exports(__name__, {
+    "InputEmbedding": "layers",
+    "MultiHeadedAttention": "layers",
+    "qnn_circuit": "layers",
+    "QuantumDataEncoder": "layers",
+    "QuantumNeuralNetworkLayer": "layers",
+    "ScaledDotProduct": "layers",
+    "WeightInitializer": "layers",
+    "QuantumDecoder": "models",
+    "QuantumEncoder": "models",
+    "QuantumFeedForward": "models",
+    "QuantumNeuralNetwork": "models",
+    "QuantumTransformer": "models",
+})
 
 __all__ = [
     "InputEmbedding",
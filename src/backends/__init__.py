@@ -0,0 +1,53 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+This module initializes and defines the public API for the backends package. The package
+contains simulators that execute the circuits built from the layers package without going
+through a PennyLane device, so that a whole minibatch can be simulated in one vectorized pass.
+
+Usage:
+To import the entire API from backends:
+    from backends import *
+"""
+
+
+from utils.lazy_import import lazy_exports
+
+# The simulators import PyTorch and PennyLane, so they are only imported when one of their
+# names is first accessed
+lazy_exports(__name__, {
+    "FockBackend": ".fock_backend",
+    "GaussianBackend": ".gaussian_backend",
+    "MPSBackend": ".mps_backend",
+    "ParallelTorchLayer": ".parallel_layer",
+    "ShotSampler": ".sampling",
+    "TorchFockLayer": ".torch_fock_layer",
+    "basis_probs": ".measurements",
+    "marginal_probs": ".measurements",
+    "top_k_probs": ".measurements",
+})
+
+__all__ = [
+    "FockBackend",
+    "GaussianBackend",
+    "MPSBackend",
+    "ParallelTorchLayer",
+    "ShotSampler",
+    "TorchFockLayer",
+    "basis_probs",
+    "marginal_probs",
+    "top_k_probs",
+]
@@ -0,0 +1,103 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import torch
+
+PRECISIONS = {
+    "single": torch.complex64,
+    "double": torch.complex128,
+}
+
+
+def as_real(param, real_dtype):
+    """
+    Converts a gate parameter (float, 0-d tensor or batch of values) into a real tensor.
+
+    Parameters:
+    - param (float or torch.Tensor): The gate parameter.
+    - real_dtype (torch.dtype): The real dtype of the result.
+
+    Returns:
+    - torch.Tensor: The parameter as a tensor.
+    """
+    if isinstance(param, torch.Tensor):
+        return param.to(real_dtype)
+    return torch.as_tensor(param, dtype=real_dtype)
+
+
+def real_dtype_of(dtype):
+    """
+    Returns the real dtype matching a complex dtype (e.g. torch.float64 for torch.complex128).
+    """
+    return torch.empty(0, dtype=dtype).real.dtype
+
+
+def complex_dtype(precision):
+    """
+    Resolves a simulation precision into a complex dtype.
+
+    Parameters:
+    - precision (str or torch.dtype): "single" (complex64), "double" (complex128), or a complex dtype.
+
+    Returns:
+    - torch.dtype: The complex dtype of the simulation.
+    """
+    if isinstance(precision, torch.dtype) and precision.is_complex:
+        return precision
+    if precision in PRECISIONS:
+        return PRECISIONS[precision]
+    raise ValueError(f"Unknown precision {precision!r}, expected one of {tuple(PRECISIONS)} or a complex dtype.")
+
+
+def is_batched(op):
+    """
+    Checks whether a gate has a batched parameter, i.e. one value per sample.
+
+    Parameters:
+    - op (pennylane.operation.Operation): The gate.
+
+    Returns:
+    - bool: True if any parameter of the gate has a leading dimension.
+    """
+    return any(isinstance(param, torch.Tensor) and param.dim() > 0 for param in op.parameters)
+
+
+def batch_size(operations):
+    """
+    Infers the batch size from the gate parameters. Parameters with a leading dimension
+    are treated as one value per sample.
+
+    Parameters:
+    - operations (list): PennyLane operations.
+
+    Returns:
+    - int or None: The batch size, or None if no parameter is batched.
+    """
+    for op in operations:
+        for param in op.parameters:
+            if isinstance(param, torch.Tensor) and param.dim() > 0:
+                return param.shape[0]
+    return None
+
+
+def parameter_device(operations):
+    """
+    Returns the device of the first tensor gate parameter, or None if there is none.
+    """
+    for op in operations:
+        for param in op.parameters:
+            if isinstance(param, torch.Tensor):
+                return param.device
+    return None
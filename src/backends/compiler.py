@@ -0,0 +1,199 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from collections import Counter
+import torch
+from pennylane.wires import Wires
+from backends.circuit_utils import is_batched
+
+# Gates that are the identity when their first parameter (squeezing or displacement magnitude,
+# transmittivity angle, rotation angle or Kerr parameter) is zero
+IDENTITY_GATES = ("Squeezing", "Displacement", "Beamsplitter", "Rotation", "Kerr")
+
+
+class FusedGate:
+    """
+    A block of consecutive gates that is applied to the state as a single operator.
+
+    The block records its gates and the backend executing it materializes the operator, e.g.
+    the FockBackend composes the truncated gate matrices into one dense matrix on the Fock
+    space of the block's wires. An operator computed beforehand can be attached as ``matrix``.
+
+    Usage:
+    To use the FusedGate class, import it as follows:
+    from backends.compiler import FusedGate
+
+    Example:
+    block = FusedGate(tape.operations[10:21])
+    print(block.wires, len(block.operations))
+    """
+
+    name = "FusedGate"
+
+    def __init__(self, operations, matrix=None):
+        """
+        Initializes the FusedGate class with the given gates.
+
+        Parameters:
+        - operations (list): PennyLane operations, in the order they are applied.
+        - matrix (torch.Tensor, optional): Precomputed operator of the block. Default is None.
+        """
+        self.operations = list(operations)
+        self.matrix = matrix
+        self.wires = Wires.all_wires([op.wires for op in self.operations])
+        self.parameters = [param for op in self.operations for param in op.parameters]
+
+    def __repr__(self):
+        return f"FusedGate({len(self.operations)} gates, wires={self.wires.tolist()})"
+
+
+def fuse_operations(operations, cutoff_dim, max_dim=1024):
+    """
+    Compiles a sequence of gates by fusing the blocks shared by every sample of a batch.
+
+    Gates without batched parameters (the QNN weights: its interferometers, squeezers,
+    displacements and Kerr gates) do not depend on the sample, so each maximal run of them
+    is replaced by a FusedGate. The backend builds its operator once per execution and applies
+    it to the whole batch with a single matmul, instead of contracting the state gate by gate.
+    Gates with batched parameters (the encoded features) are kept as they are, since building
+    one operator per sample costs more than applying the gates directly.
+
+    A block is closed as soon as adding a gate would make its Fock space dimension
+    cutoff_dim ** len(wires) exceed max_dim, which bounds the size of the fused operators.
+
+    Parameters:
+    - operations (list): PennyLane operations.
+    - cutoff_dim (int): Fock space cutoff dimension.
+    - max_dim (int, optional): Maximum dimension of a fused operator. Default is 1024.
+
+    Returns:
+    - list: The compiled operations, in which runs of at least two weight-only gates are
+      replaced by FusedGate blocks. FusedGate blocks already present are kept as they are.
+    """
+    compiled = []
+    block = []
+    block_wires = Wires([])
+
+    def close_block():
+        if len(block) > 1:
+            compiled.append(FusedGate(block))
+        else:
+            compiled.extend(block)
+        block.clear()
+
+    for op in operations:
+        if is_batched(op) or isinstance(op, FusedGate):
+            close_block()
+            block_wires = Wires([])
+            compiled.append(op)
+            continue
+
+        wires = Wires.all_wires([block_wires, op.wires])
+        if cutoff_dim ** len(wires) > max_dim:
+            close_block()
+            wires = op.wires
+        block.append(op)
+        block_wires = wires
+
+    close_block()
+    return compiled
+
+
+class DeadGateReport:
+    """
+    Summary of a dead-gate elimination pass over one circuit.
+
+    Usage:
+    To use the DeadGateReport class, import it as follows:
+    from backends.compiler import DeadGateReport
+
+    Example:
+    operations, report = eliminate_dead_gates(tape.operations, tol=1e-6)
+    print(report.num_removed, report.removed)
+    """
+
+    def __init__(self, num_gates, removed):
+        """
+        Initializes the DeadGateReport class with the given counts.
+
+        Parameters:
+        - num_gates (int): Number of gates in the circuit before elimination.
+        - removed (dict): Number of removed gates per gate name.
+        """
+        self.num_gates = num_gates
+        self.removed = removed
+
+    @property
+    def num_removed(self):
+        """
+        Returns the total number of removed gates.
+        """
+        return sum(self.removed.values())
+
+    def __repr__(self):
+        return f"DeadGateReport(removed {self.num_removed} of {self.num_gates} gates: {self.removed})"
+
+
+def is_identity(op, tol=0.0):
+    """
+    Checks whether a gate acts as the identity (up to the tolerance) on every sample of the batch.
+
+    Gates with a parameter that requires gradients are never considered dead, since the
+    derivative of the circuit with respect to that parameter is generally non-zero even
+    where the gate itself is the identity.
+
+    Parameters:
+    - op (pennylane.operation.Operation): The gate.
+    - tol (float, optional): Largest absolute value of the first parameter for which the
+      gate is dropped. Default is 0.0 (exact identities only).
+
+    Returns:
+    - bool: True if the gate can be removed from the circuit.
+    """
+    if op.name not in IDENTITY_GATES:
+        return False
+    if any(isinstance(param, torch.Tensor) and param.requires_grad for param in op.parameters):
+        return False
+    param = op.parameters[0]
+    if isinstance(param, torch.Tensor):
+        return bool(torch.all(torch.abs(param) <= tol))
+    return abs(param) <= tol
+
+
+def eliminate_dead_gates(operations, tol=0.0):
+    """
+    Drops the gates that act as the identity, such as the gates encoding zero-padded features
+    or the active QNN gates initialized close to zero by WeightInitializer.
+
+    A Squeezing, Displacement, Beamsplitter, Rotation or Kerr gate is removed if its first
+    parameter is at most tol in absolute value for every sample (see ``is_identity``). With
+    the default tol=0.0 the simulation results are unchanged; a positive tolerance also drops
+    near-identity gates at the cost of an error of the order of tol.
+
+    Parameters:
+    - operations (list): PennyLane operations.
+    - tol (float, optional): Tolerance on the first gate parameter. Default is 0.0.
+
+    Returns:
+    - tuple (list, DeadGateReport): The remaining operations and a report of the removed gates.
+    """
+    kept = []
+    removed = Counter()
+    for op in operations:
+        if is_identity(op, tol):
+            removed[op.name] += 1
+        else:
+            kept.append(op)
+    return kept, DeadGateReport(len(operations), dict(removed))
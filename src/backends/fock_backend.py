@@ -0,0 +1,570 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import numpy as np
+import torch
+from pennylane.measurements import Expectation, Probability
+from backends.circuit_utils import as_real, batch_size, complex_dtype, parameter_device, real_dtype_of
+from backends.compiler import eliminate_dead_gates, fuse_operations
+from backends.gate_cache import gate_cache, gate_tables
+from backends.gaussian_backend import GaussianBackend
+from backends.measurements import BasisProbsMP, MarginalProbsMP, TopKProbsMP, basis_indices
+
+
+def displacement_matrix(r, phi, cutoff, dtype=torch.complex128):
+    """
+    Computes the Fock representation of the displacement gate D(r e^{i phi}) truncated to
+    the given cutoff, following the conventions of The Walrus (and hence Strawberry Fields).
+    The matrix is evaluated from the precomputed coefficient tables of ``recurrence_tables``.
+
+    Parameters:
+    - r (float or torch.Tensor): Displacement magnitude, optionally batched with shape (batch,).
+    - phi (float or torch.Tensor): Displacement angle, optionally batched with shape (batch,).
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype, optional): Complex dtype of the result. Default is torch.complex128.
+
+    Returns:
+    - torch.Tensor: Matrix of shape (..., cutoff, cutoff).
+    """
+    real_dtype = real_dtype_of(dtype)
+    r, phi = torch.broadcast_tensors(as_real(r, real_dtype), as_real(phi, real_dtype))
+    tables = gate_tables("Displacement", cutoff, real_dtype, r.device)
+    r_pow = r.unsqueeze(-1) ** torch.arange(2 * cutoff - 1, dtype=real_dtype, device=r.device)
+    magnitude = (tables["coef"] * r_pow[..., tables["power"]]).sum(-1)
+    magnitude = magnitude * torch.exp(-0.5 * r ** 2)[..., None, None]
+    return magnitude * torch.exp(1j * (phi[..., None, None] * tables["phase"]))
+
+
+def squeezing_matrix(r, phi, cutoff, dtype=torch.complex128):
+    """
+    Computes the Fock representation of the squeezing gate S(r e^{i phi}) truncated to
+    the given cutoff, following the conventions of The Walrus (and hence Strawberry Fields).
+    The matrix is evaluated from the precomputed coefficient tables of ``recurrence_tables``.
+
+    Parameters:
+    - r (float or torch.Tensor): Squeezing magnitude, optionally batched with shape (batch,).
+    - phi (float or torch.Tensor): Squeezing angle, optionally batched with shape (batch,).
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype, optional): Complex dtype of the result. Default is torch.complex128.
+
+    Returns:
+    - torch.Tensor: Matrix of shape (..., cutoff, cutoff).
+    """
+    real_dtype = real_dtype_of(dtype)
+    r, phi = torch.broadcast_tensors(as_real(r, real_dtype), as_real(phi, real_dtype))
+    tables = gate_tables("Squeezing", cutoff, real_dtype, r.device)
+    exponents = torch.arange(cutoff, dtype=real_dtype, device=r.device)
+    sechr = 1.0 / torch.cosh(r)
+    tanh_pow = torch.tanh(r).unsqueeze(-1) ** exponents
+    sech_pow = sechr.unsqueeze(-1) ** exponents
+    magnitude = (tables["coef"] * tanh_pow[..., tables["power"]] * sech_pow[..., None, None, :]).sum(-1)
+    magnitude = magnitude * torch.sqrt(sechr)[..., None, None]
+    return magnitude * torch.exp(1j * (phi[..., None, None] * tables["phase"]))
+
+
+def beamsplitter_tensor(theta, phi, cutoff, dtype=torch.complex128):
+    """
+    Computes the Fock representation of the beamsplitter gate BS(theta, phi) truncated to
+    the given cutoff, following the conventions of The Walrus (and hence Strawberry Fields).
+    Only the entries conserving the total photon number are evaluated, from the precomputed
+    coefficient tables of ``recurrence_tables``.
+
+    Parameters:
+    - theta (float or torch.Tensor): Transmittivity angle, optionally batched with shape (batch,).
+    - phi (float or torch.Tensor): Phase angle, optionally batched with shape (batch,).
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype, optional): Complex dtype of the result. Default is torch.complex128.
+
+    Returns:
+    - torch.Tensor: Tensor of shape (..., cutoff, cutoff, cutoff, cutoff) holding the matrix
+      elements <m, n| BS |p, q> at index [m, n, p, q].
+    """
+    real_dtype = real_dtype_of(dtype)
+    theta, phi = torch.broadcast_tensors(as_real(theta, real_dtype), as_real(phi, real_dtype))
+    tables = gate_tables("Beamsplitter", cutoff, real_dtype, theta.device)
+    exponents = torch.arange(2 * cutoff - 1, dtype=real_dtype, device=theta.device)
+    cos_pow = torch.cos(theta).unsqueeze(-1) ** exponents
+    sin_pow = torch.sin(theta).unsqueeze(-1) ** exponents
+    entries = (tables["coef"] * cos_pow[..., tables["cos_power"]] * sin_pow[..., tables["sin_power"]]).sum(-1)
+    entries = entries * torch.exp(1j * (phi.unsqueeze(-1) * tables["phase"]))
+    flat = torch.zeros(theta.shape + (cutoff ** 4,), dtype=entries.dtype, device=theta.device)
+    return flat.index_copy(-1, tables["index"], entries).reshape(theta.shape + (cutoff,) * 4)
+
+
+def rotation_phases(phi, cutoff, dtype=torch.complex128):
+    """
+    Computes the diagonal of the rotation gate R(phi) = exp(i phi n).
+
+    Parameters:
+    - phi (float or torch.Tensor): Rotation angle, optionally batched with shape (batch,).
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype, optional): Complex dtype of the result. Default is torch.complex128.
+
+    Returns:
+    - torch.Tensor: Diagonal of shape (..., cutoff).
+    """
+    real_dtype = real_dtype_of(dtype)
+    phi = as_real(phi, real_dtype)
+    n = torch.arange(cutoff, dtype=real_dtype, device=phi.device)
+    return torch.exp(1j * (phi.unsqueeze(-1) * n))
+
+
+def kerr_phases(kappa, cutoff, dtype=torch.complex128):
+    """
+    Computes the diagonal of the Kerr gate K(kappa) = exp(i kappa n^2).
+
+    Parameters:
+    - kappa (float or torch.Tensor): Kerr parameter, optionally batched with shape (batch,).
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype, optional): Complex dtype of the result. Default is torch.complex128.
+
+    Returns:
+    - torch.Tensor: Diagonal of shape (..., cutoff).
+    """
+    real_dtype = real_dtype_of(dtype)
+    kappa = as_real(kappa, real_dtype)
+    n = torch.arange(cutoff, dtype=real_dtype, device=kappa.device)
+    return torch.exp(1j * (kappa.unsqueeze(-1) * n ** 2))
+
+
+class FockBackend:
+    """
+    A batched Fock-space simulator for photonic circuits written in PyTorch.
+
+    The backend holds the state of a whole minibatch as a single tensor of shape
+    (batch, cutoff, ..., cutoff) and applies Squeezing, Beamsplitter, Rotation,
+    Displacement and Kerr gates as dense tensor contractions. Gate parameters may be
+    scalars (shared by every sample, e.g. the QNN weights) or tensors of shape (batch,)
+    (one value per sample, e.g. the encoded features). All operations are differentiable
+    with autograd, so gradients are obtained by backpropagation in a single reverse pass.
+
+    The gate matrices follow the Strawberry Fields conventions, so for the same circuit the
+    backend reproduces the outputs of the ``strawberryfields.fock`` device. Optionally
+    (gaussian_fast_path=True), circuits that are Gaussian (no Kerr gate, or only Kerr gates with
+    zero parameters) and only measure quadratures are dispatched to the polynomial-cost
+    GaussianBackend instead, whose untruncated results differ from the Fock simulation.
+
+    Usage:
+    To use the FockBackend class, import it as follows:
+    from backends.fock_backend import FockBackend
+
+    Example:
+    backend = FockBackend(num_wires=6, cutoff_dim=2)
+    output = backend.execute(tape)
+    """
+
+    def __init__(self, num_wires, cutoff_dim, hbar=2.0, dtype=torch.complex128, gaussian_fast_path=False,
+                 cache=None, fusion=True, max_fused_dim=1024, dead_gate_tol=0.0, sampler=None):
+        """
+        Initializes the FockBackend class with the given parameters.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes) in the quantum circuit.
+        - cutoff_dim (int): Fock space cutoff dimension (number of basis states per wire).
+        - hbar (float, optional): Value of hbar used for quadrature observables. Default is 2.0,
+          matching Strawberry Fields.
+        - dtype (torch.dtype or str, optional): Complex dtype of the simulation, or its precision
+          "single" (torch.complex64) or "double" (torch.complex128). Single precision halves the
+          memory of the state. Default is torch.complex128.
+        - gaussian_fast_path (bool, optional): Whether to run circuits without any Kerr nonlinearity
+          that only measure quadratures on the GaussianBackend. The Gaussian simulation is exact,
+          i.e. it corresponds to the Fock simulation without truncation, so its results disagree
+          with the truncated simulation (and with ``strawberryfields.fock``) at any finite cutoff,
+          and they jump when a Kerr parameter becomes nonzero. Default is False.
+        - cache (GateMatrixCache, optional): Cache of materialized gate matrices. Default is None,
+          which uses the cache shared by all backends of the process.
+        - fusion (bool, optional): Whether to compile batched circuits with ``fuse_operations``, so that
+          each block of weight-only gates is applied as a single operator. Default is True.
+        - max_fused_dim (int, optional): Maximum dimension cutoff_dim ** len(wires) of a fused operator.
+          Default is 1024.
+        - dead_gate_tol (float, optional): Tolerance of ``eliminate_dead_gates``, which drops the gates
+          acting as the identity before the simulation. Default is 0.0, which only removes exact
+          identities; None disables the pass.
+        - sampler (ShotSampler, optional): Replaces the exact probabilities and quadrature expectation
+          values by finite-shot estimates. Sampled circuits are always simulated in the Fock basis.
+          Default is None (exact results).
+        """
+        self.num_wires = num_wires
+        self.cutoff_dim = cutoff_dim
+        self.hbar = hbar
+        self.dtype = complex_dtype(dtype)
+        self.sampler = sampler
+        gaussian_fast_path = gaussian_fast_path and sampler is None
+        self.gaussian = GaussianBackend(num_wires, hbar, real_dtype_of(self.dtype)) if gaussian_fast_path else None
+        self.cache = gate_cache if cache is None else cache
+        self.fusion = fusion
+        self.max_fused_dim = max_fused_dim
+        self.dead_gate_tol = dead_gate_tol
+        # Report of the dead-gate elimination pass over the last simulated circuit
+        self.last_report = None
+
+    def vacuum(self, batch_size, device=None):
+        """
+        Prepares a batch of vacuum states.
+
+        Parameters:
+        - batch_size (int): Number of samples in the batch.
+        - device (torch.device, optional): Device to allocate the state on. Default is None (CPU).
+
+        Returns:
+        - torch.Tensor: State tensor of shape (batch_size, cutoff, ..., cutoff).
+        """
+        state = torch.zeros((batch_size,) + (self.cutoff_dim,) * self.num_wires, dtype=self.dtype, device=device)
+        state[(slice(None),) + (0,) * self.num_wires] = 1.0
+        return state
+
+    @staticmethod
+    def batch_size(operations):
+        """
+        Infers the batch size from the gate parameters. Parameters with a leading dimension
+        are treated as one value per sample.
+
+        Parameters:
+        - operations (list): PennyLane operations.
+
+        Returns:
+        - int or None: The batch size, or None if no parameter is batched.
+        """
+        return batch_size(operations)
+
+    def apply(self, operations, state):
+        """
+        Applies a sequence of gates to a batch of states.
+
+        Parameters:
+        - operations (list): PennyLane operations (Squeezing, Beamsplitter, Rotation,
+          Displacement or Kerr) or FusedGate blocks.
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+
+        Returns:
+        - torch.Tensor: The evolved state tensor.
+        """
+        for op in operations:
+            state = self.apply_operation(op, state)
+        return state
+
+    def apply_operation(self, op, state):
+        """
+        Applies a single gate to a batch of states.
+
+        Parameters:
+        - op (pennylane.operation.Operation or FusedGate): The gate to apply.
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+
+        Returns:
+        - torch.Tensor: The evolved state tensor.
+        """
+        wires = op.wires.tolist()
+        params = op.parameters
+        cutoff = self.cutoff_dim
+
+        if op.name == "Squeezing":
+            matrix = self.cache.get(op.name, params, cutoff, self.dtype, squeezing_matrix)
+            return self._apply_single(state, matrix, wires[0])
+        if op.name == "Displacement":
+            matrix = self.cache.get(op.name, params, cutoff, self.dtype, displacement_matrix)
+            return self._apply_single(state, matrix, wires[0])
+        if op.name == "Rotation":
+            return self._apply_diagonal(state, rotation_phases(*params, cutoff, self.dtype), wires[0])
+        if op.name == "Kerr":
+            return self._apply_diagonal(state, kerr_phases(*params, cutoff, self.dtype), wires[0])
+        if op.name == "Beamsplitter":
+            tensor = self.cache.get(op.name, params, cutoff, self.dtype, beamsplitter_tensor)
+            return self._apply_two(state, tensor, wires)
+        if op.name == "FusedGate":
+            matrix = self.fused_operator(op) if op.matrix is None else op.matrix
+            return self._apply_multi(state, matrix, wires)
+
+        raise ValueError(f"Operation {op.name} is not supported by the Fock backend.")
+
+    def _apply_single(self, state, matrix, wire):
+        """
+        Contracts a (batched) single-mode matrix with the given wire of the state.
+        """
+        c = self.cutoff_dim
+        state = torch.movedim(state, wire + 1, -1)
+        shape = state.shape
+        if matrix.dim() == 2:
+            state = torch.matmul(state, matrix.transpose(0, 1))
+        else:
+            state = torch.matmul(state.reshape(shape[0], -1, c), matrix.transpose(-1, -2)).reshape(shape)
+        return torch.movedim(state, -1, wire + 1)
+
+    def _apply_diagonal(self, state, phases, wire):
+        """
+        Multiplies the given wire of the state by a (batched) diagonal gate.
+        """
+        c = self.cutoff_dim
+        state = torch.movedim(state, wire + 1, -1)
+        shape = state.shape
+        if phases.dim() == 1:
+            state = state * phases
+        else:
+            state = (state.reshape(shape[0], -1, c) * phases.unsqueeze(1)).reshape(shape)
+        return torch.movedim(state, -1, wire + 1)
+
+    def _apply_two(self, state, tensor, wires):
+        """
+        Contracts a (batched) two-mode tensor with the given pair of wires of the state.
+        """
+        c = self.cutoff_dim
+        source = [wires[0] + 1, wires[1] + 1]
+        state = torch.movedim(state, source, [-2, -1])
+        shape = state.shape
+        if tensor.dim() == 4:
+            matrix = tensor.reshape(c * c, c * c)
+            state = torch.matmul(state.reshape(shape[:-2] + (c * c,)), matrix.transpose(0, 1))
+        else:
+            matrix = tensor.reshape(-1, c * c, c * c)
+            state = torch.matmul(state.reshape(shape[0], -1, c * c), matrix.transpose(-1, -2))
+        return torch.movedim(state.reshape(shape), [-2, -1], source)
+
+    def _apply_multi(self, state, matrix, wires):
+        """
+        Contracts a dense operator on the Fock space of several wires with the state.
+        """
+        source = [w + 1 for w in wires]
+        target = list(range(-len(wires), 0))
+        state = torch.movedim(state, source, target)
+        shape = state.shape
+        state = torch.matmul(state.reshape(shape[:-len(wires)] + (-1,)), matrix.transpose(0, 1))
+        return torch.movedim(state.reshape(shape), target, source)
+
+    def fused_operator(self, block):
+        """
+        Composes the truncated matrices of the gates of a block into one operator, by applying
+        them to every Fock basis state of the block's wires. The result is identical to
+        applying the gates one by one.
+
+        Parameters:
+        - block (FusedGate): A block of gates without batched parameters.
+
+        Returns:
+        - torch.Tensor: Matrix of shape (cutoff ** k, cutoff ** k) for the k wires of the block,
+          in lexicographic order of the basis states.
+        """
+        c = self.cutoff_dim
+        k = len(block.wires)
+        dim = c ** k
+        wire_map = {wire: i for i, wire in enumerate(block.wires)}
+        sub_backend = FockBackend(k, c, self.hbar, self.dtype, gaussian_fast_path=False, cache=self.cache, fusion=False)
+        basis = torch.eye(dim, dtype=self.dtype, device=parameter_device(block.operations))
+        columns = sub_backend.apply([op.map_wires(wire_map) for op in block.operations], basis.reshape((dim,) + (c,) * k))
+        return columns.reshape(dim, dim).transpose(0, 1)
+
+    def probs(self, state, wires):
+        """
+        Computes the Fock basis probabilities of the given wires, tracing out the others.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wires (list): Wires to return probabilities for.
+
+        Returns:
+        - torch.Tensor: Probabilities of shape (batch, cutoff ** len(wires)), in lexicographic
+          order of the basis states.
+        """
+        batch = state.shape[0]
+        probs = torch.abs(state) ** 2
+        probs = torch.movedim(probs, [w + 1 for w in wires], list(range(1, len(wires) + 1)))
+        return probs.reshape(batch, self.cutoff_dim ** len(wires), -1).sum(-1)
+
+    def quad_expectation(self, state, wire, phi=0.0):
+        """
+        Computes the expectation value of the rotated quadrature cos(phi) x + sin(phi) p.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wire (int): The measured wire.
+        - phi (float, optional): Quadrature angle. Default is 0.0 (the x quadrature).
+
+        Returns:
+        - torch.Tensor: Expectation values of shape (batch,).
+        """
+        c = self.cutoff_dim
+        batch = state.shape[0]
+        amplitudes = torch.movedim(state, wire + 1, -1).reshape(batch, -1, c)
+        sqrt_n = torch.sqrt(torch.arange(1, c, dtype=amplitudes.real.dtype, device=state.device))
+        # <a> = sum_n sqrt(n + 1) conj(psi_n) psi_{n + 1}
+        a = (torch.conj(amplitudes[..., :-1]) * sqrt_n * amplitudes[..., 1:]).sum(dim=(1, 2))
+        a = a * complex(math.cos(phi), -math.sin(phi))
+        return 2.0 * math.sqrt(self.hbar / 2) * a.real
+
+    def reduced_density_matrix(self, state, wire):
+        """
+        Computes the reduced density matrix of a wire, tracing out the others.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wire (int): The wire.
+
+        Returns:
+        - torch.Tensor: Density matrices of shape (batch, cutoff, cutoff).
+        """
+        amplitudes = torch.movedim(state, wire + 1, -1).reshape(state.shape[0], -1, self.cutoff_dim)
+        return torch.einsum("bkm,bkn->bmn", amplitudes, amplitudes.conj())
+
+    def marginal_probs(self, state, wires):
+        """
+        Computes the Fock basis probabilities of every given wire on its own.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wires (list): Wires to return marginals for.
+
+        Returns:
+        - torch.Tensor: Marginals of shape (batch, len(wires) * cutoff).
+        """
+        probs = torch.abs(state) ** 2
+        everything = set(range(1, self.num_wires + 1))
+        return torch.cat([probs.sum(dim=sorted(everything - {w + 1})) for w in wires], dim=-1)
+
+    def basis_probs(self, state, wires, states):
+        """
+        Computes the probabilities of selected Fock basis states of the given wires, tracing out
+        the others. If every wire is selected, only the selected amplitudes are read.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wires (list): Wires the basis states are defined on.
+        - states (array-like): Basis states of shape (num_states, len(wires)).
+
+        Returns:
+        - torch.Tensor: Probabilities of shape (batch, num_states).
+        """
+        states = np.asarray(states)
+        if sorted(wires) == list(range(self.num_wires)):
+            order = [wires.index(w) for w in range(self.num_wires)]
+            indices = torch.as_tensor(basis_indices(states[:, order], self.cutoff_dim), device=state.device)
+            return torch.abs(state.reshape(state.shape[0], -1)[:, indices]) ** 2
+        indices = torch.as_tensor(basis_indices(states, self.cutoff_dim), device=state.device)
+        return self.probs(state, wires)[:, indices]
+
+    def top_k_probs(self, state, wires, k):
+        """
+        Computes the k most probable Fock basis states of the given wires.
+
+        Parameters:
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+        - wires (list): Wires the basis states are defined on.
+        - k (int): Number of basis states.
+
+        Returns:
+        - torch.Tensor: Tensor of shape (batch, 2, k) holding the probabilities in decreasing order
+          and the ``qml.probs`` indices of the basis states.
+        """
+        values, indices = torch.topk(self.probs(state, wires), k)
+        return torch.stack([values, indices.to(values.dtype)], dim=1)
+
+    def measure(self, measurements, state):
+        """
+        Evaluates the measurements of a tape on the final state.
+
+        Parameters:
+        - measurements (list): PennyLane measurement processes (``qml.probs``, ``qml.expval`` of
+          ``qml.X`` / ``qml.P``, or the measurements of backends.measurements).
+        - state (torch.Tensor): State tensor of shape (batch, cutoff, ..., cutoff).
+
+        Returns:
+        - torch.Tensor: The measurement results with a leading batch dimension.
+        """
+        results = []
+        for m in measurements:
+            if m.return_type is Probability:
+                wires = m.wires.tolist() or list(range(self.num_wires))
+                probs = self.probs(state, wires)
+                results.append(probs if self.sampler is None else self.sampler.probabilities(probs))
+            elif m.return_type is Expectation and m.obs.name in ("X", "P"):
+                phi = 0.0 if m.obs.name == "X" else math.pi / 2
+                if self.sampler is None:
+                    results.append(self.quad_expectation(state, m.obs.wires[0], phi))
+                else:
+                    rho = self.reduced_density_matrix(state, m.obs.wires[0])
+                    results.append(self.sampler.expval(rho, phi, self.hbar))
+            elif self.sampler is not None:
+                raise ValueError(f"Measurement {m} is not supported when sampling shots.")
+            elif isinstance(m, MarginalProbsMP):
+                results.append(self.marginal_probs(state, m.wires.tolist() or list(range(self.num_wires))))
+            elif isinstance(m, BasisProbsMP):
+                results.append(self.basis_probs(state, m.wires.tolist() or list(range(self.num_wires)), m.states))
+            elif isinstance(m, TopKProbsMP):
+                results.append(self.top_k_probs(state, m.wires.tolist() or list(range(self.num_wires)), m.k))
+            else:
+                raise ValueError(f"Measurement {m} is not supported by the Fock backend.")
+
+        if len(results) == 1:
+            return results[0]
+        return torch.cat([r.reshape(state.shape[0], -1) for r in results], dim=-1)
+
+    def execute(self, tape):
+        """
+        Simulates a recorded circuit for every sample of the batch in one vectorized pass.
+
+        Parameters:
+        - tape (pennylane.tape.QuantumTape): The recorded circuit. Gate parameters with a
+          leading dimension are treated as one value per sample.
+
+        Returns:
+        - torch.Tensor: The measurement results. If the tape is not batched, the leading batch
+          dimension is removed.
+        """
+        if self.gaussian is not None and self.gaussian.supports(tape):
+            return self.gaussian.execute(tape)
+        return self.simulate(tape.operations, tape.measurements)
+
+    def compile(self, operations):
+        """
+        Compiles a sequence of gates into the operations that are applied to the state, by
+        eliminating the dead gates and, for batched circuits, fusing the weight-only gates.
+
+        Parameters:
+        - operations (list): PennyLane operations or FusedGate blocks.
+
+        Returns:
+        - tuple: The compiled operations, and the DeadGateReport of the elimination pass (None if
+          the pass is disabled).
+        """
+        report = None
+        if self.dead_gate_tol is not None:
+            operations, report = eliminate_dead_gates(operations, self.dead_gate_tol)
+        if self.fusion and batch_size(operations) is not None:
+            # Fused operators are built once and shared by the whole batch, so they only pay off
+            # when there is a batch to share them with
+            operations = fuse_operations(operations, self.cutoff_dim, self.max_fused_dim)
+        return operations, report
+
+    def simulate(self, operations, measurements):
+        """
+        Simulates a sequence of gates and measurements in the Fock basis.
+
+        Parameters:
+        - operations (list): PennyLane operations or FusedGate blocks. Gate parameters with a
+          leading dimension are treated as one value per sample.
+        - measurements (list): PennyLane measurement processes.
+
+        Returns:
+        - torch.Tensor: The measurement results. If no gate is batched, the leading batch
+          dimension is removed.
+        """
+        size = batch_size(operations)
+        device = parameter_device(operations)
+        operations, report = self.compile(operations)
+        if report is not None:
+            self.last_report = report
+        state = self.vacuum(size or 1, device)
+        state = self.apply(operations, state)
+        results = self.measure(measurements, state)
+        return results if size is not None else results[0]
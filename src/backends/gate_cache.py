@@ -0,0 +1,250 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import functools
+import itertools
+import math
+from collections import OrderedDict
+import torch
+
+
+def _displacement_table(cutoff):
+    """
+    <m|D(r e^{i phi})|n> = exp(-r^2 / 2) e^{i phi (m - n)} sum_k coef[m, n, k] r^{power[m, n, k]}
+    """
+    coef = torch.zeros(cutoff, cutoff, cutoff, dtype=torch.float64)
+    power = torch.zeros(cutoff, cutoff, cutoff, dtype=torch.long)
+    for m, n in itertools.product(range(cutoff), repeat=2):
+        for k in range(min(m, n) + 1):
+            coef[m, n, k] = (-1) ** (n - k) * math.sqrt(math.factorial(m) * math.factorial(n)) / (
+                math.factorial(k) * math.factorial(m - k) * math.factorial(n - k))
+            power[m, n, k] = m + n - 2 * k
+    phase = torch.arange(cutoff).unsqueeze(1) - torch.arange(cutoff).unsqueeze(0)
+    return {"coef": coef, "power": power, "phase": phase.to(torch.float64)}
+
+
+def _squeezing_table(cutoff):
+    """
+    <m|S(r e^{i phi})|n> = sqrt(sech r) e^{i phi (m - n) / 2}
+                           sum_k coef[m, n, k] tanh(r)^{power[m, n, k]} sech(r)^k
+    """
+    coef = torch.zeros(cutoff, cutoff, cutoff, dtype=torch.float64)
+    power = torch.zeros(cutoff, cutoff, cutoff, dtype=torch.long)
+    for m, n in itertools.product(range(cutoff), repeat=2):
+        if (m + n) % 2:
+            continue
+        for k in range(m % 2, min(m, n) + 1, 2):
+            j, l = (m - k) // 2, (n - k) // 2
+            coef[m, n, k] = (-1) ** j * math.sqrt(math.factorial(m) * math.factorial(n)) / (
+                math.factorial(k) * math.factorial(j) * math.factorial(l) * 2 ** (j + l))
+            power[m, n, k] = j + l
+    phase = (torch.arange(cutoff).unsqueeze(1) - torch.arange(cutoff).unsqueeze(0)) / 2
+    return {"coef": coef, "power": power, "phase": phase.to(torch.float64)}
+
+
+def _beamsplitter_table(cutoff):
+    """
+    For the entries conserving the photon number (m + n = p + q), stored at the flat indices ``index``,
+    <m, n|BS(theta, phi)|p, q> = e^{i phi (p - m)} sum_i coef[., i] cos(theta)^{power[., i]} sin(theta)^{p + q - power[., i]}
+    """
+    index, coef, power, phase, total = [], [], [], [], []
+    for m, n, p, q in itertools.product(range(cutoff), repeat=4):
+        if m + n != p + q:
+            continue
+        norm = math.sqrt(math.factorial(m) * math.factorial(n) / (math.factorial(p) * math.factorial(q)))
+        row_coef, row_power = [0.0] * cutoff, [0] * cutoff
+        for i in range(max(0, m - q), min(p, m) + 1):
+            row_coef[i] = (-1) ** (m - i) * math.comb(p, i) * math.comb(q, m - i) * norm
+            row_power[i] = 2 * i + q - m
+        index.append(((m * cutoff + n) * cutoff + p) * cutoff + q)
+        coef.append(row_coef)
+        power.append(row_power)
+        phase.append(p - m)
+        total.append(p + q)
+    power = torch.tensor(power)
+    return {
+        "index": torch.tensor(index),
+        "coef": torch.tensor(coef, dtype=torch.float64),
+        "cos_power": power,
+        "sin_power": torch.tensor(total).unsqueeze(1) - power,
+        "phase": torch.tensor(phase, dtype=torch.float64),
+    }
+
+
+_TABLE_BUILDERS = {
+    "Displacement": _displacement_table,
+    "Squeezing": _squeezing_table,
+    "Beamsplitter": _beamsplitter_table,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def recurrence_tables(gate, cutoff):
+    """
+    Precomputes the parameter-independent coefficients of the Fock matrix elements of a gate.
+    The tables are built once per (gate, cutoff) pair and process, after which a whole batch
+    of matrices is obtained from powers of the gate parameters with a few tensor operations,
+    instead of unrolling the recurrence relations entry by entry.
+
+    Parameters:
+    - gate (str): Gate name ("Displacement", "Squeezing" or "Beamsplitter").
+    - cutoff (int): Fock space cutoff dimension.
+
+    Returns:
+    - dict: Tables of coefficients, exponents and phase multipliers (float64 / long tensors).
+    """
+    return _TABLE_BUILDERS[gate](cutoff)
+
+
+@functools.lru_cache(maxsize=None)
+def gate_tables(gate, cutoff, dtype, device):
+    """
+    Returns the recurrence tables of a gate converted to the requested real dtype and device.
+    The converted tables are cached per (gate, cutoff, dtype, device), so they are copied once
+    rather than at every gate evaluation; they must not be modified in place.
+
+    Parameters:
+    - gate (str): Gate name ("Displacement", "Squeezing" or "Beamsplitter").
+    - cutoff (int): Fock space cutoff dimension.
+    - dtype (torch.dtype): Real dtype of the coefficient tables.
+    - device (torch.device): Device of the tables.
+
+    Returns:
+    - dict: The converted tables. Index tables keep their integer dtype.
+    """
+    tables = recurrence_tables(gate, cutoff)
+    return {name: t.to(device=device, dtype=dtype if t.is_floating_point() else t.dtype)
+            for name, t in tables.items()}
+
+
+class GateMatrixCache:
+    """
+    A cache layer for the Fock matrices of the Squeezing, Displacement and Beamsplitter gates.
+
+    Two levels are cached:
+    - the parameter-independent recurrence tables, once per (gate, cutoff) and process
+      (see ``recurrence_tables``), and
+    - fully materialized matrices for repeated parameter values, in a bounded LRU. Gates whose
+      parameters are shared by the whole batch (such as the QNN weights) are looked up by value.
+
+    The LRU only helps in inference. A matrix built from a trainable parameter while gradients
+    are enabled is part of that forward pass's autograd graph and cannot be reused in the next
+    one, so those lookups bypass the LRU, i.e. it never hits in training; under
+    ``torch.no_grad()`` the QNN weights are looked up by value. Parameters on an accelerator also
+    bypass it, since reading their values would synchronize the device at every gate. Hit, miss
+    and bypass counters are exposed through ``stats()`` for monitoring.
+
+    Usage:
+    To use the GateMatrixCache class, import it as follows:
+    from backends.gate_cache import GateMatrixCache
+
+    Example:
+    cache = GateMatrixCache(maxsize=512)
+    matrix = cache.get("Squeezing", (0.1, 0.0), cutoff=5, dtype=torch.complex128, build=squeezing_matrix)
+    print(cache.stats())
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initializes the GateMatrixCache class with the given parameters.
+
+        Parameters:
+        - maxsize (int, optional): Maximum number of materialized matrices kept. Default is 1024.
+        """
+        self.maxsize = maxsize
+        self.matrices = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    @staticmethod
+    def key(gate, params, cutoff, dtype):
+        """
+        Builds the LRU key of a gate, or returns None if the parameters cannot be cached
+        (batched parameters, parameters that require gradients while gradients are enabled, or
+        parameters off the CPU, whose values cannot be read without a device synchronization).
+        """
+        values = []
+        device = None
+        for param in params:
+            if isinstance(param, torch.Tensor):
+                if (param.dim() > 0 or param.device.type != "cpu"
+                        or (param.requires_grad and torch.is_grad_enabled())):
+                    return None
+                device = param.device
+                param = param.item()
+            values.append(float(param))
+        return (gate, cutoff, dtype, str(device), tuple(values))
+
+    def get(self, gate, params, cutoff, dtype, build):
+        """
+        Returns the Fock matrix of a gate, building it with ``build(*params, cutoff, dtype)`` on a miss.
+
+        Parameters:
+        - gate (str): Gate name.
+        - params (tuple): Gate parameters.
+        - cutoff (int): Fock space cutoff dimension.
+        - dtype (torch.dtype): Complex dtype of the matrix.
+        - build (callable): Function computing the matrix.
+
+        Returns:
+        - torch.Tensor: The gate matrix.
+        """
+        key = self.key(gate, params, cutoff, dtype)
+        if key is None:
+            self.bypasses += 1
+            return build(*params, cutoff, dtype)
+
+        matrix = self.matrices.get(key)
+        if matrix is not None:
+            self.hits += 1
+            self.matrices.move_to_end(key)
+            return matrix
+
+        self.misses += 1
+        matrix = build(*params, cutoff, dtype)
+        self.matrices[key] = matrix
+        if len(self.matrices) > self.maxsize:
+            self.matrices.popitem(last=False)
+        return matrix
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+        - dict: Number of LRU hits, misses and bypasses, the hit rate, the number of cached
+          matrices and the number of (gate, cutoff) recurrence tables built in this process.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.matrices),
+            "tables": recurrence_tables.cache_info().currsize,
+        }
+
+    def clear(self):
+        """
+        Drops all cached matrices and resets the counters.
+        """
+        self.matrices.clear()
+        self.hits = self.misses = self.bypasses = 0
+
+
+# Process-wide cache shared by all FockBackend instances
+gate_cache = GateMatrixCache()
@@ -0,0 +1,271 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import torch
+from pennylane.measurements import Expectation
+from backends.circuit_utils import as_real, batch_size, parameter_device
+
+GAUSSIAN_GATES = ("Squeezing", "Beamsplitter", "Rotation", "Displacement")
+QUADRATURES = ("X", "P")
+
+
+def rotation_symplectic(phi, dtype=torch.float64):
+    """
+    Computes the symplectic matrix of the rotation gate R(phi) in (x, p) ordering.
+
+    Parameters:
+    - phi (float or torch.Tensor): Rotation angle, optionally batched with shape (batch,).
+    - dtype (torch.dtype, optional): Real dtype of the result. Default is torch.float64.
+
+    Returns:
+    - torch.Tensor: Matrix of shape (..., 2, 2).
+    """
+    phi = as_real(phi, dtype)
+    c, s = torch.cos(phi), torch.sin(phi)
+    return torch.stack([torch.stack([c, -s], -1), torch.stack([s, c], -1)], -2)
+
+
+def squeezing_symplectic(r, phi, dtype=torch.float64):
+    """
+    Computes the symplectic matrix of the squeezing gate S(r e^{i phi}) in (x, p) ordering.
+
+    Parameters:
+    - r (float or torch.Tensor): Squeezing magnitude, optionally batched with shape (batch,).
+    - phi (float or torch.Tensor): Squeezing angle, optionally batched with shape (batch,).
+    - dtype (torch.dtype, optional): Real dtype of the result. Default is torch.float64.
+
+    Returns:
+    - torch.Tensor: Matrix of shape (..., 2, 2).
+    """
+    r, phi = torch.broadcast_tensors(as_real(r, dtype), as_real(phi, dtype))
+    ch, sh = torch.cosh(r), torch.sinh(r)
+    cp, sp = torch.cos(phi), torch.sin(phi)
+    return torch.stack([torch.stack([ch - cp * sh, -sp * sh], -1),
+                        torch.stack([-sp * sh, ch + cp * sh], -1)], -2)
+
+
+def beamsplitter_symplectic(theta, phi, dtype=torch.float64):
+    """
+    Computes the symplectic matrix of the beamsplitter gate BS(theta, phi) in
+    (x_1, x_2, p_1, p_2) ordering.
+
+    Parameters:
+    - theta (float or torch.Tensor): Transmittivity angle, optionally batched with shape (batch,).
+    - phi (float or torch.Tensor): Phase angle, optionally batched with shape (batch,).
+    - dtype (torch.dtype, optional): Real dtype of the result. Default is torch.float64.
+
+    Returns:
+    - torch.Tensor: Matrix of shape (..., 4, 4).
+    """
+    theta, phi = torch.broadcast_tensors(as_real(theta, dtype), as_real(phi, dtype))
+    ct, st = torch.cos(theta), torch.sin(theta)
+    cp, sp = torch.cos(phi), torch.sin(phi)
+    zero = torch.zeros_like(ct)
+    rows = [
+        [ct, -cp * st, zero, -sp * st],
+        [cp * st, ct, -sp * st, zero],
+        [zero, sp * st, ct, -cp * st],
+        [sp * st, zero, cp * st, ct],
+    ]
+    return torch.stack([torch.stack(row, -1) for row in rows], -2)
+
+
+class GaussianBackend:
+    """
+    A batched Gaussian-state simulator for photonic circuits written in PyTorch.
+
+    Without the Kerr nonlinearity, the Squeezing, Beamsplitter, Rotation and Displacement
+    gates map Gaussian states to Gaussian states and act on the quadratures through their
+    symplectic matrices. The supported measurements, expectation values of the x and p
+    quadratures, only depend on the vector of quadrature means (of length 2N for N qumodes), so
+    only the means are propagated, at a cost polynomial in the number of wires instead of the
+    cutoff_dim ** num_wires amplitudes of the Fock representation. The simulation is exact
+    (there is no Fock space truncation), so it differs from a Fock simulation at any finite
+    cutoff. Quadratures are stored in (x_1, ..., x_N, p_1, ..., p_N) ordering.
+
+    Usage:
+    To use the GaussianBackend class, import it as follows:
+    from backends.gaussian_backend import GaussianBackend
+
+    Example:
+    backend = GaussianBackend(num_wires=16)
+    if backend.supports(tape):
+        output = backend.execute(tape)
+    """
+
+    def __init__(self, num_wires, hbar=2.0, dtype=torch.float64):
+        """
+        Initializes the GaussianBackend class with the given parameters.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes) in the quantum circuit.
+        - hbar (float, optional): Value of hbar used for the quadratures. Default is 2.0,
+          matching Strawberry Fields.
+        - dtype (torch.dtype, optional): Real dtype of the simulation. Default is torch.float64.
+        """
+        self.num_wires = num_wires
+        self.hbar = hbar
+        self.dtype = dtype
+
+    @staticmethod
+    def is_gaussian(operations):
+        """
+        Checks whether a sequence of gates is Gaussian. Kerr gates are allowed only if all
+        their parameters are zero, in which case they are the identity, and do not require
+        gradients, since the derivative with respect to a zero Kerr parameter is generally
+        non-zero (as in compiler.is_identity).
+
+        Parameters:
+        - operations (list): PennyLane operations.
+
+        Returns:
+        - bool: True if every gate can be simulated by the GaussianBackend.
+        """
+        for op in operations:
+            if op.name == "Kerr":
+                param = op.parameters[0]
+                if isinstance(param, torch.Tensor) and param.requires_grad and torch.is_grad_enabled():
+                    return False
+                if torch.any(as_real(param, torch.float64) != 0):
+                    return False
+            elif op.name not in GAUSSIAN_GATES:
+                return False
+        return True
+
+    def supports(self, tape):
+        """
+        Checks whether a recorded circuit can be run on the GaussianBackend, i.e. it is
+        Gaussian and only measures expectation values of the x and p quadratures.
+
+        Parameters:
+        - tape (pennylane.tape.QuantumTape): The recorded circuit.
+
+        Returns:
+        - bool: True if the circuit is supported.
+        """
+        for m in tape.measurements:
+            if m.return_type is not Expectation or m.obs is None or m.obs.name not in QUADRATURES:
+                return False
+        return self.is_gaussian(tape.operations)
+
+    def vacuum(self, batch_size, device=None):
+        """
+        Prepares a batch of vacuum states.
+
+        Parameters:
+        - batch_size (int): Number of samples in the batch.
+        - device (torch.device, optional): Device to allocate the state on. Default is None (CPU).
+
+        Returns:
+        - torch.Tensor: Quadrature means of shape (batch_size, 2N).
+        """
+        return torch.zeros(batch_size, 2 * self.num_wires, dtype=self.dtype, device=device)
+
+    def apply(self, operations, means):
+        """
+        Applies a sequence of Gaussian gates to a batch of states.
+
+        Parameters:
+        - operations (list): PennyLane operations.
+        - means (torch.Tensor): Means of shape (batch, 2N).
+
+        Returns:
+        - torch.Tensor: The evolved means.
+        """
+        for op in operations:
+            means = self.apply_operation(op, means)
+        return means
+
+    def apply_operation(self, op, means):
+        """
+        Applies a single Gaussian gate to a batch of states.
+
+        Parameters:
+        - op (pennylane.operation.Operation): The gate to apply.
+        - means (torch.Tensor): Means of shape (batch, 2N).
+
+        Returns:
+        - torch.Tensor: The evolved means.
+        """
+        wires = op.wires.tolist()
+        params = op.parameters
+
+        if op.name == "Kerr":
+            return means
+        if op.name == "Displacement":
+            r, phi = torch.broadcast_tensors(as_real(params[0], self.dtype), as_real(params[1], self.dtype))
+            shift = math.sqrt(2 * self.hbar) * torch.stack([r * torch.cos(phi), r * torch.sin(phi)], -1)
+            index = self._index(wires)
+            return means.index_add(1, index, shift.expand(means.shape[0], 2))
+        if op.name == "Rotation":
+            return self._apply_symplectic(means, rotation_symplectic(params[0], self.dtype), wires)
+        if op.name == "Squeezing":
+            return self._apply_symplectic(means, squeezing_symplectic(*params, self.dtype), wires)
+        if op.name == "Beamsplitter":
+            return self._apply_symplectic(means, beamsplitter_symplectic(*params, self.dtype), wires)
+
+        raise ValueError(f"Operation {op.name} is not supported by the Gaussian backend.")
+
+    def _index(self, wires):
+        """
+        Returns the positions of the x and then the p quadratures of the given wires.
+        """
+        return torch.tensor(list(wires) + [w + self.num_wires for w in wires])
+
+    def _apply_symplectic(self, means, symplectic, wires):
+        """
+        Applies a (batched) local symplectic matrix to the means of the given wires.
+        """
+        index = self._index(wires).to(means.device)
+        symplectic = symplectic.to(means.device)
+        return means.index_copy(1, index, torch.matmul(means[:, index].unsqueeze(1), symplectic.transpose(-1, -2)).squeeze(1))
+
+    def quad_expectation(self, means, wire, phi=0.0):
+        """
+        Computes the expectation value of the rotated quadrature cos(phi) x + sin(phi) p.
+
+        Parameters:
+        - means (torch.Tensor): Means of shape (batch, 2N).
+        - wire (int): The measured wire.
+        - phi (float, optional): Quadrature angle. Default is 0.0 (the x quadrature).
+
+        Returns:
+        - torch.Tensor: Expectation values of shape (batch,).
+        """
+        return math.cos(phi) * means[:, wire] + math.sin(phi) * means[:, wire + self.num_wires]
+
+    def execute(self, tape):
+        """
+        Simulates a recorded Gaussian circuit for every sample of the batch in one vectorized pass.
+
+        Parameters:
+        - tape (pennylane.tape.QuantumTape): The recorded circuit. Gate parameters with a
+          leading dimension are treated as one value per sample.
+
+        Returns:
+        - torch.Tensor: The measurement results. If the tape is not batched, the leading batch
+          dimension is removed.
+        """
+        size = batch_size(tape.operations)
+        means = self.vacuum(size or 1, parameter_device(tape.operations))
+        means = self.apply(tape.operations, means)
+
+        results = []
+        for m in tape.measurements:
+            phi = 0.0 if m.obs.name == "X" else math.pi / 2
+            results.append(self.quad_expectation(means, m.obs.wires[0], phi))
+        results = results[0] if len(results) == 1 else torch.stack(results, dim=-1)
+        return results if size is not None else results[0]
@@ -0,0 +1,176 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Probability outputs that are smaller than the joint distribution ``qml.probs`` returns over
+every wire, i.e. cutoff ** num_wires values. They are evaluated directly from the state by
+the FockBackend and the MPSBackend (``QuantumNeuralNetwork(..., backend="torch")`` or
+``backend="mps"``); the Strawberry Fields device does not support them.
+
+- marginal_probs: the probability distribution of every wire on its own.
+- basis_probs: the probabilities of a few selected basis states, e.g. one per class.
+- top_k_probs: the k most probable basis states and their probabilities.
+
+Usage:
+To use the measurements, import them as follows:
+from backends.measurements import basis_probs, marginal_probs, top_k_probs
+
+Example:
+def circuit(inputs, var):
+    ...
+    return basis_probs([(0, 0, 1), (0, 1, 0), (1, 0, 0)], wires=[0, 1, 2])
+"""
+
+import numpy as np
+import torch
+from pennylane.measurements import StateMeasurement
+
+
+def basis_indices(states, cutoff):
+    """
+    Converts Fock basis states to their indices in the lexicographic order used by ``qml.probs``.
+
+    Parameters:
+    - states (array-like): Basis states of shape (..., num_wires).
+    - cutoff (int): Fock space cutoff dimension.
+
+    Returns:
+    - numpy.ndarray: Indices of shape (...).
+    """
+    states = np.asarray(states, dtype=np.int64)
+    if states.size and (states.min() < 0 or states.max() >= cutoff):
+        raise ValueError(f"The photon numbers of the basis states must lie in [0, {cutoff}).")
+    return states @ cutoff ** np.arange(states.shape[-1] - 1, -1, -1, dtype=np.int64)
+
+
+def _probability_tensor(state, num_wires):
+    """
+    Reshapes a flat state vector into a tensor of probabilities with one axis per wire.
+    """
+    state = torch.as_tensor(state)
+    cutoff = round(state.shape[-1] ** (1 / num_wires))
+    return (torch.abs(state) ** 2).reshape(state.shape[:-1] + (cutoff,) * num_wires)
+
+
+class MarginalProbsMP(StateMeasurement):
+    """
+    Measurement of the marginal Fock basis probabilities of every wire. The result has shape
+    (len(wires) * cutoff,): the distribution of the first wire, then of the second one, etc.
+    """
+
+    def process_state(self, state, wire_order):
+        probs = _probability_tensor(state, len(wire_order))
+        axes = [wire_order.index(w) for w in (self.wires or wire_order)]
+        offset = probs.dim() - len(wire_order)
+        marginals = []
+        for axis in axes:
+            others = [offset + a for a in range(len(wire_order)) if a != axis]
+            marginals.append(probs.sum(dim=others))
+        return torch.cat(marginals, dim=-1)
+
+
+class BasisProbsMP(StateMeasurement):
+    """
+    Measurement of the probabilities of selected Fock basis states of the given wires (tracing
+    out the other wires). The result has shape (num_states,).
+    """
+
+    def __init__(self, states, wires=None, id=None):
+        self.states = np.asarray(states, dtype=np.int64).reshape(len(states), -1)
+        if wires is not None and self.states.shape[1] != len(wires):
+            raise ValueError(f"The basis states have {self.states.shape[1]} entries, expected one per wire "
+                             f"({len(wires)}).")
+        super().__init__(wires=wires, id=id)
+
+    def process_state(self, state, wire_order):
+        probs = _probability_tensor(state, len(wire_order))
+        wires = self.wires or wire_order
+        offset = probs.dim() - len(wire_order)
+        others = [offset + a for a in range(len(wire_order)) if wire_order[a] not in wires]
+        if others:
+            probs = probs.sum(dim=others)
+        remaining = [w for w in wire_order if w in wires]
+        index = tuple(torch.as_tensor(self.states[:, wires.index(w)]) for w in remaining)
+        return probs[(Ellipsis,) + index]
+
+
+class TopKProbsMP(StateMeasurement):
+    """
+    Measurement of the k most probable Fock basis states of the given wires. The result has shape
+    (2, k): the probabilities in decreasing order, and the indices of the basis states in the
+    lexicographic order used by ``qml.probs``.
+    """
+
+    def __init__(self, k, wires=None, id=None):
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}.")
+        self.k = k
+        super().__init__(wires=wires, id=id)
+
+    def process_state(self, state, wire_order):
+        probs = _probability_tensor(state, len(wire_order))
+        wires = self.wires or wire_order
+        offset = probs.dim() - len(wire_order)
+        others = [offset + a for a in range(len(wire_order)) if wire_order[a] not in wires]
+        if others:
+            probs = probs.sum(dim=others)
+        remaining = [w for w in wire_order if w in wires]
+        probs = torch.movedim(probs, [offset + remaining.index(w) for w in wires], list(range(offset, probs.dim())))
+        values, indices = torch.topk(probs.reshape(probs.shape[:offset] + (-1,)), self.k)
+        return torch.stack([values, indices.to(values.dtype)], dim=-2)
+
+
+def marginal_probs(wires=None):
+    """
+    Returns the marginal probability distribution of every wire.
+
+    Parameters:
+    - wires (list, optional): Wires to return the marginals of. Default is None (every wire).
+
+    Returns:
+    - MarginalProbsMP: The measurement, with results of shape (len(wires) * cutoff,).
+    """
+    return MarginalProbsMP(wires=wires)
+
+
+def basis_probs(states, wires=None):
+    """
+    Returns the probabilities of selected Fock basis states.
+
+    Parameters:
+    - states (array-like): Basis states of shape (num_states, len(wires)), one photon number per wire.
+    - wires (list, optional): Wires the basis states are defined on; the other wires are traced
+      out. Default is None (every wire).
+
+    Returns:
+    - BasisProbsMP: The measurement, with results of shape (num_states,).
+    """
+    return BasisProbsMP(states, wires=wires)
+
+
+def top_k_probs(k, wires=None):
+    """
+    Returns the k most probable Fock basis states.
+
+    Parameters:
+    - k (int): Number of basis states.
+    - wires (list, optional): Wires the basis states are defined on; the other wires are traced
+      out. Default is None (every wire).
+
+    Returns:
+    - TopKProbsMP: The measurement, with results of shape (2, k) holding the probabilities in
+      decreasing order and the ``qml.probs`` indices of the basis states.
+    """
+    return TopKProbsMP(k, wires=wires)
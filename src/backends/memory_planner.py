@@ -0,0 +1,162 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import torch
+
+# State-sized buffers alive per sample while a gate is applied: the input state, its permuted
+# contiguous copy and the output state
+TRANSIENT_STATES = 3
+# State-sized gradient buffers alive per sample in the backward pass on top of those: the
+# adjoint state (the gradient of the current gate's output state) and the gradient of its
+# input state
+ADJOINT_STATES = 2
+
+
+def _format_bytes(num_bytes):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if num_bytes < 1024 or unit == "GiB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+def estimate_memory(num_wires, num_basis, batch_size, num_gates, dtype=torch.complex128, requires_grad=True,
+                    overhead=0):
+    """
+    Estimates the peak memory of a Fock simulation of a batch.
+
+    The state of a sample holds num_basis ** num_wires amplitudes. Applying a gate keeps
+    TRANSIENT_STATES states per sample alive at once. When gradients are required, autograd
+    additionally saves the input state of every gate for the backward pass, which then holds
+    the saved states, the transient copies of backpropagating through a gate and
+    ADJOINT_STATES gradient states at the same time. Memory that does not depend on the batch
+    size, such as the construction of fused operators, is added as overhead.
+
+    Parameters:
+    - num_wires (int): Number of wires (qumodes).
+    - num_basis (int): Fock space cutoff dimension.
+    - batch_size (int): Number of samples simulated at once.
+    - num_gates (int): Number of gates applied to the batched state.
+    - dtype (torch.dtype, optional): Complex dtype of the simulation. Default is torch.complex128.
+    - requires_grad (bool, optional): Whether the backward pass is taken. Default is True.
+    - overhead (int, optional): Batch-independent memory in bytes. Default is 0.
+
+    Returns:
+    - dict: Bytes of one sample's state ("state"), peak bytes of the forward ("forward") and
+      backward ("backward") passes, and their maximum ("peak").
+    """
+    state = num_basis ** num_wires * torch.empty((), dtype=dtype).element_size()
+    saved = num_gates if requires_grad else 0
+    forward = batch_size * state * (saved + TRANSIENT_STATES) + overhead
+    backward = batch_size * state * (saved + TRANSIENT_STATES + ADJOINT_STATES) + overhead if requires_grad else 0
+    return {"state": state, "forward": forward, "backward": backward, "peak": max(forward, backward)}
+
+
+class MemoryPlan:
+    """
+    The execution plan of a batch under a memory budget: the batch is simulated in num_chunks
+    chunks of at most chunk_size samples, so that the estimated peak memory of a chunk fits the
+    budget.
+
+    Usage:
+    To use the MemoryPlan class, import it as follows:
+    from backends.memory_planner import plan_memory
+
+    Example:
+    plan = plan_memory(num_wires=6, num_basis=5, batch_size=256, num_gates=20, budget=2 ** 30)
+    print(plan)
+    """
+
+    def __init__(self, num_wires, num_basis, batch_size, chunk_size, num_gates, dtype, requires_grad, budget,
+                 overhead=0):
+        """
+        Initializes the MemoryPlan class with the given parameters.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes).
+        - num_basis (int): Fock space cutoff dimension.
+        - batch_size (int): Number of samples in the batch.
+        - chunk_size (int): Maximum number of samples simulated at once.
+        - num_gates (int): Number of gates applied to the batched state.
+        - dtype (torch.dtype): Complex dtype of the simulation.
+        - requires_grad (bool): Whether the backward pass is taken.
+        - budget (int or None): Memory budget in bytes, or None for no budget.
+        - overhead (int, optional): Batch-independent memory in bytes. Default is 0.
+        """
+        self.num_wires = num_wires
+        self.num_basis = num_basis
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.num_gates = num_gates
+        self.dtype = dtype
+        self.requires_grad = requires_grad
+        self.budget = budget
+        self.overhead = overhead
+        self.estimate = estimate_memory(num_wires, num_basis, chunk_size, num_gates, dtype, requires_grad, overhead)
+        self.unchunked = estimate_memory(num_wires, num_basis, batch_size, num_gates, dtype, requires_grad, overhead)
+
+    @property
+    def num_chunks(self):
+        return math.ceil(self.batch_size / self.chunk_size)
+
+    @property
+    def peak_bytes(self):
+        return self.estimate["peak"]
+
+    def __str__(self):
+        budget = "none" if self.budget is None else _format_bytes(self.budget)
+        return "\n".join([
+            f"Fock memory plan: {self.num_wires} wires, cutoff {self.num_basis}, {self.num_gates} gates, {self.dtype}",
+            f"  state per sample: {_format_bytes(self.estimate['state'])}, "
+            f"batch-independent overhead: {_format_bytes(self.overhead)}",
+            f"  batch of {self.batch_size}: peak {_format_bytes(self.unchunked['peak'])} (budget {budget})",
+            f"  plan: {self.num_chunks} chunk(s) of at most {self.chunk_size} samples, "
+            f"forward {_format_bytes(self.estimate['forward'])}, backward {_format_bytes(self.estimate['backward'])}",
+        ])
+
+
+def plan_memory(num_wires, num_basis, batch_size, num_gates, budget=None, dtype=torch.complex128,
+                requires_grad=True, auto_chunk=True, overhead=0):
+    """
+    Plans the execution of a batch so that its estimated peak memory fits a budget.
+
+    Parameters:
+    - num_wires (int): Number of wires (qumodes).
+    - num_basis (int): Fock space cutoff dimension.
+    - batch_size (int): Number of samples in the batch.
+    - num_gates (int): Number of gates applied to the batched state.
+    - budget (int, optional): Memory budget in bytes. Default is None (no budget).
+    - dtype (torch.dtype, optional): Complex dtype of the simulation. Default is torch.complex128.
+    - requires_grad (bool, optional): Whether the backward pass is taken. Default is True.
+    - auto_chunk (bool, optional): Whether to split the batch into chunks when it does not fit the
+      budget. Default is True.
+    - overhead (int, optional): Batch-independent memory in bytes. Default is 0.
+
+    Returns:
+    - MemoryPlan: The plan.
+
+    Raises:
+    - ValueError: If a single sample does not fit the budget, or if the batch does not fit it and
+      auto_chunk is False.
+    """
+    args = (num_wires, num_basis, batch_size)
+    chunk_size = batch_size
+    if budget is not None:
+        per_sample = estimate_memory(num_wires, num_basis, 1, num_gates, dtype, requires_grad)["peak"]
+        chunk_size = min(batch_size, (budget - overhead) // per_sample)
+        if chunk_size < 1 or (chunk_size < batch_size and not auto_chunk):
+            plan = MemoryPlan(*args, batch_size, num_gates, dtype, requires_grad, budget, overhead)
+            raise ValueError(f"The Fock simulation does not fit the memory budget of {_format_bytes(budget)}:\n{plan}")
+    return MemoryPlan(*args, max(chunk_size, 1), num_gates, dtype, requires_grad, budget, overhead)
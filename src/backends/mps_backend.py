@@ -0,0 +1,572 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import heapq
+import math
+import numpy as np
+import torch
+from pennylane.measurements import Expectation, Probability
+from backends.circuit_utils import batch_size, complex_dtype, parameter_device
+from backends.compiler import eliminate_dead_gates
+from backends.fock_backend import (beamsplitter_tensor, displacement_matrix, kerr_phases, rotation_phases,
+                                   squeezing_matrix)
+from backends.gate_cache import gate_cache
+from backends.measurements import BasisProbsMP, MarginalProbsMP, TopKProbsMP, basis_indices
+
+
+class MPSBackend:
+    """
+    A batched matrix-product-state (MPS) simulator for photonic circuits written in PyTorch.
+
+    The state of N qumodes is held as N site tensors of shape (batch, left bond, cutoff, right
+    bond), so its memory is linear in the number of wires for a bounded bond dimension instead
+    of cutoff ** N. Single-mode gates are contracted with their site. A Beamsplitter on a pair
+    of neighbouring wires (the only two-mode gate of QuantumNeuralNetworkLayer) is contracted
+    with the two sites, which are split again by a singular value decomposition:
+    - if the bond fits max_bond, the split keeps every singular vector and is exact;
+    - otherwise the rest of the chain is first brought to mixed canonical form by QR sweeps,
+      so that the singular values of the two-site tensor are its Schmidt coefficients, and the
+      bond is truncated to the max_bond largest ones. The discarded weight is accumulated in
+      ``truncation_error``.
+
+    The gate matrices are those of the FockBackend (Strawberry Fields conventions), so without
+    truncation both backends give the same results. Gradients flow by backpropagation. The
+    isometries of the splits and of the QR sweeps are taken from the detached tensors, so the
+    gradients are exact as long as no bond is truncated, and are the gradients of the projected
+    state otherwise.
+
+    Usage:
+    To use the MPSBackend class, import it as follows:
+    from backends.mps_backend import MPSBackend
+
+    Example:
+    backend = MPSBackend(num_wires=16, cutoff_dim=3, max_bond=32)
+    qlayer = TorchFockLayer(qnn_circuit, {"var": (2, 140)}, backend)
+    """
+
+    # TorchFockLayer compatibility: no Gaussian dispatch and no dense fused operators
+    gaussian = None
+    max_fused_dim = 0
+
+    def __init__(self, num_wires, cutoff_dim, max_bond=64, hbar=2.0, dtype=torch.complex128, cache=None,
+                 dead_gate_tol=0.0, sampler=None):
+        """
+        Initializes the MPSBackend class with the given parameters.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes) in the quantum circuit.
+        - cutoff_dim (int): Fock space cutoff dimension (number of basis states per wire).
+        - max_bond (int, optional): Maximum bond dimension between neighbouring sites. Default is 64.
+        - hbar (float, optional): Value of hbar used for quadrature observables. Default is 2.0.
+        - dtype (torch.dtype or str, optional): Complex dtype of the simulation, or its precision
+          "single" or "double". Default is torch.complex128.
+        - cache (GateMatrixCache, optional): Cache of materialized gate matrices. Default is None,
+          which uses the cache shared by all backends of the process.
+        - dead_gate_tol (float, optional): Tolerance of ``eliminate_dead_gates``. Default is 0.0;
+          None disables the pass.
+        - sampler (ShotSampler, optional): Replaces the exact probabilities and quadrature expectation
+          values by finite-shot estimates. Default is None (exact results).
+        """
+        if max_bond < 1:
+            raise ValueError(f"max_bond must be positive, got {max_bond}.")
+        self.num_wires = num_wires
+        self.cutoff_dim = cutoff_dim
+        self.max_bond = max_bond
+        self.hbar = hbar
+        self.dtype = complex_dtype(dtype)
+        self.cache = gate_cache if cache is None else cache
+        self.dead_gate_tol = dead_gate_tol
+        self.sampler = sampler
+        # Largest discarded weight (sum of squared singular values) summed over the truncations of
+        # the last simulated circuit, and the largest bond dimension it reached. The weight is
+        # accumulated as a tensor on the simulation device, so that truncations do not synchronize
+        # with it; truncation_error converts it when read.
+        self._truncation_error = 0.0
+        self.max_bond_used = 1
+        self.last_report = None
+        # Per site, "left" or "right" if it is a left or right isometry, "both" if it is both
+        # and None otherwise, so that canonicalisation only sweeps the sites that need it
+        self._isometries = [None] * num_wires
+
+    @property
+    def truncation_error(self):
+        """
+        Discarded weight of the truncations of the last simulated circuit (float).
+        """
+        return float(self._truncation_error)
+
+    def vacuum(self, batch_size, device=None):
+        """
+        Prepares a batch of vacuum states.
+
+        Parameters:
+        - batch_size (int): Number of samples in the batch.
+        - device (torch.device, optional): Device to allocate the state on. Default is None (CPU).
+
+        Returns:
+        - list: One site tensor of shape (batch_size, 1, cutoff, 1) per wire.
+        """
+        site = torch.zeros(batch_size, 1, self.cutoff_dim, 1, dtype=self.dtype, device=device)
+        site[:, 0, 0, 0] = 1.0
+        self._isometries = ["both"] * self.num_wires
+        return [site.clone() for _ in range(self.num_wires)]
+
+    @staticmethod
+    def batch_size(operations):
+        """
+        Infers the batch size from the gate parameters. Parameters with a leading dimension
+        are treated as one value per sample.
+        """
+        return batch_size(operations)
+
+    def compile(self, operations):
+        """
+        Eliminates the dead gates of a sequence of gates.
+
+        Parameters:
+        - operations (list): PennyLane operations.
+
+        Returns:
+        - tuple: The remaining operations, and the DeadGateReport (None if the pass is disabled).
+        """
+        if self.dead_gate_tol is None:
+            return operations, None
+        return eliminate_dead_gates(operations, self.dead_gate_tol)
+
+    def apply(self, operations, sites):
+        """
+        Applies a sequence of gates to a batch of states.
+
+        Parameters:
+        - operations (list): PennyLane operations (Squeezing, Beamsplitter on neighbouring
+          wires, Rotation, Displacement or Kerr).
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+
+        Returns:
+        - list: The evolved site tensors.
+        """
+        sites = list(sites)
+        for op in operations:
+            self.apply_operation(op, sites)
+        return sites
+
+    def apply_operation(self, op, sites):
+        """
+        Applies a single gate to a batch of states, replacing the affected site tensors in place.
+
+        Parameters:
+        - op (pennylane.operation.Operation): The gate to apply.
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        """
+        wires = op.wires.tolist()
+        params = op.parameters
+        cutoff = self.cutoff_dim
+
+        if op.name == "Squeezing":
+            matrix = self.cache.get(op.name, params, cutoff, self.dtype, squeezing_matrix)
+            sites[wires[0]] = self._apply_single(sites[wires[0]], matrix)
+            # The truncated matrix is not unitary
+            self._isometries[wires[0]] = None
+        elif op.name == "Displacement":
+            matrix = self.cache.get(op.name, params, cutoff, self.dtype, displacement_matrix)
+            sites[wires[0]] = self._apply_single(sites[wires[0]], matrix)
+            self._isometries[wires[0]] = None
+        elif op.name == "Rotation":
+            sites[wires[0]] = self._apply_diagonal(sites[wires[0]], rotation_phases(*params, cutoff, self.dtype))
+        elif op.name == "Kerr":
+            sites[wires[0]] = self._apply_diagonal(sites[wires[0]], kerr_phases(*params, cutoff, self.dtype))
+        elif op.name == "Beamsplitter":
+            tensor = self.cache.get(op.name, params, cutoff, self.dtype, beamsplitter_tensor)
+            self._apply_two(sites, tensor, wires)
+        else:
+            raise ValueError(f"Operation {op.name} is not supported by the MPS backend.")
+
+    @staticmethod
+    def _apply_single(site, matrix):
+        """
+        Contracts a (batched) single-mode matrix with the physical index of a site.
+        """
+        if matrix.dim() == 2:
+            return torch.einsum("ij,bljr->blir", matrix, site)
+        return torch.einsum("bij,bljr->blir", matrix, site)
+
+    @staticmethod
+    def _apply_diagonal(site, phases):
+        """
+        Multiplies the physical index of a site by a (batched) diagonal gate.
+        """
+        if phases.dim() == 1:
+            return site * phases[:, None]
+        return site * phases[:, None, :, None]
+
+    def _canonicalize(self, sites, i):
+        """
+        Brings the MPS to mixed canonical form around sites i and i + 1: sites 0..i-1 become left
+        isometries by a left-to-right QR sweep and sites i+2..N-1 right isometries by a
+        right-to-left one, each R factor being absorbed by the next site towards i.
+        """
+        for j in range(i):
+            if self._isometries[j] in ("left", "both"):
+                continue
+            site = sites[j]
+            batch, bond_left, c, bond_right = site.shape
+            matrix = site.reshape(batch, bond_left * c, bond_right)
+            q, _ = torch.linalg.qr(matrix.detach())
+            r = torch.matmul(q.conj().transpose(-1, -2), matrix)
+            sites[j] = q.reshape(batch, bond_left, c, q.shape[-1])
+            sites[j + 1] = torch.einsum("bkr,brns->bkns", r, sites[j + 1])
+            self._isometries[j], self._isometries[j + 1] = "left", None
+        for j in range(self.num_wires - 1, i + 1, -1):
+            if self._isometries[j] in ("right", "both"):
+                continue
+            site = sites[j]
+            batch, bond_left, c, bond_right = site.shape
+            matrix = site.reshape(batch, bond_left, c * bond_right)
+            # matrix = r q with orthonormal rows, from the QR decomposition of its adjoint
+            q, _ = torch.linalg.qr(matrix.detach().conj().transpose(-1, -2))
+            r = torch.matmul(matrix, q)
+            sites[j] = q.conj().transpose(-1, -2).reshape(batch, q.shape[-1], c, bond_right)
+            sites[j - 1] = torch.einsum("blnr,brk->blnk", sites[j - 1], r)
+            self._isometries[j], self._isometries[j - 1] = "right", None
+
+    def _apply_two(self, sites, tensor, wires):
+        """
+        Contracts a (batched) two-mode tensor with two neighbouring sites and splits the result
+        back into two sites, truncating the bond to max_bond.
+        """
+        if abs(wires[0] - wires[1]) != 1:
+            raise ValueError(f"The MPS backend only supports two-mode gates on neighbouring wires, got {wires}.")
+        if wires[0] > wires[1]:
+            # <m, n| G |p, q> on (i + 1, i) is <n, m| G' |q, p> on (i, i + 1)
+            tensor = tensor.permute(*range(tensor.dim() - 4), -3, -4, -1, -2)
+        i = min(wires)
+        c = self.cutoff_dim
+        if min(sites[i].shape[1], sites[i + 1].shape[3]) * c > self.max_bond:
+            # The singular values are only the Schmidt coefficients in canonical form
+            self._canonicalize(sites, i)
+        left, right = sites[i], sites[i + 1]
+        batch, bond_left, bond_right = left.shape[0], left.shape[1], right.shape[3]
+
+        theta = torch.einsum("blir,brjs->blijs", left, right)
+        subscripts = "mnpq,blpqs->blmns" if tensor.dim() == 4 else "bmnpq,blpqs->blmns"
+        theta = torch.einsum(subscripts, tensor, theta).reshape(batch, bond_left * c, c * bond_right)
+
+        rows, cols = theta.shape[1:]
+        u, s, vh = torch.linalg.svd(theta.detach(), full_matrices=False)
+        if min(rows, cols) <= self.max_bond and rows > cols:
+            # Exact split: vh is a complete basis of the right side
+            left = torch.matmul(theta, vh.conj().transpose(-1, -2)).reshape(batch, bond_left, c, cols)
+            right = vh.reshape(batch, cols, c, bond_right)
+            self._isometries[i], self._isometries[i + 1] = None, "right"
+        else:
+            # Exact split if u is a complete basis of the left side, truncation otherwise
+            bond = min(rows, self.max_bond)
+            if bond < s.shape[-1]:
+                self._truncation_error = self._truncation_error + (s[..., bond:] ** 2).sum(-1).max()
+            u = u[..., :bond]
+            left = u.reshape(batch, bond_left, c, bond)
+            right = torch.matmul(u.conj().transpose(-1, -2), theta).reshape(batch, bond, c, bond_right)
+            self._isometries[i], self._isometries[i + 1] = "left", None
+
+        sites[i], sites[i + 1] = left, right
+        self.max_bond_used = max(self.max_bond_used, left.shape[3])
+
+    def _environments(self, sites, wires, open_pairs):
+        """
+        Contracts the MPS with its conjugate from left to right, keeping the physical indices of the
+        given wires open, either as a single index (diagonal, for probabilities) or as a (ket, bra)
+        pair (for reduced density matrices).
+        """
+        env = torch.ones(sites[0].shape[0], 1, 1, 1, dtype=self.dtype, device=sites[0].device)
+        for wire, site in enumerate(sites):
+            if wire not in wires:
+                env = torch.einsum("bpxy,bxnr,byns->bprs", env, site, site.conj())
+            elif open_pairs:
+                env = torch.einsum("bpxy,bxnr,byms->bpnmrs", env, site, site.conj())
+                env = env.reshape(env.shape[0], -1, env.shape[-2], env.shape[-1])
+            else:
+                env = torch.einsum("bpxy,bxnr,byns->bpnrs", env, site, site.conj())
+                env = env.reshape(env.shape[0], -1, env.shape[-2], env.shape[-1])
+        return env[..., 0, 0]
+
+    def probs(self, sites, wires):
+        """
+        Computes the Fock basis probabilities of the given wires, tracing out the others.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wires (list): Wires to return probabilities for.
+
+        Returns:
+        - torch.Tensor: Probabilities of shape (batch, cutoff ** len(wires)), in lexicographic
+          order of the basis states.
+        """
+        ordered = sorted(wires)
+        probs = self._environments(sites, ordered, open_pairs=False).real
+        if ordered != list(wires):
+            batch = probs.shape[0]
+            probs = probs.reshape((batch,) + (self.cutoff_dim,) * len(wires))
+            probs = probs.permute(0, *[ordered.index(w) + 1 for w in wires]).reshape(batch, -1)
+        return probs
+
+    def quad_expectation(self, sites, wire, phi=0.0):
+        """
+        Computes the expectation value of the rotated quadrature cos(phi) x + sin(phi) p.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wire (int): The measured wire.
+        - phi (float, optional): Quadrature angle. Default is 0.0 (the x quadrature).
+
+        Returns:
+        - torch.Tensor: Expectation values of shape (batch,).
+        """
+        c = self.cutoff_dim
+        rho = self.reduced_density_matrix(sites, wire)
+        sqrt_n = torch.sqrt(torch.arange(1, c, dtype=rho.real.dtype, device=rho.device))
+        # <a> = Tr(rho a) = sum_n sqrt(n + 1) rho[n + 1, n]
+        a = (torch.diagonal(rho, offset=-1, dim1=1, dim2=2) * sqrt_n).sum(-1)
+        a = a * complex(math.cos(phi), -math.sin(phi))
+        return 2.0 * math.sqrt(self.hbar / 2) * a.real
+
+    def reduced_density_matrix(self, sites, wire):
+        """
+        Computes the reduced density matrix of a wire, tracing out the others.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wire (int): The wire.
+
+        Returns:
+        - torch.Tensor: Density matrices of shape (batch, cutoff, cutoff).
+        """
+        c = self.cutoff_dim
+        return self._environments(sites, [wire], open_pairs=True).reshape(-1, c, c)
+
+    @staticmethod
+    def _traced_environments(sites):
+        """
+        Contracts the MPS with its conjugate over every physical index, from the left and from the
+        right. left[i] holds sites 0..i-1 and right[i] sites i..N-1, as (batch, bond, bond) tensors.
+        """
+        batch = sites[0].shape[0]
+        ones = torch.ones(batch, 1, 1, dtype=sites[0].dtype, device=sites[0].device)
+        left, right = [ones], [ones]
+        for site in sites:
+            left.append(torch.einsum("bxy,bxnr,byns->brs", left[-1], site, site.conj()))
+        for site in reversed(sites):
+            right.insert(0, torch.einsum("bxnr,byns,brs->bxy", site, site.conj(), right[0]))
+        return left, right
+
+    def _selected_probs(self, sites, wires, indices):
+        """
+        Computes the probabilities of selected basis states of sorted wires, tracing out the others.
+        indices has shape (num_states, len(wires)) or, for one selection per sample,
+        (batch, num_states, len(wires)); the result has shape (batch, num_states).
+        """
+        batch = sites[0].shape[0]
+        if indices.dim() == 2:
+            indices = indices.expand(batch, -1, -1)
+        samples = torch.arange(batch, device=indices.device)[:, None]
+        env = torch.ones(batch, indices.shape[1], 1, 1, dtype=self.dtype, device=sites[0].device)
+        for wire, site in enumerate(sites):
+            if wire in wires:
+                selected = site.permute(0, 2, 1, 3)[samples, indices[..., wires.index(wire)]]
+                env = torch.einsum("bkxy,bkxr,bkys->bkrs", env, selected, selected.conj())
+            else:
+                env = torch.einsum("bkxy,bxnr,byns->bkrs", env, site, site.conj())
+        return env[..., 0, 0].real
+
+    def marginal_probs(self, sites, wires):
+        """
+        Computes the Fock basis probabilities of every given wire on its own, from the environments
+        to the left and to the right of the wire.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wires (list): Wires to return marginals for.
+
+        Returns:
+        - torch.Tensor: Marginals of shape (batch, len(wires) * cutoff).
+        """
+        left, right = self._traced_environments(sites)
+        marginals = [torch.einsum("bxy,bxnr,byns,brs->bn", left[w], sites[w], sites[w].conj(), right[w + 1])
+                     for w in wires]
+        return torch.cat(marginals, dim=-1).real
+
+    def basis_probs(self, sites, wires, states):
+        """
+        Computes the probabilities of selected Fock basis states of the given wires, tracing out
+        the others. Every basis state is contracted along the chain on its own, so the cost is
+        linear in the number of states and wires.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wires (list): Wires the basis states are defined on.
+        - states (array-like): Basis states of shape (num_states, len(wires)).
+
+        Returns:
+        - torch.Tensor: Probabilities of shape (batch, num_states).
+        """
+        ordered = sorted(wires)
+        states = np.asarray(states, dtype=np.int64)[:, [wires.index(w) for w in ordered]]
+        basis_indices(states, self.cutoff_dim)  # validates the photon numbers
+        return self._selected_probs(sites, ordered, torch.as_tensor(states, device=sites[0].device))
+
+    def top_k_probs(self, sites, wires, k):
+        """
+        Computes the k most probable Fock basis states of the given wires.
+
+        The basis states are searched best-first over a tree whose nodes are the prefixes of the
+        basis states along the chain: the probability of a prefix, obtained from the environment
+        of the prefix and the traced environment of the rest of the chain, bounds the probability
+        of every basis state extending it, so the first k complete basis states taken from the
+        queue are the k most probable ones. The search runs without gradients; the probabilities
+        of the basis states it finds are then evaluated differentiably.
+
+        Parameters:
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+        - wires (list): Wires the basis states are defined on.
+        - k (int): Number of basis states.
+
+        Returns:
+        - torch.Tensor: Tensor of shape (batch, 2, k) holding the probabilities in decreasing order
+          and the ``qml.probs`` indices of the basis states.
+        """
+        c = self.cutoff_dim
+        ordered = sorted(wires)
+        if k > c ** len(wires):
+            raise ValueError(f"k must be at most {c ** len(wires)}, got {k}.")
+        # The search pops one prefix at a time and compares probabilities on the host, so it runs
+        # on CPU copies of the sites rather than synchronizing with the device at every prefix
+        detached = [site.detach().cpu() for site in sites]
+        _, right = self._traced_environments(detached)
+
+        found = []
+        for b in range(detached[0].shape[0]):
+            found.append(self._best_first(detached, right, ordered, b, k))
+        states = torch.tensor(found, device=sites[0].device)
+
+        probs = self._selected_probs(sites, ordered, states)
+        indices = basis_indices(states[..., [ordered.index(w) for w in wires]].cpu().numpy(), c)
+        return torch.stack([probs, torch.as_tensor(indices, dtype=probs.dtype, device=probs.device)], dim=1)
+
+    def _best_first(self, sites, right, wires, b, k):
+        """
+        Finds the k most probable basis states of sorted wires for sample b of the batch.
+        """
+        def advance(env, wire):
+            # Traces out the unselected wires up to the next selected one
+            while wire < self.num_wires and wire not in wires:
+                env = torch.einsum("xy,xnr,yns->rs", env, sites[wire][b], sites[wire][b].conj())
+                wire += 1
+            return env, wire
+
+        env, wire = advance(torch.ones(1, 1, dtype=self.dtype, device=sites[0].device), 0)
+        queue = [(-1.0, 0, wire, env, ())]
+        counter = 1
+        found = []
+        while len(found) < k:
+            _, _, wire, env, prefix = heapq.heappop(queue)
+            if wire == self.num_wires:
+                found.append(prefix)
+                continue
+            site = sites[wire][b]
+            for n in range(self.cutoff_dim):
+                child, child_wire = advance(torch.einsum("xy,xr,ys->rs", env, site[:, n], site[:, n].conj()),
+                                            wire + 1)
+                prob = (child * right[child_wire][b]).sum().real.item()
+                heapq.heappush(queue, (-prob, counter, child_wire, child, prefix + (n,)))
+                counter += 1
+        return found
+
+    def measure(self, measurements, sites):
+        """
+        Evaluates the measurements of a tape on the final state.
+
+        Parameters:
+        - measurements (list): PennyLane measurement processes (``qml.probs``, ``qml.expval`` of
+          ``qml.X`` / ``qml.P``, or the measurements of backends.measurements).
+        - sites (list): Site tensors of shape (batch, left bond, cutoff, right bond).
+
+        Returns:
+        - torch.Tensor: The measurement results with a leading batch dimension.
+        """
+        batch = sites[0].shape[0]
+        results = []
+        for m in measurements:
+            if m.return_type is Probability:
+                wires = m.wires.tolist() or list(range(self.num_wires))
+                probs = self.probs(sites, wires)
+                results.append(probs if self.sampler is None else self.sampler.probabilities(probs))
+            elif m.return_type is Expectation and m.obs.name in ("X", "P"):
+                phi = 0.0 if m.obs.name == "X" else math.pi / 2
+                if self.sampler is None:
+                    results.append(self.quad_expectation(sites, m.obs.wires[0], phi))
+                else:
+                    rho = self.reduced_density_matrix(sites, m.obs.wires[0])
+                    results.append(self.sampler.expval(rho, phi, self.hbar))
+            elif self.sampler is not None:
+                raise ValueError(f"Measurement {m} is not supported when sampling shots.")
+            elif isinstance(m, MarginalProbsMP):
+                results.append(self.marginal_probs(sites, m.wires.tolist() or list(range(self.num_wires))))
+            elif isinstance(m, BasisProbsMP):
+                results.append(self.basis_probs(sites, m.wires.tolist() or list(range(self.num_wires)), m.states))
+            elif isinstance(m, TopKProbsMP):
+                results.append(self.top_k_probs(sites, m.wires.tolist() or list(range(self.num_wires)), m.k))
+            else:
+                raise ValueError(f"Measurement {m} is not supported by the MPS backend.")
+
+        if len(results) == 1:
+            return results[0]
+        return torch.cat([r.reshape(batch, -1) for r in results], dim=-1)
+
+    def execute(self, tape):
+        """
+        Simulates a recorded circuit for every sample of the batch.
+
+        Parameters:
+        - tape (pennylane.tape.QuantumTape): The recorded circuit. Gate parameters with a
+          leading dimension are treated as one value per sample.
+
+        Returns:
+        - torch.Tensor: The measurement results. If the tape is not batched, the leading batch
+          dimension is removed.
+        """
+        return self.simulate(tape.operations, tape.measurements)
+
+    def simulate(self, operations, measurements):
+        """
+        Simulates a sequence of gates and measurements.
+
+        Parameters:
+        - operations (list): PennyLane operations. Gate parameters with a leading dimension are
+          treated as one value per sample.
+        - measurements (list): PennyLane measurement processes.
+
+        Returns:
+        - torch.Tensor: The measurement results. If no gate is batched, the leading batch
+          dimension is removed.
+        """
+        size = batch_size(operations)
+        device = parameter_device(operations)
+        operations, report = self.compile(operations)
+        if report is not None:
+            self.last_report = report
+        self._truncation_error = 0.0
+        self.max_bond_used = 1
+        sites = self.apply(operations, self.vacuum(size or 1, device))
+        results = self.measure(measurements, sites)
+        return results if size is not None else results[0]
@@ -0,0 +1,212 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import pennylane as qml
+import torch
+import torch.multiprocessing as mp
+from torch import nn
+
+# TorchLayer of the current worker process, built by _init_worker
+_worker_layer = None
+
+
+def _init_worker(circuit, weight_shapes):
+    """
+    Builds the TorchLayer (and with it the device instance) owned by a worker process.
+    """
+    global _worker_layer
+    # One simulation per core: keep the intra-op thread pools from oversubscribing the node. In
+    # a forked worker this also runs before any parallel region could touch the thread pool
+    # inherited from the parent.
+    torch.set_num_threads(1)
+    if not isinstance(circuit, qml.QNode):
+        # A picklable factory, e.g. functools.partial(build_qnode, config)
+        circuit = circuit()
+    _worker_layer = qml.qnn.TorchLayer(circuit, weight_shapes)
+
+
+def _load_weights(weights):
+    with torch.no_grad():
+        for name, weight in weights.items():
+            getattr(_worker_layer, name).copy_(weight)
+
+
+def _forward_shard(inputs, weights):
+    """
+    Evaluates the circuit on a shard of the batch.
+    """
+    _load_weights(weights)
+    with torch.no_grad():
+        return _worker_layer(inputs)
+
+
+def _backward_shard(inputs, weights, grad_output):
+    """
+    Computes the vector-Jacobian products of a shard of the batch with respect to the inputs
+    and to the weights.
+    """
+    _load_weights(weights)
+    _worker_layer.zero_grad()
+    inputs = inputs.clone().requires_grad_(True)
+    # The worker may have been forked from inside a no_grad region
+    with torch.enable_grad():
+        _worker_layer(inputs).backward(grad_output)
+    return inputs.grad, {name: getattr(_worker_layer, name).grad for name in weights}
+
+
+class _ParallelExecution(torch.autograd.Function):
+    """
+    Runs the forward and the backward pass of a ParallelTorchLayer on its worker pool.
+    """
+
+    @staticmethod
+    def forward(ctx, layer, inputs, *weights):
+        ctx.layer = layer
+        ctx.save_for_backward(inputs, *weights)
+        weights = layer.named_weights(weights)
+        shards = layer.shard(inputs)
+        return torch.cat(layer.pool.starmap(_forward_shard, [(shard, weights) for shard in shards]))
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        inputs, *weights = ctx.saved_tensors
+        layer = ctx.layer
+        named = layer.named_weights(weights)
+        tasks = [(shard, named, grad) for shard, grad in zip(layer.shard(inputs), layer.shard(grad_output))]
+        results = layer.pool.starmap(_backward_shard, tasks)
+
+        grad_inputs = torch.cat([grad for grad, _ in results])
+        grad_weights = [sum(grads[name] for _, grads in results) for name in named]
+        return (None, grad_inputs, *grad_weights)
+
+
+class ParallelTorchLayer(nn.Module):
+    """
+    A drop-in replacement for ``qml.qnn.TorchLayer`` that shards every batch across a pool of
+    worker processes.
+
+    ``qml.qnn.TorchLayer`` runs the QNode once per sample on a single core. This layer splits
+    the batch into one contiguous shard per worker; every worker holds its own TorchLayer and
+    device instance and evaluates its shard serially. The backward pass is sharded in the same
+    way: every worker returns the vector-Jacobian products of its shard for the inputs and the
+    weights, which are summed over the shards. The workers do not keep the autograd graphs of
+    the forward pass, so the backward pass re-evaluates the circuit on every shard with the
+    circuit's differentiation method: a training step costs two forward evaluations of the batch
+    in addition to the gradient computation. Input, weight and output tensors are exchanged
+    through shared memory by ``torch.multiprocessing``.
+
+    The pool is started on the first forward pass. Circuits given as a picklable factory of the
+    QNode are built in workers started with the "forkserver" method, which are not forked from
+    the (multi-threaded) training process. A QNode itself is usually not picklable (the function
+    of a decorated QNode is shadowed by the QNode), so its workers are forked; forking a process
+    whose OpenMP or intra-op thread pools are running can deadlock, which the workers mitigate
+    by limiting themselves to a single thread before running anything else. Call ``close()`` to
+    stop the workers.
+
+    Usage:
+    To use the ParallelTorchLayer class, import it as follows:
+    from backends.parallel_layer import ParallelTorchLayer
+
+    Example:
+    qlayer = ParallelTorchLayer(qnn_circuit, {"var": (2, 50)}, num_workers=32)
+    output = qlayer(input_tensor)
+    """
+
+    def __init__(self, circuit, weight_shapes, num_workers, start_method=None):
+        """
+        Initializes the ParallelTorchLayer class with the given parameters.
+
+        Parameters:
+        - circuit (pennylane.QNode or callable): The QNode, taking the input data as its first argument
+          ``inputs`` followed by the weights named in ``weight_shapes``, or a picklable function
+          without arguments returning it, which every worker calls once.
+        - weight_shapes (dict): Mapping from weight argument names to their shapes.
+        - num_workers (int): Number of worker processes.
+        - start_method (str, optional): Multiprocessing start method of the pool. Methods other
+          than "fork" require the circuit to be picklable. Default is None: "forkserver" for a
+          factory and "fork" for a QNode.
+        """
+        super(ParallelTorchLayer, self).__init__()
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be positive, got {num_workers}.")
+        self.circuit = circuit
+        self.weight_shapes = dict(weight_shapes)
+        self.num_workers = num_workers
+        if start_method is None:
+            start_method = "fork" if isinstance(circuit, qml.QNode) else "forkserver"
+        self.start_method = start_method
+        self._pool = None
+
+        # Same initialization as qml.qnn.TorchLayer: uniform on [0, 2*pi]
+        for name, shape in self.weight_shapes.items():
+            self.register_parameter(name, nn.Parameter(nn.init.uniform_(torch.empty(shape), b=2 * math.pi)))
+
+    @property
+    def pool(self):
+        """
+        The worker pool, started on first use.
+        """
+        if self._pool is None:
+            context = mp.get_context(self.start_method)
+            self._pool = context.Pool(self.num_workers, initializer=_init_worker,
+                                      initargs=(self.circuit, self.weight_shapes))
+        return self._pool
+
+    def named_weights(self, weights):
+        """
+        Maps weight tensors, in the order of weight_shapes, to their detached values by name.
+        """
+        return {name: weight.detach() for name, weight in zip(self.weight_shapes, weights)}
+
+    def shard(self, tensor):
+        """
+        Splits a batch into at most num_workers non-empty contiguous shards.
+        """
+        return [shard for shard in torch.tensor_split(tensor.detach(), self.num_workers) if len(shard)]
+
+    def forward(self, inputs):
+        """
+        Evaluates the circuit for every sample of the input batch.
+
+        Parameters:
+        - inputs (torch.Tensor): Input tensor of shape (..., num_features).
+
+        Returns:
+        - torch.Tensor: Output tensor of shape (..., output_size).
+        """
+        batch_dims = inputs.shape[:-1]
+        inputs = inputs.reshape(-1, inputs.shape[-1])
+        weights = [getattr(self, name) for name in self.weight_shapes]
+        results = _ParallelExecution.apply(self, inputs, *weights)
+        return results.reshape(batch_dims + results.shape[1:])
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def __del__(self):
+        if "_pool" in self.__dict__:
+            self.close()
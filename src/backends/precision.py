@@ -0,0 +1,57 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import time
+import torch
+from backends.fock_backend import FockBackend
+from backends.torch_fock_layer import TorchFockLayer
+
+
+def validate_precision(circuit, weights, inputs, num_wires, cutoff_dim, precision="single", reference="double"):
+    """
+    Compares the outputs of a circuit simulated at two precisions on a sample batch.
+
+    Parameters:
+    - circuit (callable or pennylane.QNode): The circuit, as accepted by TorchFockLayer.
+    - weights (dict): Mapping from weight argument names to their values.
+    - inputs (torch.Tensor): Sample batch of shape (batch, num_features).
+    - num_wires (int): Number of wires (qumodes) of the circuit.
+    - cutoff_dim (int): Fock space cutoff dimension.
+    - precision (str or torch.dtype, optional): Precision to validate. Default is "single".
+    - reference (str or torch.dtype, optional): Reference precision. Default is "double".
+
+    Returns:
+    - dict: Maximum and mean absolute deviation of the outputs (e.g. the probabilities) from the
+      reference, and the forward wall-clock time in seconds at both precisions.
+    """
+    outputs = {}
+    seconds = {}
+    for name, dtype in (("precision", precision), ("reference", reference)):
+        layer = TorchFockLayer(circuit, {key: value.shape for key, value in weights.items()},
+                               FockBackend(num_wires, cutoff_dim, dtype=dtype))
+        with torch.no_grad():
+            for key, value in weights.items():
+                getattr(layer, key).copy_(torch.as_tensor(value))
+            start = time.perf_counter()
+            outputs[name] = layer(inputs.to(torch.float64)).to(torch.float64)
+            seconds[name] = time.perf_counter() - start
+
+    deviation = (outputs["precision"] - outputs["reference"]).abs()
+    return {
+        "max_deviation": deviation.max().item(),
+        "mean_deviation": deviation.mean().item(),
+        "seconds": seconds["precision"],
+        "reference_seconds": seconds["reference"],
+    }
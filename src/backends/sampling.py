@@ -0,0 +1,180 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import torch
+
+
+def hermite_functions(xi, cutoff):
+    """
+    Evaluates the harmonic oscillator eigenfunctions psi_0 .. psi_{cutoff - 1} (the Fock states in
+    the position representation, with hbar = 1) by their three-term recurrence.
+
+    Parameters:
+    - xi (torch.Tensor): Dimensionless positions of shape (num_points,).
+    - cutoff (int): Fock space cutoff dimension.
+
+    Returns:
+    - torch.Tensor: Values of shape (cutoff, num_points).
+    """
+    psi = [math.pi ** -0.25 * torch.exp(-xi ** 2 / 2)]
+    if cutoff > 1:
+        psi.append(math.sqrt(2) * xi * psi[0])
+    for n in range(1, cutoff - 1):
+        psi.append(math.sqrt(2 / (n + 1)) * xi * psi[n] - math.sqrt(n / (n + 1)) * psi[n - 1])
+    return torch.stack(psi)
+
+
+class ShotSampler:
+    """
+    Finite-shot estimates of the measurement results of a batched simulation.
+
+    Instead of running the circuit once per shot, the exact output distributions of the whole
+    batch are computed once and the shots are drawn from them with a single vectorized
+    ``torch.multinomial`` call per measurement:
+    - photon-number measurements (``qml.probs``) draw basis states from the Fock probabilities and
+      return their empirical frequencies, or their counts;
+    - quadrature measurements (``qml.expval`` of ``qml.X`` / ``qml.P``) draw homodyne outcomes from
+      the quadrature distribution of the reduced density matrix of the wire, discretized on a grid,
+      and return their mean.
+
+    The draws come from the sampler's own random generator, so a seeded sampler reproduces the same
+    shots. Sampled results are not differentiable.
+
+    Usage:
+    To use the ShotSampler class, import it as follows:
+    from backends.sampling import ShotSampler
+
+    Example:
+    backend = FockBackend(num_wires=6, cutoff_dim=2, sampler=ShotSampler(shots=1000, seed=42))
+    """
+
+    def __init__(self, shots, seed=None, counts=False, grid_size=512):
+        """
+        Initializes the ShotSampler class with the given parameters.
+
+        Parameters:
+        - shots (int): Number of shots per sample of the batch.
+        - seed (int, optional): Seed of the random generator. Default is None (random seed).
+        - counts (bool, optional): Whether photon-number measurements return the counts of every basis
+          state instead of their frequencies. Default is False.
+        - grid_size (int, optional): Number of bins of the quadrature distribution. Default is 512.
+        """
+        if shots < 1:
+            raise ValueError(f"shots must be positive, got {shots}.")
+        self.shots = shots
+        self.counts = counts
+        self.grid_size = grid_size
+        self.generator = torch.Generator()
+        self.manual_seed(seed)
+
+    def manual_seed(self, seed=None):
+        """
+        Reseeds the random generator, so that the following shots are reproduced.
+
+        Parameters:
+        - seed (int, optional): The seed. Default is None (random seed).
+        """
+        if seed is None:
+            self.generator.seed()
+        else:
+            self.generator.manual_seed(seed)
+
+    def draw(self, weights):
+        """
+        Draws the shots of every row of a batch of (unnormalized) distributions.
+
+        Parameters:
+        - weights (torch.Tensor): Non-negative weights of shape (batch, num_outcomes).
+
+        Returns:
+        - torch.Tensor: Outcome indices of shape (batch, shots).
+        """
+        weights = weights.detach().clamp(min=0).to("cpu", torch.float64)
+        return torch.multinomial(weights, self.shots, replacement=True, generator=self.generator)
+
+    def sample_counts(self, probs):
+        """
+        Counts the basis states drawn from a batch of Fock probabilities.
+
+        Parameters:
+        - probs (torch.Tensor): Probabilities of shape (batch, num_states). States lost to the Fock
+          cutoff are not drawn, i.e. the probabilities are renormalized.
+
+        Returns:
+        - torch.Tensor: Counts of shape (batch, num_states), summing to shots.
+        """
+        outcomes = self.draw(probs)
+        counts = torch.zeros(probs.shape, dtype=torch.float64).scatter_add_(1, outcomes, torch.ones(outcomes.shape,
+                                                                                                    dtype=torch.float64))
+        return counts.to(probs.device, probs.dtype)
+
+    def probabilities(self, probs):
+        """
+        Estimates a batch of Fock probabilities from shots.
+
+        Parameters:
+        - probs (torch.Tensor): Exact probabilities of shape (batch, num_states).
+
+        Returns:
+        - torch.Tensor: The counts, or the frequencies if the sampler does not return counts, of
+          shape (batch, num_states).
+        """
+        counts = self.sample_counts(probs)
+        return counts if self.counts else counts / self.shots
+
+    def sample_quadratures(self, rho, phi=0.0, hbar=2.0):
+        """
+        Draws homodyne outcomes of the rotated quadrature cos(phi) x + sin(phi) p.
+
+        Parameters:
+        - rho (torch.Tensor): Reduced density matrices of shape (batch, cutoff, cutoff).
+        - phi (float, optional): Quadrature angle. Default is 0.0 (the x quadrature).
+        - hbar (float, optional): Value of hbar. Default is 2.0.
+
+        Returns:
+        - torch.Tensor: Outcomes of shape (batch, shots).
+        """
+        cutoff = rho.shape[-1]
+        rho = rho.detach().to("cpu", torch.complex128)
+        # Rotating the state by -phi maps the rotated quadrature to x
+        n = torch.arange(cutoff, dtype=torch.float64)
+        rho = rho * torch.exp(-1j * phi * (n[:, None] - n[None, :]))
+
+        # psi_n(xi) decays like exp(-xi^2 / 2) beyond the classical turning point sqrt(2 n + 1)
+        bound = math.sqrt(2 * cutoff + 1) + 5.0
+        xi = torch.linspace(-bound, bound, self.grid_size, dtype=torch.float64)
+        psi = hermite_functions(xi, cutoff)
+        density = torch.einsum("mg,bmn,ng->bg", psi.to(rho.dtype), rho, psi.to(rho.dtype)).real
+
+        outcomes = self.draw(density)
+        step = xi[1] - xi[0]
+        jitter = (torch.rand(outcomes.shape, generator=self.generator, dtype=torch.float64) - 0.5) * step
+        return math.sqrt(hbar) * (xi[outcomes] + jitter)
+
+    def expval(self, rho, phi=0.0, hbar=2.0):
+        """
+        Estimates the expectation value of the rotated quadrature cos(phi) x + sin(phi) p from shots.
+
+        Parameters:
+        - rho (torch.Tensor): Reduced density matrices of shape (batch, cutoff, cutoff).
+        - phi (float, optional): Quadrature angle. Default is 0.0 (the x quadrature).
+        - hbar (float, optional): Value of hbar. Default is 2.0.
+
+        Returns:
+        - torch.Tensor: Estimates of shape (batch,).
+        """
+        samples = self.sample_quadratures(rho, phi, hbar).mean(-1)
+        return samples.to(rho.device, rho.real.dtype)
@@ -0,0 +1,264 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+import pennylane as qml
+import torch
+from torch import nn
+from torch.utils.checkpoint import checkpoint
+from backends.circuit_utils import is_batched
+from backends.compiler import FusedGate
+from backends.memory_planner import TRANSIENT_STATES, plan_memory
+
+
+class TorchFockLayer(nn.Module):
+    """
+    A drop-in replacement for ``qml.qnn.TorchLayer`` that evaluates a quantum circuit on the
+    batched PyTorch Fock backend.
+
+    ``qml.qnn.TorchLayer`` unbinds the input batch and runs the QNode once per sample. This
+    layer instead records the circuit once per forward pass with one gate parameter per
+    sample, and simulates the whole minibatch in a single vectorized pass. Gradients flow
+    through the simulation with autograd.
+
+    By default the gates that only depend on the weights (the QNN layers following the data
+    encoder) are hoisted out of the batch: their combined transfer operator is built once and
+    applied to the batch of encoded states with a single batched matmul. In inference
+    (torch.no_grad()) the operator is reused by later forward passes until the weights change.
+    When gradients are enabled it is rebuilt once per forward pass, so that every pending
+    autograd graph owns its operator and the graphs can be backpropagated independently.
+
+    With a memory budget, every batch is planned with ``plan_memory`` and, if its estimated
+    peak memory exceeds the budget, simulated in chunks. When gradients are required each
+    chunk is checkpointed, so that only one chunk's intermediate states are held at a time
+    and the chunk is recomputed during the backward pass.
+
+    Usage:
+    To use the TorchFockLayer class, import it as follows:
+    from backends.torch_fock_layer import TorchFockLayer
+
+    Example:
+    backend = FockBackend(num_wires=6, cutoff_dim=2)
+    qlayer = TorchFockLayer(qnn_circuit, {"var": (2, 38)}, backend)
+    output = qlayer(input_tensor)
+    """
+
+    def __init__(self, circuit, weight_shapes, backend, hoist_weights=True, memory_budget=None):
+        """
+        Initializes the TorchFockLayer class with the given parameters.
+
+        Parameters:
+        - circuit (callable or pennylane.QNode): The circuit function. It must take the input
+          data as its first argument ``inputs``, followed by the weights named in ``weight_shapes``.
+          The inputs are passed as a (batch, num_features) tensor, as accepted by QuantumDataEncoder.
+          If a QNode is given, its underlying function is used and its device is ignored.
+        - weight_shapes (dict): Mapping from weight argument names to their shapes.
+        - backend (FockBackend): The simulator used to execute the circuit.
+        - hoist_weights (bool, optional): Whether to apply the gates without batched parameters at the
+          end of the circuit as one cached transfer operator. These gates must only depend on the
+          weights. Default is True.
+        - memory_budget (int, optional): Memory budget of the simulation in bytes. Batches whose
+          estimated peak memory exceeds it are simulated in chunks, and a ValueError is raised if a
+          single sample does not fit. Default is None (no budget).
+        """
+        super(TorchFockLayer, self).__init__()
+        self.circuit = getattr(circuit, "func", circuit)
+        self.backend = backend
+        self.hoist_weights = hoist_weights
+        self.memory_budget = memory_budget
+        self.qnode_weights = {}
+        self._transfer = None
+        # Memory plan of the last batch, when a memory budget is set
+        self.last_plan = None
+
+        # Same initialization as qml.qnn.TorchLayer: uniform on [0, 2*pi]
+        for name, shape in weight_shapes.items():
+            weight = nn.Parameter(nn.init.uniform_(torch.empty(shape), b=2 * math.pi))
+            self.register_parameter(name, weight)
+            self.qnode_weights[name] = weight
+
+    def construct(self, inputs):
+        """
+        Records the circuit for a batch of inputs.
+
+        Parameters:
+        - inputs (torch.Tensor): Input tensor of shape (batch, num_features).
+
+        Returns:
+        - pennylane.tape.QuantumTape: The recorded circuit, whose data-dependent gate
+          parameters have shape (batch,).
+        """
+        weights = {name: weight.to(inputs) for name, weight in self.qnode_weights.items()}
+        with qml.tape.QuantumTape() as tape:
+            # The QuantumDataEncoder takes the whole (batch, num_features) tensor and records
+            # each gate once with one parameter per sample, i.e. a batched gate parameter.
+            self.circuit(inputs, **weights)
+        return tape
+
+    def forward(self, inputs):
+        """
+        Evaluates the circuit for every sample of the input batch.
+
+        Parameters:
+        - inputs (torch.Tensor): Input tensor of shape (..., num_features).
+
+        Returns:
+        - torch.Tensor: Output tensor of shape (..., output_size).
+        """
+        if torch.is_grad_enabled():
+            # A transfer operator with an autograd graph only serves the pass that built it
+            self._transfer = None
+        try:
+            return self._forward(inputs)
+        finally:
+            if torch.is_grad_enabled():
+                self._transfer = None
+
+    def _forward(self, inputs):
+        batch_dims = inputs.shape[:-1]
+        inputs = inputs.reshape(-1, inputs.shape[-1])
+
+        chunk_size = inputs.shape[0]
+        if self.memory_budget is not None:
+            self.last_plan = self.plan(inputs)
+            chunk_size = self.last_plan.chunk_size
+
+        if chunk_size >= inputs.shape[0]:
+            results = self.run(inputs)
+        elif torch.is_grad_enabled():
+            # The chunks build their own transfer operator so that the recomputation of a chunk
+            # in the backward pass records the same operations as its forward pass
+            results = torch.cat([checkpoint(self.run, chunk, False, use_reentrant=False)
+                                 for chunk in inputs.split(chunk_size)])
+        else:
+            results = torch.cat([self.run(chunk) for chunk in inputs.split(chunk_size)])
+        return results.reshape(batch_dims + results.shape[1:])
+
+    def run(self, inputs, cache_transfer=True):
+        """
+        Evaluates the circuit for a (batch, num_features) tensor in one simulation.
+
+        Parameters:
+        - inputs (torch.Tensor): Input tensor of shape (batch, num_features).
+        - cache_transfer (bool, optional): Whether to reuse the cached transfer operator. Default is True.
+
+        Returns:
+        - torch.Tensor: Output tensor of shape (batch, output_size).
+        """
+        tape = self.construct(inputs)
+        results = self.execute(tape, cache_transfer)
+        if self.backend.batch_size(tape.operations) is None:
+            # No gate depends on the inputs, so every sample has the same output
+            results = results.unsqueeze(0).expand((inputs.shape[0],) + results.shape)
+        return results.to(inputs.dtype)
+
+    def plan(self, inputs, auto_chunk=True):
+        """
+        Plans the simulation of a batch under the memory budget.
+
+        Parameters:
+        - inputs (torch.Tensor): Input tensor of shape (batch, num_features).
+        - auto_chunk (bool, optional): Whether to chunk the batch if it does not fit the budget, rather
+          than raising a ValueError. Default is True.
+
+        Returns:
+        - MemoryPlan: The plan, counting the gates the backend applies to the batched state once
+          the weight-only gates are hoisted and the circuit is compiled.
+        """
+        operations = self.construct(inputs[:1]).operations
+        split = self.hoisted_split(operations)
+        if split is not None:
+            operations = operations[:split] + [FusedGate(operations[split:])]
+        operations = self.backend.compile(operations)[0]
+        requires_grad = torch.is_grad_enabled() and (inputs.requires_grad or any(
+            weight.requires_grad for weight in self.qnode_weights.values()))
+
+        # The fused operators are built by applying their gates to every basis state of their wires
+        overhead = 0
+        itemsize = torch.empty((), dtype=self.backend.dtype).element_size()
+        for op in operations:
+            if isinstance(op, FusedGate):
+                saved = len(op.operations) if requires_grad else 0
+                overhead += self.backend.cutoff_dim ** (2 * len(op.wires)) * itemsize * (saved + TRANSIENT_STATES)
+
+        return plan_memory(self.backend.num_wires, self.backend.cutoff_dim, inputs.shape[0], len(operations),
+                           self.memory_budget, self.backend.dtype, requires_grad, auto_chunk, overhead)
+
+    def execute(self, tape, cache_transfer=True):
+        """
+        Executes a recorded circuit, applying its weight-only suffix as a hoisted transfer operator.
+
+        Parameters:
+        - tape (pennylane.tape.QuantumTape): The recorded circuit.
+        - cache_transfer (bool, optional): Whether to reuse the cached transfer operator. Default is True.
+
+        Returns:
+        - torch.Tensor: The measurement results, as returned by the backend.
+        """
+        operations = tape.operations
+        split = self.hoisted_split(operations)
+        if split is None or (self.backend.gaussian is not None and self.backend.gaussian.supports(tape)):
+            return self.backend.execute(tape)
+
+        suffix = operations[split:]
+        if cache_transfer:
+            matrix = self.transfer_operator(suffix)
+        else:
+            matrix = self.backend.fused_operator(FusedGate(suffix))
+        return self.backend.simulate(operations[:split] + [FusedGate(suffix, matrix)], tape.measurements)
+
+    def hoisted_split(self, operations):
+        """
+        Finds the weight-only suffix of a circuit that is applied as a transfer operator.
+
+        Parameters:
+        - operations (list): PennyLane operations of the recorded circuit.
+
+        Returns:
+        - int or None: Index of the first hoisted operation, or None if no suffix is hoisted.
+        """
+        split = len(operations)
+        while split > 0 and not is_batched(operations[split - 1]):
+            split -= 1
+        suffix = operations[split:]
+
+        if (not self.hoist_weights or split == 0 or len(suffix) < 2
+                or self.backend.cutoff_dim ** len(FusedGate(suffix).wires) > self.backend.max_fused_dim):
+            return None
+        return split
+
+    def transfer_operator(self, operations):
+        """
+        Returns the operator of the weight-only gates, rebuilding it only if the weights have
+        been modified or if the circuit changed. With gradients enabled, the cache is emptied by
+        every forward pass, i.e. the operator is built once per pass.
+
+        Parameters:
+        - operations (list): PennyLane operations without batched parameters.
+
+        Returns:
+        - torch.Tensor: The transfer operator on the Fock space of the gates' wires.
+        """
+        key = (
+            tuple((op.name, tuple(op.wires)) for op in operations),
+            tuple((weight.data_ptr(), weight._version) for weight in self.qnode_weights.values()),
+            torch.is_grad_enabled(),
+        )
+        if self._transfer is not None and self._transfer[0] == key:
+            return self._transfer[1]
+
+        matrix = self.backend.fused_operator(FusedGate(operations))
+        self._transfer = (key, matrix)
+        return matrix
@@ -26,18 +26,32 @@ To import the entire API from layers:
 """
 
 
-from .input_embedding import InputEmbedding
-from .multi_headed_attention import MultiHeadedAttention
-from .qnn_circuit import qnn_circuit
-from .quantum_data_encoder import QuantumDataEncoder
-from .qnn_layer import QuantumNeuralNetworkLayer
-from .scaled_dot_product import ScaledDotProduct
-from .weight_initializer import WeightInitializer
+from utils.lazy_import import lazy_exports
+
+# The submodules import PyTorch and PennyLane, so they are only imported when one of their
+# names is first accessed
+lazy_exports(__name__, {
+    "AttentionCache": ".multi_headed_attention",
+    "GateSchedule": ".gate_schedule",
+    "InputEmbedding": ".input_embedding",
+    "MultiHeadedAttention": ".multi_headed_attention",
+    "ProjectionView": ".multi_headed_attention",
+    "qnn_circuit": ".qnn_circuit",
+    "QNNCircuit": ".qnn_circuit",
+    "QuantumDataEncoder": ".quantum_data_encoder",
+    "QuantumNeuralNetworkLayer": ".qnn_layer",
+    "ScaledDotProduct": ".scaled_dot_product",
+    "WeightInitializer": ".weight_initializer",
+})
 
 __all__ = [
+    "AttentionCache",
+    "GateSchedule",
     "InputEmbedding",
     "MultiHeadedAttention",
+    "ProjectionView",
     "qnn_circuit",
+    "QNNCircuit",
     "QuantumDataEncoder",
     "QuantumNeuralNetworkLayer",
     "ScaledDotProduct",
@@ -0,0 +1,108 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import numpy as np
+import pennylane as qml
+
+GATES = {
+    "Squeezing": qml.Squeezing,
+    "Beamsplitter": qml.Beamsplitter,
+    "Rotation": qml.Rotation,
+    "Displacement": qml.Displacement,
+    "Kerr": qml.Kerr,
+}
+
+
+def _frozen(rows):
+    """
+    Builds a read-only (num_gates, 2) integer array, padding missing (or None) entries with -1.
+    """
+    array = np.full((len(rows), 2), -1, dtype=np.int64)
+    for i, row in enumerate(rows):
+        array[i, :len(row)] = [-1 if entry is None else entry for entry in row]
+    array.flags.writeable = False
+    return array
+
+
+class GateSchedule:
+    """
+    An immutable gate schedule: the sequence of gates applied by a circuit block, the wires
+    they act on and the positions of their parameters in the input (or weight) vector.
+
+    Schedules are compiled once per layout (e.g. per (num_wires, num_features) pair for the
+    QuantumDataEncoder) and cached, so the index arithmetic and bounds checks are not
+    re-derived on every call. The layout is exposed as read-only arrays for simulators and
+    exporters:
+    - gates (tuple of str): Gate names.
+    - wires (numpy.ndarray): Array of shape (num_gates, 2) with the wires of every gate,
+      padded with -1 for single-mode gates.
+    - params (numpy.ndarray): Array of shape (num_gates, 2) with the parameter indices of
+      every gate. -1 marks a parameter fixed to 0.0, or no parameter for gates with one
+      parameter (see ``GATES[gate].num_params``).
+
+    Usage:
+    To use the GateSchedule class, import it as follows:
+    from layers.gate_schedule import GateSchedule
+
+    Example:
+    schedule = QuantumDataEncoder(num_wires=6).schedule(46)
+    for gate, wires, indices in schedule:
+        print(gate, wires, indices)
+    """
+
+    __slots__ = ("num_wires", "size", "gates", "wires", "params", "_entries")
+
+    def __init__(self, num_wires, size, entries):
+        """
+        Initializes the GateSchedule class with the given gates.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes) of the circuit.
+        - size (int): Length of the parameter vector the schedule indexes into.
+        - entries (list): (gate name, wires, parameter indices) entries, in the order the gates are applied.
+          A parameter index of None stands for a parameter fixed to 0.0.
+        """
+        self.num_wires = num_wires
+        self.size = size
+        self.gates = tuple(gate for gate, _, _ in entries)
+        self.wires = _frozen([wires for _, wires, _ in entries])
+        self.params = _frozen([indices for _, _, indices in entries])
+        self._entries = tuple((gate, tuple(wires), tuple(indices)) for gate, wires, indices in entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __repr__(self):
+        return f"GateSchedule({len(self)} gates, num_wires={self.num_wires}, size={self.size})"
+
+    def apply(self, x):
+        """
+        Applies the scheduled gates with the parameters taken from x.
+
+        Parameters:
+        - x (list or array-like): Parameter vector of shape (size,), or tensor of shape
+          (batch, size) holding one vector per sample, in which case every gate is applied
+          once with a broadcast parameter.
+
+        Returns:
+        - None
+        """
+        batched = getattr(x, "ndim", 1) == 2
+        for gate, wires, indices in self._entries:
+            params = [0.0 if idx is None else x[:, idx] if batched else x[idx] for idx in indices]
+            GATES[gate](*params, wires=wires)
@@ -54,12 +54,14 @@ class InputEmbedding(nn.Module):
         self.dropoutLayer = nn.Dropout(p=self.dropout)
 
     
-    def forward(self, input):
+    def forward(self, input, offset=0):
         """
         Computes the embeddings and positional encodings for the input data.
 
         Parameters:
         - input (torch.Tensor): Input tensor containing the data to be embedded.
+        - offset (int, optional): Position of the first token, when embedding the continuation of
+          a sequence during incremental decoding. Default is 0.
 
         Returns:
         - torch.Tensor: Tensor containing the combined token embeddings and positional encodings with dropout applied.
@@ -69,7 +71,7 @@ class InputEmbedding(nn.Module):
         first_embedding = self.firstEmbedding(input).to(self.device)
         batch_size, seq_len = input.shape
 
-        positions_vector = torch.arange(0, seq_len).expand(
+        positions_vector = torch.arange(offset, offset + seq_len).expand(
             batch_size, seq_len).to(self.device)
         positional_encoding = self.secondEmbedding(
             positions_vector).to(self.device)
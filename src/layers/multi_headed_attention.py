@@ -14,9 +14,73 @@
 # ==============================================================================
 
 from torch import nn
+import torch.nn.functional as F
 from layers.scaled_dot_product import ScaledDotProduct
 import torch
 
+class AttentionCache:
+    """
+    The projected keys and values of an attention layer, kept across the steps of incremental
+    decoding so that only the new positions are projected at each step.
+
+    - For self-attention, the keys and values of the new positions are appended at every call.
+    - For attention over a fixed memory (static=True, e.g. the encoder output in the decoder),
+      the keys and values are projected on the first call and reused afterwards.
+
+    Usage:
+    To use the AttentionCache class, import it as follows:
+    from layers.multi_headed_attention import AttentionCache
+
+    Example:
+    cache = AttentionCache()
+    for token in tokens:
+        output = attention_layer(token, token, token, cache=cache)
+    """
+
+    def __init__(self, static=False):
+        """
+        Initializes the AttentionCache class with the given parameters.
+
+        Parameters:
+        - static (bool, optional): Whether the keys and values are a fixed memory projected once.
+          Default is False.
+        """
+        self.static = static
+        self.keys = None
+        self.values = None
+
+    def __len__(self):
+        """
+        Returns the number of cached positions.
+        """
+        return 0 if self.keys is None else self.keys.size(2)
+
+    def select(self, indices):
+        """
+        Keeps the cached rows of the given batch indices, in their order, e.g. to follow the beams
+        selected in beam search or to drop finished sequences.
+
+        Parameters:
+        - indices (torch.Tensor): Batch indices of shape (new_batch,).
+        """
+        if self.keys is not None:
+            self.keys = self.keys.index_select(0, indices)
+            self.values = self.values.index_select(0, indices)
+
+class ProjectionView:
+    """
+    One block of the packed projection of MultiHeadedAttention, with the weight, bias and call of
+    the separate linear layer it replaces. The weight and bias are views of the rows of
+    qkv_linear, so they follow its updates and gradients flow to it.
+    """
+
+    def __init__(self, weight, bias):
+        self.weight = weight
+        self.bias = bias
+
+    def __call__(self, inputs):
+        return F.linear(inputs, self.weight, self.bias)
+
 class MultiHeadedAttention(nn.Module):
     """
     A class used to implement the multi-headed attention mechanism,
@@ -30,16 +94,21 @@ class MultiHeadedAttention(nn.Module):
     Example:
     attention_layer = MultiHeadedAttention(num_heads=8, embed_len=128)
     output = attention_layer(queries, keys, values)
+
+    # Tiled attention with bounded memory for long sequences
+    attention_layer = MultiHeadedAttention(num_heads=8, embed_len=128, block_size=256)
     """
 
-    def __init__(self, num_heads, embed_len, mask=None):
+    def __init__(self, num_heads, embed_len, mask=None, block_size=None):
         """
         Initializes the MultiHeadedAttention class with the given parameters.
 
         Parameters:
         - num_heads (int): Number of attention heads.
         - embed_len (int): Length of the embedding vector.
-        - mask (bool, optional): Whether to apply masking. Default is None.
+        - mask (bool, optional): Whether the attention is causal. Default is None (no mask).
+        - block_size (int, optional): Block size of the tiled attention, which bounds the memory of
+          long sequences to O(seq_len * block_size) per head. Default is None (dense attention).
         """
         super(MultiHeadedAttention, self).__init__()
         self.num_heads = num_heads
@@ -48,18 +117,17 @@ class MultiHeadedAttention(nn.Module):
         self.head_length = int(self.embed_len / self.num_heads)
         self.q_in = self.v_in = self.k_in = self.embed_len
 
-        # Define linear layers for queries, keys, and values (with bias enabled by default)
-        self.q_linear = nn.Linear(self.q_in, self.q_in)
-        self.k_linear = nn.Linear(self.k_in, self.k_in)
-        self.v_linear = nn.Linear(self.v_in, self.v_in)
+        # Define the packed linear layer of the queries, keys and values, in this order (with bias
+        # enabled by default); self-attention projects them with a single matrix product
+        self.qkv_linear = nn.Linear(self.q_in, self.q_in + self.k_in + self.v_in)
 
         # Define the scaled dot-product attention mechanism with optional masking
-        self.attention = ScaledDotProduct(embed_len=self.head_length, mask=self.mask is not None)
+        self.attention = ScaledDotProduct(embed_len=self.head_length, mask=self.mask, block_size=block_size)
 
         # Define the output linear layer (with bias enabled by default)
         self.output_linear = nn.Linear(self.q_in, self.q_in)
 
-    def forward(self, queries, keys, values):
+    def forward(self, queries, keys, values, cache=None):
         """
         Computes the multi-headed attention output.
 
@@ -67,6 +135,10 @@ class MultiHeadedAttention(nn.Module):
         - queries (torch.Tensor): Tensor containing the queries (batch_size, seq_len, embed_len).
         - keys (torch.Tensor): Tensor containing the keys (batch_size, seq_len, embed_len).
         - values (torch.Tensor): Tensor containing the values (batch_size, seq_len, embed_len).
+        - cache (AttentionCache, optional): Cache of the projected keys and values of the previous
+          decoding steps. The queries are then the last positions of the sequence, and attend to
+          the cached positions as well as to the given keys and values (which are ignored once a
+          static cache is filled). Default is None.
 
         Returns:
         - torch.Tensor: Tensor containing the multi-headed attention output.
@@ -75,20 +147,86 @@ class MultiHeadedAttention(nn.Module):
         batch_size = queries.size(0)
 
         # Dimension check to ensure compatibility between queries, keys, and values
-        if queries.size(1) != keys.size(1) or queries.size(1) != values.size(1):
+        if cache is None and (queries.size(1) != keys.size(1) or queries.size(1) != values.size(1)):
             raise RuntimeError("Mismatched dimensions between queries, keys, and values.")
 
-        # Linear transformation and reshaping of queries, keys, and values
-        queries = self.q_linear(queries).reshape(batch_size, -1, self.num_heads, self.head_length)
-        queries = queries.transpose(1, 2)
-
-        keys = self.k_linear(keys).reshape(batch_size, -1, self.num_heads, self.head_length)
-        keys = keys.transpose(1, 2)
-
-        values = self.v_linear(values).reshape(batch_size, -1, self.num_heads, self.head_length)
-        values = values.transpose(1, 2)
+        static = cache is not None and cache.static and cache.keys is not None
+        if queries is keys and keys is values and not static:
+            # Self-attention: one packed projection and one reshape into heads
+            queries, keys, values = self._project(queries, 0, 3)
+        else:
+            queries, = self._project(queries, 0, 1)
+            if static:
+                keys, values = cache.keys, cache.values
+            elif keys is values:
+                keys, values = self._project(keys, 1, 2)
+            else:
+                keys, = self._project(keys, 1, 1)
+                values, = self._project(values, 2, 1)
+
+        if cache is not None and not static:
+            if cache.keys is not None:
+                keys = torch.cat([cache.keys, keys], dim=2)
+                values = torch.cat([cache.values, values], dim=2)
+            cache.keys, cache.values = keys, values
 
         # Apply scaled dot-product attention and reshape the output
         sdp_output = self.attention(queries, keys, values).transpose(1, 2).reshape(batch_size, -1, self.num_heads * self.head_length)
 
         return self.output_linear(sdp_output)
+
+    @property
+    def q_linear(self):
+        """
+        Read-only view of the query projection in qkv_linear (ProjectionView).
+        """
+        return self._view(0)
+
+    @property
+    def k_linear(self):
+        """
+        Read-only view of the key projection in qkv_linear (ProjectionView).
+        """
+        return self._view(1)
+
+    @property
+    def v_linear(self):
+        """
+        Read-only view of the value projection in qkv_linear (ProjectionView).
+        """
+        return self._view(2)
+
+    def __setattr__(self, name, value):
+        # nn.Module would register an assigned layer under the name of a view and ignore it
+        if name in ("q_linear", "k_linear", "v_linear"):
+            raise AttributeError(f"{name} is a read-only view of qkv_linear.")
+        super(MultiHeadedAttention, self).__setattr__(name, value)
+
+    def _view(self, index):
+        rows = slice(index * self.embed_len, (index + 1) * self.embed_len)
+        return ProjectionView(self.qkv_linear.weight[rows], self.qkv_linear.bias[rows])
+
+    def _project(self, inputs, first, count):
+        """
+        Applies consecutive blocks of the packed projection and splits the result into heads.
+
+        Parameters:
+        - inputs (torch.Tensor): Tensor of shape (batch_size, seq_len, embed_len).
+        - first (int): Index of the first projection (0: queries, 1: keys, 2: values).
+        - count (int): Number of projections.
+
+        Returns:
+        - tuple: count tensors of shape (batch_size, num_heads, seq_len, head_length).
+        """
+        rows = slice(first * self.embed_len, (first + count) * self.embed_len)
+        projected = F.linear(inputs, self.qkv_linear.weight[rows], self.qkv_linear.bias[rows])
+        projected = projected.reshape(inputs.size(0), -1, count, self.num_heads, self.head_length)
+        return projected.permute(2, 0, 3, 1, 4).unbind(0)
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Checkpoints saved before the packed projection hold separate q, k and v linear layers
+        for name in ("weight", "bias"):
+            keys = [f"{prefix}{projection}_linear.{name}" for projection in "qkv"]
+            if all(key in state_dict for key in keys):
+                state_dict[f"{prefix}qkv_linear.{name}"] = torch.cat([state_dict.pop(key) for key in keys])
+        super(MultiHeadedAttention, self)._load_from_state_dict(state_dict, prefix, *args, **kwargs)
@@ -13,9 +13,11 @@
 # limitations under the License.
 # ==============================================================================
 
+import functools
+from collections import namedtuple
 import pennylane as qml
-from layers import QuantumDataEncoder
-from layers import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+from layers.qnn_layer import QuantumNeuralNetworkLayer
 import sys
 import os
 
@@ -25,42 +27,200 @@ src_dir = os.path.abspath(os.path.join(script_dir, '..', 'src'))
 if src_dir not in sys.path:
     sys.path.append(src_dir)
 
-from utils.config import num_wires, num_basis, single_output, multi_output, probabilities
+from backends.measurements import basis_probs, marginal_probs, top_k_probs
+from utils import config
 
-# Select a device
-dev = qml.device("strawberryfields.fock", wires=num_wires, cutoff_dim=num_basis)
+# Everything the circuit depends on. Configurations are hashable, so that the circuit functions,
+# devices and QNodes built for them can be cached and shared.
+QNNCircuitConfig = namedtuple("QNNCircuitConfig", ["num_wires", "num_basis", "output", "basis_states", "top_k"])
 
-@qml.qnode(dev, interface="torch")
-def qnn_circuit(inputs, var):
+
+def circuit_config(num_wires=None, num_basis=None):
+    """
+    Resolves the configuration of a QNN circuit. The output type is read from utils.config when
+    the circuit is built (not when this module is imported), so changes to utils.config made
+    before building a model take effect.
+
+    Parameters:
+    - num_wires (int, optional): Number of wires (qumodes). Default is None (config.num_wires).
+    - num_basis (int, optional): Fock space cutoff dimension. Default is None (config.num_basis).
+
+    Returns:
+    - QNNCircuitConfig: The configuration.
     """
-    This module defines a quantum neural network (QNN) that can return multiple outputs,
-    a single output, or a probability distribution using PennyLane and PyTorch. The QNN
-    takes input data, encodes it using a quantum data encoder, applies multiple quantum
-    neural network layers, and returns the specified output based on the structure of 'var'.
+    if config.multi_output:
+        output = "multi"
+    elif config.marginals:
+        output = "marginals"
+    elif config.basis_states is not None:
+        output = "basis"
+    elif config.top_k is not None:
+        output = "top_k"
+    elif config.probabilities:
+        output = "probabilities"
+    else:
+        output = "single"
+    basis_states = None if config.basis_states is None else tuple(map(tuple, config.basis_states))
+    return QNNCircuitConfig(config.num_wires if num_wires is None else num_wires,
+                            config.num_basis if num_basis is None else num_basis,
+                            output, basis_states, config.top_k)
+
+
+@functools.lru_cache(maxsize=None)
+def build_circuit(circuit_config):
+    """
+    Builds the circuit function of a configuration. The function records the gates and returns the
+    measurements, and can be run by a QNode or by the PyTorch backends.
 
     Parameters:
-    - inputs (list or array-like): Input data to be encoded and processed by the QNN.
-    - var (list or array-like): List of variables for the quantum layers, structure determines
-    output type.
+    - circuit_config (QNNCircuitConfig): The configuration.
 
     Returns:
-    - list or float: The specified output type.
+    - callable: The circuit function, taking the arguments ``inputs`` and ``var``.
+    """
+    num_wires, _, output, basis_states, top_k = circuit_config
+
+    def qnn_circuit(inputs, var):
+        """
+        This module defines a quantum neural network (QNN) that can return multiple outputs,
+        a single output, or a probability distribution using PennyLane and PyTorch. The QNN
+        takes input data, encodes it using a quantum data encoder, applies multiple quantum
+        neural network layers, and returns the specified output based on the structure of 'var'.
+
+        Parameters:
+        - inputs (list or array-like): Input data to be encoded and processed by the QNN.
+        - var (list or array-like): List of variables for the quantum layers, structure determines
+        output type.
+
+        Returns:
+        - list or float: The specified output type.
+        """
+        encoder = QuantumDataEncoder(num_wires)
+        encoder.encode(inputs)
+
+        # Iterative quantum layers
+        q_layer = QuantumNeuralNetworkLayer(num_wires)
+        for v in var:
+            q_layer.apply(v)
+
+        if output == "multi":
+            # Return the probabilities for all wires
+            return [qml.expval(qml.X(wire)) for wire in range(num_wires)]
+
+        if output == "marginals":
+            # Return the probability distribution of every wire on its own
+            return marginal_probs()
+
+        if output == "basis":
+            # Return the probabilities of the selected basis states
+            return basis_probs(basis_states)
+
+        if output == "top_k":
+            # Return the top_k most probable basis states and their probabilities
+            return top_k_probs(top_k)
+
+        if output == "probabilities":
+            wires = list(range(num_wires))
+            return qml.probs(wires=wires)
+
+        #else model output type is single
+        return qml.expval(qml.X(0))
+
+    return qnn_circuit
+
+
+@functools.lru_cache(maxsize=None)
+def build_device(num_wires, num_basis):
+    """
+    Builds the Strawberry Fields Fock device of a circuit size, once per size.
     """
-    encoder = QuantumDataEncoder(num_wires)
-    encoder.encode(inputs)
+    return qml.device("strawberryfields.fock", wires=num_wires, cutoff_dim=num_basis)
+
+
+@functools.lru_cache(maxsize=None)
+def build_qnode(circuit_config, diff_method="best"):
+    """
+    Builds the QNode of a configuration on its Strawberry Fields device.
+
+    Parameters:
+    - circuit_config (QNNCircuitConfig): The configuration.
+    - diff_method (str, optional): Differentiation method of the QNode. Default is "best".
+
+    Returns:
+    - pennylane.QNode: The QNode, with the torch interface.
+    """
+    device = build_device(circuit_config.num_wires, circuit_config.num_basis)
+    return qml.QNode(build_circuit(circuit_config), device, interface="torch", diff_method=diff_method)
+
+
+class QNNCircuit:
+    """
+    A lazy factory of the QNN circuit. Nothing is built when the factory is created: the circuit
+    function, the Strawberry Fields device and the QNode are built on first use for the requested
+    configuration and cached, so that QNNs of different sizes can coexist in one process and share
+    the circuits of equal configurations.
+
+    Calling the factory evaluates the QNode of the default configuration (the values of
+    utils.config at call time), which makes it a drop-in replacement for a QNode.
+
+    Usage:
+    To use the QNNCircuit class, import the default factory as follows:
+    from layers.qnn_circuit import qnn_circuit
+
+    Example:
+    qnode = qnn_circuit.qnode(num_wires=4, num_basis=3)
+    circuit = qnn_circuit.circuit(num_wires=8, num_basis=2)  # for the "torch" and "mps" backends
+    """
+
+    def config(self, num_wires=None, num_basis=None):
+        """
+        Returns the configuration of a circuit size (see circuit_config).
+        """
+        return circuit_config(num_wires, num_basis)
+
+    def circuit(self, num_wires=None, num_basis=None):
+        """
+        Returns the circuit function of a circuit size.
+
+        Parameters:
+        - num_wires (int, optional): Number of wires. Default is None (config.num_wires).
+        - num_basis (int, optional): Fock space cutoff dimension. Default is None (config.num_basis).
+
+        Returns:
+        - callable: The circuit function, taking the arguments ``inputs`` and ``var``.
+        """
+        return build_circuit(self.config(num_wires, num_basis))
+
+    def qnode(self, num_wires=None, num_basis=None, diff_method="best"):
+        """
+        Returns the QNode of a circuit size on its Strawberry Fields device.
+
+        Parameters:
+        - num_wires (int, optional): Number of wires. Default is None (config.num_wires).
+        - num_basis (int, optional): Fock space cutoff dimension. Default is None (config.num_basis).
+        - diff_method (str, optional): Differentiation method of the QNode. Default is "best".
+
+        Returns:
+        - pennylane.QNode: The QNode.
+        """
+        return build_qnode(self.config(num_wires, num_basis), diff_method)
+
+    @property
+    def func(self):
+        """
+        The circuit function of the default configuration, as the ``func`` of a QNode.
+        """
+        return self.circuit()
 
-    # Iterative quantum layers
-    q_layer = QuantumNeuralNetworkLayer(num_wires)
-    for v in var:
-        q_layer.apply(v)
+    @property
+    def device(self):
+        """
+        The Strawberry Fields device of the default configuration, as the ``device`` of a QNode.
+        """
+        return self.qnode().device
 
-    if multi_output:
-        # Return the probabilities for all wires
-        return [qml.expval(qml.X(wire)) for wire in range(num_wires)]
+    def __call__(self, inputs, var):
+        return self.qnode()(inputs, var)
 
-    if probabilities:
-        wires = list(range(num_wires))
-        return qml.probs(wires=wires)
 
-    #else model output type is single
-    return qml.expval(qml.X(0))
+qnn_circuit = QNNCircuit()
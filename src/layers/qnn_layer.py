@@ -13,7 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 
-import pennylane as qml
+import functools
+from layers.gate_schedule import GateSchedule
 
 class QuantumNeuralNetworkLayer:
     """
@@ -47,48 +48,73 @@ class QuantumNeuralNetworkLayer:
         Returns:
         - None
         """
-        num_params = len(v)
+        self.schedule(len(v)).apply(v)
+
+    def schedule(self, num_params):
+        """
+        Returns the gate schedule of the layer for the given number of parameters.
+
+        Parameters:
+        - num_params (int): Number of parameters of the layer.
+
+        Returns:
+        - GateSchedule: The cached schedule of the layer gates.
+        """
+        return self.compile_schedule(self.num_wires, num_params)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile_schedule(num_wires, num_params):
+        """
+        Compiles the gate schedule of the layer, once per (num_wires, num_params) pair.
+
+        Parameters:
+        - num_wires (int): Number of wires (qumodes) in the quantum circuit.
+        - num_params (int): Number of parameters of the layer.
+
+        Returns:
+        - GateSchedule: Schedule of (gate, wires, parameter indices) entries, in the order the gates are applied.
+        """
+        table = []
 
         # Interferometer 1
-        for i in range(self.num_wires - 1):
+        for i in range(num_wires - 1):
             idx = i * 2
             if idx + 1 < num_params:
-                theta = v[idx]
-                phi = v[idx + 1]
-                qml.Beamsplitter(theta, phi, wires=[i % self.num_wires, (i + 1) % self.num_wires])
+                table.append(("Beamsplitter", [i % num_wires, (i + 1) % num_wires], (idx, idx + 1)))
 
-        for i in range(self.num_wires):
-            idx = (self.num_wires - 1) * 2 + i
+        for i in range(num_wires):
+            idx = (num_wires - 1) * 2 + i
             if idx < num_params:
-                qml.Rotation(v[idx], wires=i)
+                table.append(("Rotation", [i], (idx,)))
 
         # Squeezers
-        for i in range(self.num_wires):
-            idx = (self.num_wires - 1) * 2 + self.num_wires + i
+        for i in range(num_wires):
+            idx = (num_wires - 1) * 2 + num_wires + i
             if idx < num_params:
-                qml.Squeezing(v[idx], 0.0, wires=i)
+                table.append(("Squeezing", [i], (idx, None)))
 
         # Interferometer 2
-        for i in range(self.num_wires - 1):
-            idx = (self.num_wires - 1) * 2 + self.num_wires + self.num_wires + i * 2
+        for i in range(num_wires - 1):
+            idx = (num_wires - 1) * 2 + num_wires + num_wires + i * 2
             if idx + 1 < num_params:
-                theta = v[idx]
-                phi = v[idx + 1]
-                qml.Beamsplitter(theta, phi, wires=[i % self.num_wires, (i + 1) % self.num_wires])
+                table.append(("Beamsplitter", [i % num_wires, (i + 1) % num_wires], (idx, idx + 1)))
 
-        for i in range(self.num_wires):
-            idx = (self.num_wires - 1) * 2 + self.num_wires + self.num_wires + (self.num_wires - 1) * 2 + i
+        for i in range(num_wires):
+            idx = (num_wires - 1) * 2 + num_wires + num_wires + (num_wires - 1) * 2 + i
             if idx < num_params:
-                qml.Rotation(v[idx], wires=i)
+                table.append(("Rotation", [i], (idx,)))
 
         # Bias addition
-        for i in range(self.num_wires):
-            idx = (self.num_wires - 1) * 2 + self.num_wires + self.num_wires + (self.num_wires - 1) * 2 + self.num_wires + i
+        for i in range(num_wires):
+            idx = (num_wires - 1) * 2 + num_wires + num_wires + (num_wires - 1) * 2 + num_wires + i
             if idx < num_params:
-                qml.Displacement(v[idx], 0.0, wires=i)
+                table.append(("Displacement", [i], (idx, None)))
 
         # Non-linear activation function
-        for i in range(self.num_wires):
-            idx = (self.num_wires - 1) * 2 + self.num_wires + self.num_wires + (self.num_wires - 1) * 2 + self.num_wires + self.num_wires + i
+        for i in range(num_wires):
+            idx = (num_wires - 1) * 2 + num_wires + num_wires + (num_wires - 1) * 2 + num_wires + num_wires + i
             if idx < num_params:
-                qml.Kerr(v[idx], wires=i)
+                table.append(("Kerr", [i], (idx,)))
+
+        return GateSchedule(num_wires, num_params, table)
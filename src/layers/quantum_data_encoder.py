@@ -13,7 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 
-import pennylane as qml
+import functools
+from layers.gate_schedule import GateSchedule
 
 class QuantumDataEncoder:
     """
@@ -28,7 +29,7 @@ class QuantumDataEncoder:
 
     Example:
     encoder = QuantumDataEncoder(num_wires=8)
-    encoder.encode(input_data)
+    encoder.encode(input_data)    # input_data of shape (num_features,) or (batch, num_features)
     """
 
     def __init__(self, num_wires):
@@ -43,64 +44,99 @@ class QuantumDataEncoder:
         """
         self.num_wires = num_wires
 
-    def encode(self, x):
+    def schedule(self, num_features):
         """
-        Encodes the input data into a quantum state to be operated on using a sequence of quantum gates.
+        Returns the gate schedule for inputs with the given number of features.
+
+        Parameters:
+        - num_features (int): Number of features per sample.
+
+        Returns:
+        - GateSchedule: The cached schedule of the encoding gates.
+        """
+        return self.compile_schedule(self.num_wires, num_features)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile_schedule(num_wires, num_features):
+        """
+        Compiles the gate schedule of the encoder, once per (num_wires, num_features) pair.
 
         Parameters:
-        x : input data (list or array-like)
+        - num_wires (int): Number of quantum wires.
+        - num_features (int): Number of features per sample.
+
+        Returns:
+        - GateSchedule: Schedule of (gate, wires, feature indices) entries, in the order the gates are applied.
 
         The encoding process uses the following gates in sequence:
-        - Squeezing gates: 2*self.num_wires parameters
-        - Beamsplitter gates: 2(self.num_wires-1) parameters
-        - Rotation gates: self.num_wires parameters
-        - Displacement gates: 2*self.num_wires parameters
-        - Kerr gates: self.num_wires parameters
-          Total: 8*self.num_wires - 2 parameters
+        - Squeezing gates: 2*num_wires parameters
+        - Beamsplitter gates: 2(num_wires-1) parameters
+        - Rotation gates: num_wires parameters
+        - Displacement gates: 2*num_wires parameters
+        - Kerr gates: num_wires parameters
+          Total: 8*num_wires - 2 parameters
 
         rounds: the number of iterations of the sequence needed to take in all the entries of the input data
-                num_features // (8 * self.num_wires - 2)
-                We are adding (8 * self.num_wires - 3) as a pad to run one extra round for the remainding data entries.
+                num_features // (8 * num_wires - 2)
+                We are adding (8 * num_wires - 3) as a pad to run one extra round for the remainding data entries.
         """
-        num_features = len(x)
+        table = []
 
         # Calculate the number of rounds needed to process all features
-        rounds = (num_features + (8 * self.num_wires - 3)) // (8 * self.num_wires - 2)
+        rounds = (num_features + (8 * num_wires - 3)) // (8 * num_wires - 2)
 
         for j in range(rounds):
-            start_idx = j * (8 * self.num_wires - 2)
+            start_idx = j * (8 * num_wires - 2)
 
             # Squeezing gates
-            for i in range(self.num_wires):
+            for i in range(num_wires):
                 # for each wire, the number of parameters are i*2
                 idx = start_idx + i * 2
                 if idx + 1 < num_features:
-                    qml.Squeezing(x[idx], x[idx + 1], wires=i)
+                    table.append(("Squeezing", [i], (idx, idx + 1)))
 
             # Beamsplitter gates
-            for i in range(self.num_wires - 1):
+            for i in range(num_wires - 1):
                 # start_index + Squeezing gates, and then i*2 parameters for each gate
-                idx = start_idx + self.num_wires * 2 + i * 2
+                idx = start_idx + num_wires * 2 + i * 2
                 if idx + 1 < num_features:
-                    qml.Beamsplitter(x[idx], x[idx + 1], wires=[i % self.num_wires, (i + 1) % self.num_wires])
+                    table.append(("Beamsplitter", [i % num_wires, (i + 1) % num_wires], (idx, idx + 1)))
 
             # Rotation gates
-            for i in range(self.num_wires):
+            for i in range(num_wires):
                 # start_index + Squeezing gates + Beamsplitters, and then i parameters for each gate
-                idx = start_idx + self.num_wires * 2 + (self.num_wires - 1) * 2 + i
+                idx = start_idx + num_wires * 2 + (num_wires - 1) * 2 + i
                 if idx < num_features:
-                    qml.Rotation(x[idx], wires=i)
+                    table.append(("Rotation", [i], (idx,)))
 
             # Displacement gates
-            for i in range(self.num_wires):
+            for i in range(num_wires):
                 # start_index + Squeezing gates + Beamsplitters + Rotation gates, and then i*2 parameters for each gate
-                idx = start_idx + self.num_wires * 2 + (self.num_wires - 1) * 2 + self.num_wires + i * 2
+                idx = start_idx + num_wires * 2 + (num_wires - 1) * 2 + num_wires + i * 2
                 if idx + 1 < num_features:
-                    qml.Displacement(x[idx], x[idx + 1], wires=i)
+                    table.append(("Displacement", [i], (idx, idx + 1)))
 
             # Kerr gates
-            for i in range(self.num_wires):
+            for i in range(num_wires):
                 # start_index + Squeezing gates + Beamsplitters + Rotation gates + Displacement gates, and then i parameters for each gate
-                idx = start_idx + self.num_wires * 2 + (self.num_wires - 1) * 2 + self.num_wires + self.num_wires * 2 + i
+                idx = start_idx + num_wires * 2 + (num_wires - 1) * 2 + num_wires + num_wires * 2 + i
                 if idx < num_features:
-                    qml.Kerr(x[idx], wires=i)
\ No newline at end of file
+                    table.append(("Kerr", [i], (idx,)))
+
+        return GateSchedule(num_wires, num_features, table)
+
+    def encode(self, x):
+        """
+        Encodes the input data into a quantum state to be operated on using a sequence of quantum gates.
+
+        Parameters:
+        x : input data (list or array-like) of shape (num_features,), or a tensor of shape
+            (batch, num_features) holding one sample per row
+
+        The gates are taken from the cached ``schedule``. For a batch of samples every gate is
+        applied once with a broadcast parameter holding one value per sample, i.e. the column
+        x[:, idx] of the batch, instead of recording one circuit per sample.
+        """
+        num_features = x.shape[1] if getattr(x, "ndim", 1) == 2 else len(x)
+        self.schedule(num_features).apply(x)
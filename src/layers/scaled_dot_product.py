@@ -16,11 +16,145 @@
 import math
 import torch
 from torch import nn
+import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
+
+# Fused attention kernels with a scale argument (PyTorch >= 2.1); on CPU the causal kernel skips
+# the masked key blocks
+FUSED_ATTENTION = tuple(int(v) for v in torch.__version__.split(".")[:2]) >= (2, 1)
+
+
+def causal_mask(query_len, key_len, device=None):
+    """
+    Returns the causal mask of queries that are the last query_len positions of a sequence of
+    key_len positions: query i attends to the keys 0 .. key_len - query_len + i.
+
+    Parameters:
+    - query_len (int): Number of queries.
+    - key_len (int): Number of keys.
+    - device (torch.device, optional): Device of the mask. Default is None.
+
+    Returns:
+    - torch.Tensor: Boolean mask of shape (query_len, key_len), True where attention is allowed.
+    """
+    return torch.ones(query_len, key_len, dtype=torch.bool, device=device).tril(key_len - query_len)
+
+
+def blocked_causal_attention(queries, keys, values, scale, block_size=256):
+    """
+    Computes causal attention block of queries by block of queries. Each block only computes the
+    scores of the keys it can attend to, and masks them before the softmax, so that the blocks
+    above the diagonal are never allocated.
+
+    Parameters:
+    - queries (torch.Tensor): Queries of shape (..., query_len, dk), the last positions of the sequence.
+    - keys (torch.Tensor): Keys of shape (..., key_len, dk).
+    - values (torch.Tensor): Values of shape (..., key_len, dv).
+    - scale (float): Factor of the dot products.
+    - block_size (int, optional): Number of queries per block. Default is 256.
+
+    Returns:
+    - torch.Tensor: Attention output of shape (..., query_len, dv).
+    """
+    query_len, key_len = queries.size(-2), keys.size(-2)
+    offset = key_len - query_len
+    outputs = []
+    for start in range(0, query_len, block_size):
+        stop = min(start + block_size, query_len)
+        end = offset + stop
+        scores = torch.matmul(queries[..., start:stop, :], keys[..., :end, :].transpose(-2, -1)) * scale
+        # The queries of the block are the last positions of the keys they attend to
+        scores = scores.masked_fill(~causal_mask(stop - start, end, scores.device), float("-inf"))
+        outputs.append(torch.matmul(torch.softmax(scores, dim=-1), values[..., :end, :]))
+    return torch.cat(outputs, dim=-2)
+
+
+
+def _online_softmax_block(queries, keys, values, scale, first_position, block_size):
+    """
+    Attention of a block of queries, accumulated over blocks of keys with an online softmax.
+
+    Parameters:
+    - queries (torch.Tensor): Queries of shape (..., query_len, dk).
+    - keys (torch.Tensor): Keys of shape (..., key_len, dk).
+    - values (torch.Tensor): Values of shape (..., key_len, dv).
+    - scale (float): Factor of the dot products.
+    - first_position (int or None): Position of the first query among the keys for causal
+      attention, or None for no mask.
+    - block_size (int): Number of keys per block.
+
+    Returns:
+    - torch.Tensor: Attention output of shape (..., query_len, dv).
+    """
+    query_len = queries.size(-2)
+    key_end = keys.size(-2) if first_position is None else first_position + query_len
+    maximum = queries.new_full(queries.shape[:-1] + (1,), float("-inf"))
+    total = queries.new_zeros(queries.shape[:-1] + (1,))
+    output = queries.new_zeros(queries.shape[:-1] + values.shape[-1:])
+    for start in range(0, key_end, block_size):
+        stop = min(start + block_size, key_end)
+        scores = torch.matmul(queries, keys[..., start:stop, :].transpose(-2, -1)) * scale
+        if first_position is not None and stop > first_position + 1:
+            # The block crosses the diagonal
+            positions = torch.arange(first_position, first_position + query_len, device=scores.device)
+            masked = torch.arange(start, stop, device=scores.device) > positions[:, None]
+            scores = scores.masked_fill(masked, float("-inf"))
+        # Rescale the running sums to the new maximum of each row
+        new_maximum = torch.maximum(maximum, scores.amax(dim=-1, keepdim=True))
+        correction = torch.exp(maximum - new_maximum)
+        weights = torch.exp(scores - new_maximum)
+        total = total * correction + weights.sum(dim=-1, keepdim=True)
+        output = output * correction + torch.matmul(weights, values[..., start:stop, :])
+        maximum = new_maximum
+    return output / total
+
+
+def chunked_attention(queries, keys, values, scale, causal=False, block_size=256):
+    """
+    Computes attention tile by tile: the queries are processed in blocks, and each block
+    accumulates its output over blocks of keys with an online softmax (a running maximum and sum
+    per query), so that at most (block_size, block_size) scores exist at once per head. For causal
+    attention, the key blocks above the diagonal are skipped. When gradients are required, each
+    block of queries is recomputed in the backward pass instead of saving its scores, so the memory
+    stays O(seq_len * block_size) in training as well.
+
+    Parameters:
+    - queries (torch.Tensor): Queries of shape (..., query_len, dk), the last positions of the
+      sequence for causal attention.
+    - keys (torch.Tensor): Keys of shape (..., key_len, dk).
+    - values (torch.Tensor): Values of shape (..., key_len, dv).
+    - scale (float): Factor of the dot products.
+    - causal (bool, optional): Whether to apply the causal mask. Default is False.
+    - block_size (int, optional): Number of queries and keys per block. Default is 256.
+
+    Returns:
+    - torch.Tensor: Attention output of shape (..., query_len, dv).
+    """
+    query_len, key_len = queries.size(-2), keys.size(-2)
+    recompute = torch.is_grad_enabled() and any(x.requires_grad for x in (queries, keys, values))
+    outputs = []
+    for start in range(0, query_len, block_size):
+        stop = min(start + block_size, query_len)
+        args = (queries[..., start:stop, :], keys, values, scale,
+                key_len - query_len + start if causal else None, block_size)
+        if recompute:
+            outputs.append(checkpoint(_online_softmax_block, *args, use_reentrant=False))
+        else:
+            outputs.append(_online_softmax_block(*args))
+    return torch.cat(outputs, dim=-2)
 
 class ScaledDotProduct(nn.Module):
     """
     A class used to compute the scaled dot-product attention.
 
+    With a mask, the attention is causal: the queries are the last positions of the sequence of
+    keys (all of them, except when decoding incrementally with cached keys) and every query only
+    attends to the keys up to its own position. The mask is applied to the scores before the
+    softmax. The attention is computed by torch.nn.functional.scaled_dot_product_attention when it
+    is available, and otherwise by blocked_causal_attention, so that the masked scores are never
+    computed. With a block_size, the attention is computed by chunked_attention instead, whose
+    memory grows linearly with the sequence length.
+
     Usage:
     To use the ScaledDotProduct class, import it as follows:
     from layers.scaled_dot_product import ScaledDotProduct
@@ -30,17 +164,24 @@ class ScaledDotProduct(nn.Module):
     output = scaled_dot_product(queries, keys, values)
     """
 
-    def __init__(self, embed_len, mask=None):
+    def __init__(self, embed_len, mask=None, fused=FUSED_ATTENTION, block_size=None):
         """
         Initializes the ScaledDotProduct class with the given parameters.
 
         Parameters:
         - embed_len (int): Length of the embedding vector (dimension of keys and queries).
-        - mask (torch.Tensor, optional): Masking tensor for the attention mechanism. Default is None.
+        - mask (bool, optional): Whether to apply the causal mask. Default is None (no mask).
+        - fused (bool, optional): Whether to use the fused PyTorch attention kernels. Default is
+          True when they are available.
+        - block_size (int, optional): Block size of the tiled, online-softmax attention
+          (chunked_attention). Default is None (dense attention).
         """
         super(ScaledDotProduct, self).__init__()
         self.embed_len = embed_len
         self.mask = mask
+        self.causal = mask is not None and mask is not False
+        self.fused = fused
+        self.block_size = block_size
         self.dk = embed_len  # Dimension of keys and queries
         self.softmax = nn.Softmax(dim=-1)  # Apply softmax on the last dimension
 
@@ -56,11 +197,22 @@ class ScaledDotProduct(nn.Module):
         Returns:
         - torch.Tensor: Tensor containing the output of the scaled dot-product attention.
         """
-        compatibility = torch.matmul(queries, keys.transpose(-2, -1))
-        compatibility = compatibility / math.sqrt(self.dk)
-        compatibility = self.softmax(compatibility)
+        query_len, key_len = queries.size(-2), keys.size(-2)
+        # A single query is the last position, which attends to every key
+        causal = self.causal and query_len > 1
+        scale = 1 / math.sqrt(self.dk)
 
-        if self.mask is not None:
-            compatibility = torch.tril(compatibility)
+        if self.block_size is not None:
+            return chunked_attention(queries, keys, values, scale, causal, self.block_size)
+        if self.fused:
+            if not causal:
+                return F.scaled_dot_product_attention(queries, keys, values, scale=scale)
+            if query_len == key_len:
+                return F.scaled_dot_product_attention(queries, keys, values, is_causal=True, scale=scale)
+            return F.scaled_dot_product_attention(queries, keys, values, scale=scale,
+                                                  attn_mask=causal_mask(query_len, key_len, queries.device))
 
-        return torch.matmul(compatibility, values)
+        if causal:
+            return blocked_causal_attention(queries, keys, values, scale)
+        compatibility = torch.matmul(queries, keys.transpose(-2, -1)) * scale
+        return torch.matmul(self.softmax(compatibility), values)
@@ -13,16 +13,26 @@
 # limitations under the License.
 # ==============================================================================
 
-from .quantum_decoder import QuantumDecoder
-from .quantum_encoder import QuantumEncoder
-from .quantum_feed_forward import QuantumFeedForward
-from .quantum_neural_network import QuantumNeuralNetwork
-from .quantum_transformer import QuantumTransformer
+from utils.lazy_import import lazy_exports
+
+# The submodules import PyTorch, PennyLane and the backends, so they are only imported when one
+# of their names is first accessed
+lazy_exports(__name__, {
+    "EncoderCache": ".encoder_cache",
+    "QuantumDecoder": ".quantum_decoder",
+    "QuantumEncoder": ".quantum_encoder",
+    "QuantumFeedForward": ".quantum_feed_forward",
+    "QuantumNeuralNetwork": ".quantum_neural_network",
+    "QuantumTransformer": ".quantum_transformer",
+    "TokenCache": ".token_cache",
+})
 
 __all__ = [
+    "EncoderCache",
     "QuantumDecoder",
     "QuantumEncoder",
     "QuantumFeedForward",
     "QuantumNeuralNetwork",
     "QuantumTransformer",
+    "TokenCache",
 ]
@@ -0,0 +1,64 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import torch
+from models.output_cache import OutputCache
+
+
+class EncoderCache(OutputCache):
+    """
+    A bounded LRU cache of encoder outputs per source sequence, for inference.
+
+    In serving, the same source sequence is often decoded many times (several sampled candidates,
+    rescoring, retries). The cache is content-addressed by the token ids of a source sequence.
+    It is tagged with the version of the encoder weights it was filled with and is emptied as
+    soon as they change, so the outputs of stale weights are purged at once instead of holding
+    the budget until they are evicted. Identical sequences within a batch are encoded once.
+    Entries are evicted in least recently used order to keep the memory held by the cached keys
+    and encoder outputs under a byte budget (see OutputCache).
+
+    Usage:
+    To use the EncoderCache class, import it as follows:
+    from models.encoder_cache import EncoderCache
+
+    Example:
+    model = QuantumTransformer(..., encoder_cache=EncoderCache(max_bytes=2 ** 28)).eval()
+    with torch.no_grad():
+        memory = model.encode(src)
+    print(model.encoder_cache.stats())
+    """
+
+    def __init__(self, max_bytes=2 ** 28):
+        """
+        Initializes the EncoderCache class with the given parameters.
+
+        Parameters:
+        - max_bytes (int, optional): Memory budget of the cached keys and encoder outputs, in bytes.
+          Default is 256 MiB.
+        """
+        super(EncoderCache, self).__init__(max_bytes)
+
+    def keys(self, src):
+        """
+        Computes the cache keys of a batch of source sequences.
+
+        Parameters:
+        - src (torch.Tensor): Source token ids of shape (batch, src_len).
+
+        Returns:
+        - list: One bytes key per sequence.
+        """
+        ids = src.detach().to(torch.int64).cpu().numpy()
+        return [row.tobytes() for row in ids]
@@ -0,0 +1,148 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import abc
+from collections import OrderedDict
+import torch
+
+
+class OutputCache(abc.ABC):
+    """
+    A bounded LRU cache of the outputs of a function, per row of its batched input, for inference.
+
+    Subclasses define the bytes key of every row (``keys``). Rows that are cached are not
+    recomputed, and identical rows within a batch are computed once. The cache is tagged with
+    the version of the weights it was filled with and is emptied as soon as the version changes,
+    so the entries of stale weights never hold the budget. Entries are evicted in least recently
+    used order to keep the memory held by the cached keys and outputs under a byte budget.
+
+    Usage:
+    Subclass it and implement keys, as TokenCache and EncoderCache do:
+    from models.output_cache import OutputCache
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Initializes the OutputCache class with the given parameters.
+
+        Parameters:
+        - max_bytes (int): Memory budget of the cached keys and outputs, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.version = None
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @abc.abstractmethod
+    def keys(self, inputs):
+        """
+        Computes the cache keys of a batch of inputs.
+
+        Parameters:
+        - inputs (torch.Tensor): Batched inputs of shape (n, ...).
+
+        Returns:
+        - list: One bytes key per row.
+        """
+
+    def evaluate(self, inputs, version, function):
+        """
+        Returns the outputs of function for a batch of inputs, only evaluating it on the distinct
+        rows that are not cached.
+
+        Parameters:
+        - inputs (torch.Tensor): Batched inputs of shape (n, ...).
+        - version (hashable): Version of the weights of the function; a different version than
+          the one the cache was filled with empties the cache.
+        - function (callable): Function mapping a batch of rows to their batched outputs.
+
+        Returns:
+        - torch.Tensor: Outputs of shape (n, ...).
+        """
+        if version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.nbytes = 0
+            self.version = version
+
+        outputs = [None] * inputs.shape[0]
+        missing = OrderedDict()
+        for i, key in enumerate(self.keys(inputs)):
+            output = self.entries.get(key)
+            if output is not None:
+                self.entries.move_to_end(key)
+                outputs[i] = output
+                self.hits += 1
+            elif key in missing:
+                # Duplicate of a row that is evaluated in this batch
+                missing[key].append(i)
+                self.hits += 1
+            else:
+                missing[key] = [i]
+                self.misses += 1
+
+        if missing:
+            computed = function(inputs[[rows[0] for rows in missing.values()]])
+            for (key, rows), output in zip(missing.items(), computed):
+                output = output.clone()
+                for i in rows:
+                    outputs[i] = output
+                self._store(key, output)
+
+        return torch.stack(outputs)
+
+    def _store(self, key, output):
+        """
+        Adds an entry and evicts the least recently used ones until the budget is met.
+        """
+        self.entries[key] = output
+        self.nbytes += len(key) + output.element_size() * output.nelement()
+        while self.nbytes > self.max_bytes and self.entries:
+            old_key, old_output = self.entries.popitem(last=False)
+            self.nbytes -= len(old_key) + old_output.element_size() * old_output.nelement()
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+        - dict: Number of hits and misses, hit rate, number of entries, bytes used, evictions and
+          invalidations caused by weight updates.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.nbytes,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def clear(self):
+        """
+        Drops all entries and resets the statistics.
+        """
+        self.entries.clear()
+        self.version = None
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
@@ -15,36 +15,67 @@
 
 # Define the QuantumDecoder class
 from torch import nn
-from layers.multi_headed_attention import MultiHeadedAttention
+from layers.multi_headed_attention import AttentionCache, MultiHeadedAttention
 from models.quantum_feed_forward import QuantumFeedForward
 
 class QuantumDecoder(nn.Module):
-    def __init__(self, embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout=0.1, mask=None):
+    def __init__(self, embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout=0.1, mask=None, backend="strawberryfields", chunk_size=None, token_cache=None):
         super(QuantumDecoder, self).__init__()
         self.embed_len = embed_len
+        # The self attention is causal if mask is set; the target attends to the whole encoder output
         self.multihead_self_attention = MultiHeadedAttention(
             num_heads, embed_len, mask)
         self.multihead_enc_dec_attention = MultiHeadedAttention(
-            num_heads, embed_len, mask)
+            num_heads, embed_len)
         self.first_norm = nn.LayerNorm(self.embed_len)
         self.second_norm = nn.LayerNorm(self.embed_len)
         self.third_norm = nn.LayerNorm(self.embed_len)
         self.dropout_layer = nn.Dropout(p=dropout)
-        self.quantum_feed_forward = QuantumFeedForward(num_layers, num_wires, quantum_nn, embed_len, dropout)
+        self.quantum_feed_forward = QuantumFeedForward(num_layers, num_wires, quantum_nn, embed_len, dropout, backend, chunk_size,
+                                                       token_cache)
+
+    def forward(self, target, encoder_output, cache=None):
+        """
+        Applies the decoder block to the target sequence.
+
+        Parameters:
+        - target (torch.Tensor): Target tensor of shape (batch, seq_len, embed_len).
+        - encoder_output (torch.Tensor): Encoder output of shape (batch, src_len, embed_len).
+        - cache (dict, optional): Attention caches from init_cache, for incremental decoding. The
+          target then holds only the new positions, which attend to the cached ones, and only the
+          new positions go through the quantum feed-forward block. Default is None.
+
+        Returns:
+        - torch.Tensor: Output tensor of shape (batch, seq_len, embed_len).
+        """
+        self_cache = cross_cache = None
+        if cache is not None:
+            self_cache, cross_cache = cache["self"], cache["cross"]
 
-    def forward(self, target, encoder_output):
         # Self attention
         self_attention_output = self.multihead_self_attention(
-            target, target, target)
+            target, target, target, cache=self_cache)
         self_attention_output = self.dropout_layer(self_attention_output)
         first_sublayer_output = self.first_norm(self_attention_output + target)
 
         # Encoder-decoder attention
         enc_dec_attention_output = self.multihead_enc_dec_attention(
-            first_sublayer_output, encoder_output, encoder_output)
+            first_sublayer_output, encoder_output, encoder_output, cache=cross_cache)
         enc_dec_attention_output = self.dropout_layer(enc_dec_attention_output)
         second_sublayer_output = self.second_norm(
             enc_dec_attention_output + first_sublayer_output)
 
         # Quantum Feed-forward
         return self.quantum_feed_forward(second_sublayer_output)
+
+    @staticmethod
+    def init_cache():
+        """
+        Creates the attention caches of one decoding run: the keys and values of the previous
+        target positions, and the projected encoder output.
+
+        Returns:
+        - dict: AttentionCache objects for the self attention ("self") and the encoder-decoder
+          attention ("cross").
+        """
+        return {"self": AttentionCache(), "cross": AttentionCache(static=True)}
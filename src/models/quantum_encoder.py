@@ -21,13 +21,14 @@ from utils.config import num_layers, num_wires
 from layers.qnn_circuit import qnn_circuit
 
 class QuantumEncoder(nn.Module):
-    def __init__(self, embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout=0.1, mask=None):
+    def __init__(self, embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout=0.1, mask=None, backend="strawberryfields", chunk_size=None, token_cache=None):
         super(QuantumEncoder, self).__init__()
         self.embed_len = embed_len
         self.multihead = MultiHeadedAttention(num_heads, embed_len, mask) 
         self.first_norm = nn.LayerNorm(self.embed_len)
         self.dropout_layer = nn.Dropout(p=dropout)
-        self.quantum_feed_forward = QuantumFeedForward(num_layers, num_wires, quantum_nn, embed_len, dropout)
+        self.quantum_feed_forward = QuantumFeedForward(num_layers, num_wires, quantum_nn, embed_len, dropout, backend, chunk_size,
+                                                       token_cache)
 
     def forward(self, queries, keys, values):
         attention_output = self.multihead(queries, keys, values)
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
+import torch
 from torch import nn
 
 class QuantumFeedForward(nn.Module):
@@ -28,21 +29,31 @@ class QuantumFeedForward(nn.Module):
     output = model(input_tensor)
     """
 
-    def __init__(self, num_layers, num_wires, quantum_nn, embed_len, dropout=0.1):
+    def __init__(self, num_layers, num_wires, quantum_nn, embed_len, dropout=0.1, backend="strawberryfields",
+                 chunk_size=None, token_cache=None):
         """
         Initializes the QuantumFeedForward class with the given parameters.
 
         Parameters:
         - embed_len (int): Length of the embedding vector.
         - dropout (float, optional): Dropout rate for regularization. Default is 0.1.
+        - backend (str, optional): Simulator of the QNN, see QuantumNeuralNetwork. With "torch", the
+          token vectors of the whole batch and sequence are simulated in one batched call.
+          Default is "strawberryfields".
+        - chunk_size (int, optional): Maximum number of token vectors per simulator call, to bound
+          the peak memory. Default is None (all tokens at once).
+        - token_cache (TokenCache, optional): Cache of the QNN outputs per token vector, used when
+          gradients are disabled (inference). Default is None (no caching).
         """
         super(QuantumFeedForward, self).__init__()
         self.num_layers = num_layers
         self.num_wires = num_wires
         self.quantum_nn = quantum_nn
+        self.chunk_size = chunk_size
+        self.token_cache = token_cache
         #TODO: circular imports, refactor
         from models.quantum_neural_network import QuantumNeuralNetwork
-        self.qnn_model = QuantumNeuralNetwork(self.num_layers, self.num_wires, self.quantum_nn).qlayers
+        self.qnn_model = QuantumNeuralNetwork(self.num_layers, self.num_wires, self.quantum_nn, backend=backend).qlayers
         self.quantum_feed_forward = nn.Sequential(self.qnn_model)
         self.dropout_layer = nn.Dropout(p=dropout)
         self.layer_norm = nn.LayerNorm(embed_len)
@@ -52,12 +63,46 @@ class QuantumFeedForward(nn.Module):
         Applies the feedforward block to the input tensor.
 
         Parameters:
-        - x (torch.Tensor): Input tensor.
+        - x (torch.Tensor): Input tensor of shape (batch, seq_len, embed_len).
 
         Returns:
         - torch.Tensor: Output tensor after applying feedforward, dropout, and layer normalization.
         """
-        ff_output = self.quantum_feed_forward(x)
+        ff_output = self.evaluate_tokens(x)
         ff_output = self.dropout_layer(ff_output)
         return self.layer_norm(ff_output + x)
 
+
+    def evaluate_tokens(self, x):
+        """
+        Evaluates the QNN on every token vector of the input. The token vectors of all the
+        sequences are gathered into one (num_tokens, embed_len) batch, simulated in chunks of at
+        most chunk_size tokens, and the outputs are scattered back to the input layout. In
+        inference, tokens found in the token cache are not simulated again.
+
+        Parameters:
+        - x (torch.Tensor): Input tensor of shape (..., embed_len).
+
+        Returns:
+        - torch.Tensor: QNN outputs of shape (..., output_size).
+        """
+        tokens = x.reshape(-1, x.shape[-1])
+        if self.token_cache is not None and not torch.is_grad_enabled():
+            output = self.token_cache.evaluate(tokens, self.weight_version(), self._simulate)
+        else:
+            output = self._simulate(tokens)
+        return output.reshape(x.shape[:-1] + output.shape[-1:])
+
+    def _simulate(self, tokens):
+        """
+        Evaluates the QNN on a (num_tokens, embed_len) batch, in chunks of at most chunk_size tokens.
+        """
+        if self.chunk_size is None or tokens.shape[0] <= self.chunk_size:
+            return self.quantum_feed_forward(tokens)
+        return torch.cat([self.quantum_feed_forward(chunk) for chunk in torch.split(tokens, self.chunk_size)])
+
+    def weight_version(self):
+        """
+        Returns a value that changes whenever the QNN weights are modified or replaced.
+        """
+        return tuple((weight.data_ptr(), weight._version) for weight in self.qnn_model.parameters())
@@ -15,6 +15,7 @@
 
 # Weight Initializer may not be necessary.
 
+import functools
 import pennylane as qml
 import torch
 import sys
@@ -27,12 +28,25 @@ if src_dir not in sys.path:
     sys.path.append(src_dir)
 
 from layers.weight_initializer import WeightInitializer
-from layers.qnn_circuit import qnn_circuit
+from layers.qnn_circuit import QNNCircuit, build_qnode, qnn_circuit as default_circuit
+from backends.fock_backend import FockBackend
+from backends.mps_backend import MPSBackend
+from backends.parallel_layer import ParallelTorchLayer
+from backends.sampling import ShotSampler
+from backends.torch_fock_layer import TorchFockLayer
 
-from utils.config import num_wires, num_basis, single_output, multi_output, probabilities
+from utils import config
+
+DIFF_METHODS = {
+    "strawberryfields": ("best", "parameter-shift", "finite-diff"),
+    "torch": ("backprop",),
+    "mps": ("backprop",),
+}
 
 class QuantumNeuralNetwork:
-    def __init__(self, num_layers=2, num_modes=6, qnn_circuit=None):
+    def __init__(self, num_layers=2, num_modes=6, qnn_circuit=None, backend="strawberryfields", diff_method=None,
+                 num_workers=None, memory_budget=None, precision="double", max_bond=64, shots=None, seed=None,
+                 num_basis=None):
         """
         Initializes the quantum layer model by setting up the weights and converting
         the quantum neural network (qnn) into a Torch layer.
@@ -41,10 +55,46 @@ class QuantumNeuralNetwork:
         - quantum_nn: The quantum neural network function to be converted.
         - num_layers: Number of quantum layers.
         - num_modes: Number of qumodes (wires) for the quantum circuit.
+        - backend: Simulator used to run the circuit. "strawberryfields" evaluates the QNode on its
+          device one sample at a time; "torch" simulates the whole batch at once on the built-in
+          PyTorch Fock backend and differentiates it with backpropagation; "mps" does the same on the
+          matrix-product-state backend, whose memory is linear in the number of wires.
+        - diff_method: Differentiation method. "backprop" computes the gradients of the weights and
+          of the inputs in a single reverse pass through the simulation, and requires the "torch" or
+          "mps" backend. "parameter-shift" and "finite-diff" run two (resp. one) extra circuit
+          evaluations per trainable parameter and sample on the "strawberryfields" backend. Default
+          is None, i.e. "backprop" for "torch" and "mps", and PennyLane's "best" method for
+          "strawberryfields".
+        - num_workers: Number of worker processes the "strawberryfields" backend shards every forward
+          and backward batch across, each worker running its own device instance. Default is None,
+          i.e. all samples are evaluated in the calling process.
+        - memory_budget: Memory budget in bytes of the "torch" backend. Batches whose estimated peak
+          memory exceeds it are simulated in chunks (see backends.memory_planner). Default is None.
+        - precision: Precision of the "torch" and "mps" backends: "double" simulates in complex128,
+          "single" in complex64, which halves the memory and is enough for float32 models. Check the
+          deviation with scripts/validate_precision.py. Default is "double".
+        - max_bond: Maximum bond dimension of the "mps" backend. Default is 64.
+        - shots: Number of shots the "torch" and "mps" backends draw per sample to estimate the
+          probabilities and quadrature expectation values (see backends.sampling). Sampled outputs
+          are not differentiable. Default is None (exact outputs).
+        - seed: Seed of the shot sampler. Default is None.
+        - num_basis: Fock space cutoff dimension. Default is None, i.e. utils.config.num_basis at the
+          time the model is built. When qnn_circuit is a QNNCircuit factory (such as the default
+          layers.qnn_circuit.qnn_circuit), the circuit, device and QNode are built for num_modes
+          and num_basis, so models of different sizes can coexist in one process.
         """
         self.num_layers = num_layers
         self.num_modes = num_modes
-        self.qnn_circuit = qnn_circuit
+        self.qnn_circuit = default_circuit if qnn_circuit is None else qnn_circuit
+        self.num_basis = config.num_basis if num_basis is None else num_basis
+        self.backend = backend
+        self.diff_method = diff_method
+        self.num_workers = num_workers
+        self.memory_budget = memory_budget
+        self.precision = precision
+        self.max_bond = max_bond
+        self.shots = shots
+        self.seed = seed
 
         # Initialize weights for quantum layers
         self.weights = WeightInitializer.init_weights(self.num_layers, self.num_modes)
@@ -60,8 +110,50 @@ class QuantumNeuralNetwork:
         shape_tup = self.weights.shape
         weight_shapes = {'var': shape_tup}
 
+        if self.backend not in DIFF_METHODS:
+            raise ValueError(f"Unknown backend '{self.backend}', expected 'strawberryfields', 'torch' or 'mps'.")
+        if self.diff_method is None:
+            self.diff_method = DIFF_METHODS[self.backend][0]
+        elif self.diff_method not in DIFF_METHODS[self.backend]:
+            raise ValueError(f"diff_method '{self.diff_method}' is not supported by the '{self.backend}' backend, "
+                             f"expected one of {DIFF_METHODS[self.backend]}.")
+        if self.num_workers is not None and self.backend != "strawberryfields":
+            raise ValueError("num_workers is only supported by the 'strawberryfields' backend, "
+                             f"the '{self.backend}' backend already simulates the whole batch at once.")
+        if self.memory_budget is not None and self.backend != "torch":
+            raise ValueError("memory_budget is only supported by the 'torch' backend.")
+        if self.precision != "double" and self.backend == "strawberryfields":
+            raise ValueError("The 'strawberryfields' backend only supports the 'double' precision.")
+        if self.shots is not None and self.backend == "strawberryfields":
+            raise ValueError("shots is only supported by the 'torch' and 'mps' backends.")
+        sampler = None if self.shots is None else ShotSampler(self.shots, self.seed)
+
         # Create a TorchLayer from the quantum circuit
-        qlayers = qml.qnn.TorchLayer(self.qnn_circuit, weight_shapes)
+        circuit = self.qnn_circuit
+        if self.backend == "torch":
+            if isinstance(circuit, QNNCircuit):
+                circuit = circuit.circuit(self.num_modes, self.num_basis)
+            backend = FockBackend(self.num_modes, self.num_basis, dtype=self.precision, sampler=sampler)
+            qlayers = TorchFockLayer(circuit, weight_shapes, backend, memory_budget=self.memory_budget)
+        elif self.backend == "mps":
+            if isinstance(circuit, QNNCircuit):
+                circuit = circuit.circuit(self.num_modes, self.num_basis)
+            backend = MPSBackend(self.num_modes, self.num_basis, max_bond=self.max_bond, dtype=self.precision,
+                                 sampler=sampler)
+            qlayers = TorchFockLayer(circuit, weight_shapes, backend)
+        else:
+            if isinstance(circuit, QNNCircuit) and self.num_workers is not None:
+                # The workers build the QNode from its configuration, so that they need not be forked
+                circuit = functools.partial(build_qnode, circuit.config(self.num_modes, self.num_basis),
+                                            self.diff_method)
+            elif isinstance(circuit, QNNCircuit):
+                circuit = circuit.qnode(self.num_modes, self.num_basis, self.diff_method)
+            elif self.diff_method != "best":
+                circuit = qml.QNode(circuit.func, circuit.device, interface="torch", diff_method=self.diff_method)
+            if self.num_workers is not None:
+                qlayers = ParallelTorchLayer(circuit, weight_shapes, self.num_workers)
+            else:
+                qlayers = qml.qnn.TorchLayer(circuit, weight_shapes)
 
         # Store the quantum layer in a list (more layers can be added if needed)
         return qlayers
@@ -14,37 +14,229 @@
 # ==============================================================================
 
 # Define the Transformer class
+import torch
 import torch.nn as nn
 from layers import InputEmbedding
 from models import QuantumDecoder
 from models import QuantumEncoder
 
 class QuantumTransformer(nn.Module):
-    def __init__(self, num_encoder_layers, num_decoder_layers, embed_len, num_heads, num_layers, num_wires, quantum_nn, batch_size, vocab_size, dropout=0.1, device='cpu'):
+    def __init__(self, num_encoder_layers, num_decoder_layers, embed_len, num_heads, num_layers, num_wires, quantum_nn, batch_size, vocab_size, dropout=0.1, device='cpu', backend="strawberryfields", chunk_size=None, encoder_cache=None, token_cache=None, causal_decoder=False):
         super(QuantumTransformer, self).__init__()
         self.embed_len = embed_len
         self.device = device
+        # Whether the decoder self attention is causal. Incremental decoding (generate() and
+        # beam_search()) requires it; by default the decoder attends to the whole target
+        self.causal_decoder = causal_decoder
+        # Cache of the encoder outputs per source sequence, used in inference (EncoderCache)
+        self.encoder_cache = encoder_cache
+        # Factory of the TokenCache of every QuantumFeedForward block (e.g. the TokenCache class),
+        # since a cache is tied to the weights of a single block
+        new_token_cache = token_cache if token_cache is not None else lambda: None
         self.embedding = InputEmbedding(
             vocab_size, embed_len, dropout, device).to(device)
         self.encoder_layers = nn.ModuleList([QuantumEncoder(
-            embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout).to(device) for _ in range(num_encoder_layers)])
+            embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout, backend=backend, chunk_size=chunk_size,
+            token_cache=new_token_cache()).to(device) for _ in range(num_encoder_layers)])
         self.decoder_layers = nn.ModuleList([QuantumDecoder(
-            embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout).to(device) for _ in range(num_decoder_layers)])
+            embed_len, num_heads, num_layers, num_wires, quantum_nn, dropout, mask=causal_decoder or None,
+            backend=backend, chunk_size=chunk_size, token_cache=new_token_cache()).to(device) for _ in range(num_decoder_layers)])
         self.output_linear = nn.Linear(embed_len, vocab_size).to(device)
 
     def forward(self, src, tgt):
-        src_embedded = self.embedding(src)
-        tgt_embedded = self.embedding(tgt)
+        encoder_output = self.encode(src)
+        return self.decode(tgt, encoder_output)
 
-        # Encoder forward pass
-        encoder_output = src_embedded
+    def encode(self, src):
+        """
+        Runs the encoder stack on the source tokens. The result can be held and passed to decode()
+        and generate() to decode the same sources several times. In inference (evaluation mode and
+        gradients disabled), the outputs of source sequences found in the encoder cache are reused.
+
+        Parameters:
+        - src (torch.Tensor): Source token ids of shape (batch, src_len).
+
+        Returns:
+        - torch.Tensor: Encoder output of shape (batch, src_len, embed_len).
+        """
+        if self.encoder_cache is not None and not self.training and not torch.is_grad_enabled():
+            return self.encoder_cache.evaluate(src, self.encoder_version(), self._encode)
+        return self._encode(src)
+
+    def encoder_version(self):
+        """
+        Returns a value that changes whenever the weights of the embedding or of the encoder layers
+        are modified or replaced.
+        """
+        parameters = list(self.embedding.parameters()) + list(self.encoder_layers.parameters())
+        return tuple((weight.data_ptr(), weight._version) for weight in parameters)
+
+    def _encode(self, src):
+        encoder_output = self.embedding(src)
         for layer in self.encoder_layers:
             encoder_output = layer(
                 encoder_output, encoder_output, encoder_output)
+        return encoder_output
+
+    def decode(self, tgt, encoder_output, caches=None, offset=0):
+        """
+        Runs the decoder stack and the output projection on target tokens.
 
-        # Decoder forward pass
-        decoder_output = tgt_embedded
-        for layer in self.decoder_layers:
-            decoder_output = layer(decoder_output, encoder_output)
-            
+        Parameters:
+        - tgt (torch.Tensor): Target token ids of shape (batch, tgt_len).
+        - encoder_output (torch.Tensor): Encoder output of shape (batch, src_len, embed_len).
+        - caches (list, optional): One QuantumDecoder.init_cache() per decoder layer, for incremental
+          decoding, which requires causal_decoder=True. tgt then holds the tokens following the
+          cached positions. Default is None.
+        - offset (int, optional): Position of the first token of tgt. Default is 0.
+
+        Returns:
+        - torch.Tensor: Logits of shape (batch, tgt_len, vocab_size).
+        """
+        if caches is not None and not self.causal_decoder:
+            # Without the causal mask, earlier positions would attend to the later tokens
+            raise ValueError("Incremental decoding requires a QuantumTransformer built with causal_decoder=True.")
+        decoder_output = self.embedding(tgt, offset)
+        for i, layer in enumerate(self.decoder_layers):
+            decoder_output = layer(decoder_output, encoder_output, None if caches is None else caches[i])
         return self.output_linear(decoder_output)
+
+    @torch.no_grad()
+    def generate(self, src, tgt, max_new_tokens, end_token=None, encoder_output=None):
+        """
+        Greedily extends target sequences token by token.
+
+        The source is encoded once. The decoder layers keep the keys and values of the previous
+        positions in their attention caches, so that every step only embeds the new token and runs
+        it through the attention layers and the quantum feed-forward blocks; a step costs
+        O(length) attention and a single QNN evaluation per sequence and decoder layer, instead of
+        re-running the whole target. Every position attends to itself and the previous positions,
+        i.e. the decoding is causal, so the model must be built with causal_decoder=True.
+
+        Parameters:
+        - src (torch.Tensor): Source token ids of shape (batch, src_len).
+        - tgt (torch.Tensor): Target prefix (e.g. the start token) of shape (batch, prefix_len).
+        - max_new_tokens (int): Maximum number of generated tokens.
+        - end_token (int, optional): Token ending a sequence. Finished sequences are padded with it,
+          and decoding stops when every sequence is finished. Default is None.
+        - encoder_output (torch.Tensor, optional): Output of encode(src) computed beforehand, in which
+          case src is not used. Default is None.
+
+        Returns:
+        - torch.Tensor: The prefix followed by the generated tokens, of shape (batch, length).
+        """
+        if encoder_output is None:
+            encoder_output = self.encode(src)
+        caches = [layer.init_cache() for layer in self.decoder_layers]
+        finished = torch.zeros(tgt.size(0), dtype=torch.bool, device=tgt.device)
+
+        logits = self.decode(tgt, encoder_output, caches)
+        for step in range(max_new_tokens):
+            next_token = logits[:, -1].argmax(-1)
+            if end_token is not None:
+                next_token = next_token.masked_fill(finished, end_token)
+                finished |= next_token == end_token
+            tgt = torch.cat([tgt, next_token[:, None]], dim=1)
+            if finished.all() or step == max_new_tokens - 1:
+                break
+            logits = self.decode(tgt[:, -1:], encoder_output, caches, offset=tgt.size(1) - 1)
+        return tgt
+
+    @torch.no_grad()
+    def beam_search(self, src, tgt, beam_size, max_new_tokens, end_token=None, length_penalty=1.0,
+                    encoder_output=None):
+        """
+        Extends target sequences by beam search.
+
+        The beams of all the sequences of the batch are decoded together: every step runs one
+        decoder pass over the last token of every live beam, reusing the encoder output and the
+        attention caches, so the quantum feed-forward blocks evaluate all the beams as one batch.
+        After each step the caches follow the selected beams, and the rows of the sequences that
+        are finished (beam_size finished hypotheses, or max_new_tokens reached) are dropped from
+        the batch. Like generate(), it requires causal_decoder=True.
+
+        Parameters:
+        - src (torch.Tensor): Source token ids of shape (batch, src_len).
+        - tgt (torch.Tensor): Target prefix (e.g. the start token) of shape (batch, prefix_len).
+        - beam_size (int): Number of beams per sequence.
+        - max_new_tokens (int): Maximum number of generated tokens.
+        - end_token (int, optional): Token ending a hypothesis. Default is None (every hypothesis has
+          max_new_tokens tokens).
+        - length_penalty (float, optional): Exponent of the number of generated tokens dividing the
+          log-probability of a hypothesis. Default is 1.0 (mean log-probability); 0.0 ranks the
+          hypotheses by their total log-probability.
+        - encoder_output (torch.Tensor, optional): Output of encode(src) computed beforehand, in which
+          case src is not used. Default is None.
+
+        Returns:
+        - tuple: The hypotheses of shape (batch, beam_size, length), best first, each being the prefix
+          followed by the generated tokens and padded with end_token (or 0), and their scores of shape
+          (batch, beam_size).
+        """
+        if beam_size < 1 or max_new_tokens < 1:
+            raise ValueError(f"beam_size and max_new_tokens must be positive, got {beam_size} and {max_new_tokens}.")
+        if encoder_output is None:
+            encoder_output = self.encode(src)
+        caches = [layer.init_cache() for layer in self.decoder_layers]
+        hypotheses = [[] for _ in range(tgt.size(0))]
+        # Sequences still decoded; their beams are consecutive rows of the batch
+        active = list(range(tgt.size(0)))
+
+        # The prefix is decoded once per sequence, the beams only diverge from the first new token
+        logits = self.decode(tgt, encoder_output, caches)
+        scores = logits.new_zeros((tgt.size(0), 1))
+        for step in range(max_new_tokens):
+            width = scores.size(1)
+            log_probs = torch.log_softmax(logits[:, -1], dim=-1)
+            vocab_size = log_probs.size(-1)
+            candidates = (scores.unsqueeze(-1) + log_probs.view(len(active), width, vocab_size)).flatten(1)
+            # 2 * beam_size candidates leave beam_size live beams even if beam_size of them end
+            top_scores, top_indices = candidates.topk(min(2 * beam_size, candidates.size(1)), dim=1)
+
+            last_step = step == max_new_tokens - 1
+            rows, tokens, next_scores, next_active = [], [], [], []
+            for i, sequence in enumerate(active):
+                beams = []
+                for rank, (score, index) in enumerate(zip(top_scores[i].tolist(), top_indices[i].tolist())):
+                    if score == float("-inf"):
+                        break
+                    row, token = i * width + index // vocab_size, index % vocab_size
+                    if token == end_token or last_step:
+                        if rank < beam_size:
+                            normalized = score / (step + 1) ** length_penalty
+                            hypotheses[sequence].append((normalized, tgt[row].tolist() + [token]))
+                    else:
+                        beams.append((row, token, score))
+                        if len(beams) == beam_size:
+                            break
+                if beams and len(hypotheses[sequence]) < beam_size and not last_step:
+                    # Too few candidates (tiny vocabulary) are padded with dead beams
+                    beams += [(beams[-1][0], beams[-1][1], float("-inf"))] * (beam_size - len(beams))
+                    next_active.append(sequence)
+                    for row, token, score in beams:
+                        rows.append(row)
+                        tokens.append(token)
+                        next_scores.append(score)
+            if not next_active:
+                break
+
+            active = next_active
+            indices = torch.tensor(rows, device=tgt.device)
+            tgt = torch.cat([tgt.index_select(0, indices), torch.tensor(tokens, device=tgt.device)[:, None]], dim=1)
+            scores = torch.tensor(next_scores, dtype=scores.dtype, device=scores.device).view(len(active), beam_size)
+            encoder_output = encoder_output.index_select(0, indices)
+            for cache in caches:
+                cache["self"].select(indices)
+                cache["cross"].select(indices)
+            logits = self.decode(tgt[:, -1:], encoder_output, caches, offset=tgt.size(1) - 1)
+
+        pad = 0 if end_token is None else end_token
+        length = max(len(sequence) for found in hypotheses for _, sequence in found)
+        sequences = torch.full((len(hypotheses), beam_size, length), pad, dtype=tgt.dtype, device=tgt.device)
+        sequence_scores = torch.full((len(hypotheses), beam_size), float("-inf"), dtype=scores.dtype,
+                                     device=scores.device)
+        for i, found in enumerate(hypotheses):
+            for j, (score, sequence) in enumerate(sorted(found, key=lambda item: -item[0])[:beam_size]):
+                sequences[i, j, :len(sequence)] = torch.tensor(sequence)
+                sequence_scores[i, j] = score
+        return sequences, sequence_scores
@@ -0,0 +1,67 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import torch
+from models.output_cache import OutputCache
+
+
+class TokenCache(OutputCache):
+    """
+    A bounded LRU cache of QNN outputs per token vector, for inference.
+
+    Token vectors are quantized to a fixed number of decimals and the bytes of the quantized
+    vector are used as the key, so repeated tokens (padding, shared prefixes across requests)
+    are simulated only once. Identical tokens within a batch are also deduplicated. The
+    cache is tagged with the version of the weights it was filled with and is emptied as soon
+    as the weights change. Entries are evicted in least recently used order to keep the
+    memory held by the cached keys and outputs under a byte budget (see OutputCache).
+
+    Usage:
+    To use the TokenCache class, import it as follows:
+    from models.token_cache import TokenCache
+
+    Example:
+    model = QuantumFeedForward(num_layers, num_wires, qnn_circuit, embed_len, backend="torch",
+                               token_cache=TokenCache(max_bytes=2 ** 26))
+    with torch.no_grad():
+        output = model(input_tensor)
+    print(model.token_cache.stats())
+    """
+
+    def __init__(self, max_bytes=2 ** 26, decimals=6):
+        """
+        Initializes the TokenCache class with the given parameters.
+
+        Parameters:
+        - max_bytes (int, optional): Memory budget of the cached keys and outputs, in bytes.
+          Default is 64 MiB.
+        - decimals (int, optional): Number of decimals the token vectors are rounded to before
+          hashing. Default is 6.
+        """
+        super(TokenCache, self).__init__(max_bytes)
+        self.decimals = decimals
+
+    def keys(self, tokens):
+        """
+        Computes the cache keys of a batch of token vectors.
+
+        Parameters:
+        - tokens (torch.Tensor): Token vectors of shape (num_tokens, embed_len).
+
+        Returns:
+        - list: One bytes key per token vector.
+        """
+        quantized = torch.round(tokens.detach() * 10 ** self.decimals).to(torch.int64).cpu().numpy()
+        return [row.tobytes() for row in quantized]
@@ -1,5 +1,11 @@
 # src/utils/__init__.py
 
-from .utils import train_model
+from utils.lazy_import import lazy_exports
+
+# utils.utils imports PyTorch and scikit-learn, and utils.data_loader PyTorch, so they are only
+# imported when one of their names is first accessed
 # from .config import Config
-from .data_loader import DataLoader
+lazy_exports(__name__, {
+    "train_model": ".utils",
+    "DataLoader": ".data_loader",
+})
@@ -14,7 +14,6 @@
 # ==============================================================================
 
 #Variables to access across project . . .
-import torch
 
 num_wires = 6
 num_layers = 2
@@ -22,7 +21,18 @@ num_basis = 2
 single_output = False
 multi_output = False
 probabilities = True
-device = 'cuda:0' if torch.cuda.is_available() else 'cpu'
+# Reduced probability outputs (backend "torch" or "mps" only): per-wire marginals, the
+# probabilities of selected basis states, or the top_k most probable basis states
+marginals = False
+basis_states = None
+top_k = None
 
 def get_device():
-    return device
+    # Importing torch takes seconds, so the device is only looked up when it is first needed
+    import torch
+    return 'cuda:0' if torch.cuda.is_available() else 'cpu'
+
+def __getattr__(name):
+    if name == "device":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
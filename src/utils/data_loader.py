@@ -15,7 +15,6 @@
 
 import os
 from torch.utils.data import Dataset, DataLoader
-from torchvision import datasets, transforms
 
 class CustomDataset(Dataset):
     def __init__(self, data_dir, transform=None):
@@ -0,0 +1,65 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    A package whose public names are imported from their submodules on first access, so that
+    importing the package itself does not import PyTorch, PennyLane, Strawberry Fields,
+    torchvision or scikit-learn.
+
+    Usage:
+    To make a package lazy, call lazy_exports at the end of its __init__.py:
+    from utils.lazy_import import lazy_exports
+    lazy_exports(__name__, {"QuantumNeuralNetwork": ".quantum_neural_network"})
+    """
+
+    def __getattr__(self, name):
+        # Only called when the name is not bound yet, i.e. on first access
+        exports = self.__dict__.get("_lazy_exports", {})
+        if name not in exports:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package. If the submodule has the name of one of
+        # the exports (e.g. layers.qnn_circuit), the package keeps the exported object instead.
+        exports = self.__dict__.get("_lazy_exports", {})
+        if name in exports and isinstance(value, types.ModuleType) and value.__name__.endswith(exports[name]):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__dict__.get("_lazy_exports", {})))
+
+
+def lazy_exports(module_name, exports):
+    """
+    Defers the imports of the public names of a package until they are first accessed.
+
+    Parameters:
+    - module_name (str): Name of the package, i.e. ``__name__`` in its __init__.py.
+    - exports (dict): Mapping from the public names to the names of the modules defining them,
+      relative to the package (".quantum_neural_network") or absolute ("models").
+    """
+    module = sys.modules[module_name]
+    module.__class__ = LazyModule
+    module.__dict__["_lazy_exports"] = dict(exports)
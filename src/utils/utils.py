@@ -16,7 +16,6 @@
 # Train qnn_model parameters
 
 import torch
-from sklearn.metrics import mean_absolute_error, mean_squared_error
 import numpy as np
 
 def train_model(model, criterion, optimizer, train_loader, num_epochs=100, device='cpu', debug=True):
@@ -110,6 +109,9 @@ def evaluate_regression_model(model, X_test, y_test):
     Returns:
     - metrics: Dictionary containing MAE and RMSE.
     """
+    # scikit-learn is slow to import and only needed here
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+
     model.eval()  # Set the model to evaluation mode
     with torch.no_grad():
         y_pred = model(X_test)
@@ -0,0 +1,117 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.compiler import FusedGate, eliminate_dead_gates, fuse_operations
+from backends.fock_backend import FockBackend
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+
+
+class TestCompiler(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Record a 3-mode QNN circuit with a batch of encoded inputs and two weight layers.
+        """
+        self.num_wires = 3
+        self.x = torch.rand(4, 22, dtype=torch.float64)
+        self.var = torch.rand(2, 23, dtype=torch.float64, requires_grad=True)
+
+    def record(self):
+        with qml.tape.QuantumTape() as tape:
+            QuantumDataEncoder(self.num_wires).encode(self.x)
+            for v in self.var:
+                QuantumNeuralNetworkLayer(self.num_wires).apply(v)
+            qml.probs(wires=range(self.num_wires))
+        return tape
+
+    def test_fuses_weight_blocks(self):
+        """
+        Test that the gates with batched parameters are kept and the weight-only layers are fused.
+        """
+        tape = self.record()
+        compiled = fuse_operations(tape.operations, cutoff_dim=2)
+        num_encoder_gates = len(tape.operations) - 2 * 19
+
+        self.assertEqual(len(compiled), num_encoder_gates + 1)
+        self.assertIsInstance(compiled[-1], FusedGate)
+        self.assertEqual(len(compiled[-1].operations), 2 * 19)
+        self.assertEqual(compiled[-1].wires.tolist(), [0, 1, 2])
+
+    def test_max_dim(self):
+        """
+        Test that blocks are split so that no fused operator exceeds max_dim.
+        """
+        compiled = fuse_operations(self.record().operations, cutoff_dim=2, max_dim=4)
+        blocks = [op for op in compiled if isinstance(op, FusedGate)]
+        self.assertGreater(len(blocks), 1)
+        self.assertTrue(all(len(block.wires) <= 2 for block in blocks))
+
+    def test_fused_execution_matches(self):
+        """
+        Test that the fused circuit gives the same outputs and gradients as gate-by-gate execution.
+        """
+        outputs, grads = [], []
+        for fusion in (False, True):
+            backend = FockBackend(self.num_wires, 3, fusion=fusion, max_fused_dim=9)
+            output = backend.execute(self.record())
+            outputs.append(output)
+            grads.append(torch.autograd.grad(output[:, 1].sum(), self.var)[0])
+
+        torch.testing.assert_close(outputs[0], outputs[1])
+        torch.testing.assert_close(grads[0], grads[1])
+
+    def test_eliminate_dead_gates(self):
+        """
+        Test that gates encoding zero-padded features are dropped and that the results are unchanged.
+        """
+        self.x[:, 10:] = 0.0
+        self.var.requires_grad_(False)
+        with torch.no_grad():
+            self.var[:, 2 * (self.num_wires - 1) + self.num_wires:] = 0.0
+        tape = self.record()
+
+        operations, report = eliminate_dead_gates(tape.operations)
+        self.assertEqual(report.num_gates, len(tape.operations))
+        self.assertEqual(len(operations), len(tape.operations) - report.num_removed)
+        self.assertEqual(report.removed["Kerr"], 3 + 2 * 3)
+        self.assertEqual(report.removed["Beamsplitter"], 2 * (self.num_wires - 1))
+
+        backend = FockBackend(self.num_wires, 3)
+        output = backend.execute(tape)
+        self.assertEqual(backend.last_report.num_removed, report.num_removed)
+        torch.testing.assert_close(output, FockBackend(self.num_wires, 3, dead_gate_tol=None).execute(tape))
+
+    def test_dead_gate_tolerance(self):
+        """
+        Test that near-identity gates are only dropped within the tolerance, and never if they are trainable.
+        """
+        weight = torch.tensor(1e-5, requires_grad=True)
+        operations = [qml.Kerr(1e-5, wires=0), qml.Rotation(0.1, wires=0), qml.Kerr(weight, wires=1)]
+
+        self.assertEqual(len(eliminate_dead_gates(operations)[0]), 3)
+        kept, report = eliminate_dead_gates(operations, tol=1e-4)
+        self.assertEqual([op.name for op in kept], ["Rotation", "Kerr"])
+        self.assertEqual(report.removed, {"Kerr": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.qnn_circuit import qnn_circuit
+from models.encoder_cache import EncoderCache
+from models.quantum_transformer import QuantumTransformer
+from utils.config import num_wires, num_basis
+
+
+class TestEncoderCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a small transformer on the torch backend with an encoder cache.
+        """
+        torch.manual_seed(0)
+        self.model = QuantumTransformer(1, 1, num_basis ** num_wires, 8, 2, num_wires, qnn_circuit, 2, 20,
+                                        backend="torch", encoder_cache=EncoderCache(), causal_decoder=True).eval()
+        self.src = torch.randint(0, 20, (2, 4))
+
+    def test_cached_outputs_match(self):
+        """
+        Test that cached and freshly computed encoder outputs match, and that only the distinct
+        uncached sequences are encoded.
+        """
+        calls = []
+
+        def encode(src):
+            calls.append(src.shape[0])
+            return self.model._encode(src)
+
+        cache = self.model.encoder_cache
+        version = self.model.encoder_version()
+        with torch.no_grad():
+            expected = self.model._encode(self.src)
+            first = cache.evaluate(self.src, version, encode)
+            batch = torch.cat([self.src, self.src[:1], torch.randint(0, 20, (1, 4))])
+            second = cache.evaluate(batch, version, encode)
+
+        self.assertEqual(calls, [2, 1])
+        self.assertTrue(torch.allclose(first, expected, atol=1e-6))
+        self.assertTrue(torch.allclose(second[:2], expected, atol=1e-6))
+        self.assertTrue(torch.equal(second[2], first[0]))
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_model_version(self):
+        """
+        Test that updating the encoder weights purges the cache, and that the cache is bypassed in
+        training.
+        """
+        with torch.no_grad():
+            before = self.model.encode(self.src)
+            self.model.embedding.firstEmbedding.weight.add_(1.0)
+            after = self.model.encode(self.src)
+        self.assertFalse(torch.allclose(before, after))
+        self.assertTrue(torch.allclose(after, self.model._encode(self.src).detach(), atol=1e-6))
+        self.assertEqual(self.model.encoder_cache.stats()["misses"], 4)
+        # The outputs of the previous weights are purged
+        self.assertEqual(self.model.encoder_cache.stats()["invalidations"], 1)
+        self.assertEqual(self.model.encoder_cache.stats()["entries"], 2)
+
+        self.model.train()
+        output = self.model.encode(self.src)
+        self.assertTrue(output.requires_grad)
+        self.assertEqual(self.model.encoder_cache.stats()["misses"], 4)
+
+    def test_eviction(self):
+        """
+        Test that the cache stays under its byte budget.
+        """
+        cache = EncoderCache(max_bytes=3000)
+        with torch.no_grad():
+            for _ in range(4):
+                cache.evaluate(torch.randint(0, 20, (2, 4)), 0, lambda src: torch.zeros(src.shape[0], 4, 32))
+        self.assertLessEqual(cache.stats()["bytes"], 3000)
+        self.assertGreater(cache.stats()["evictions"], 0)
+
+    def test_generate_with_encoder_output(self):
+        """
+        Test that generating from a held encoder output matches generating from the source.
+        """
+        tgt = torch.zeros(2, 1, dtype=torch.long)
+        memory = self.model.encode(self.src)
+        expected = self.model.generate(self.src, tgt, 3)
+        self.assertTrue(torch.equal(self.model.generate(None, tgt, 3, encoder_output=memory), expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
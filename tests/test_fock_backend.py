@@ -0,0 +1,117 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import numpy as np
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+
+
+class TestFockBackend(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a Strawberry Fields reference device and a FockBackend of the same size.
+        """
+        self.num_wires = 2
+        self.cutoff_dim = 4
+        self.backend = FockBackend(self.num_wires, self.cutoff_dim)
+        self.dev = qml.device("strawberryfields.fock", wires=self.num_wires, cutoff_dim=self.cutoff_dim)
+
+    @staticmethod
+    def gates(x):
+        qml.Squeezing(x[0], x[1], wires=0)
+        qml.Displacement(x[2], x[3], wires=1)
+        qml.Beamsplitter(x[4], x[5], wires=[0, 1])
+        qml.Rotation(x[6], wires=0)
+        qml.Kerr(x[7], wires=1)
+
+    def test_matches_strawberryfields(self):
+        """
+        Test that the probabilities and quadrature expectations match the strawberryfields.fock device.
+        """
+        x = [0.2, 0.4, 0.3, -0.5, 0.7, 0.1, 0.9, 0.6]
+
+        @qml.qnode(self.dev)
+        def probs_circuit(x):
+            self.gates(x)
+            return qml.probs(wires=[0, 1])
+
+        @qml.qnode(self.dev)
+        def expval_circuit(x):
+            self.gates(x)
+            return [qml.expval(qml.X(wire)) for wire in range(self.num_wires)]
+
+        with qml.tape.QuantumTape() as probs_tape:
+            self.gates(x)
+            qml.probs(wires=[0, 1])
+        with qml.tape.QuantumTape() as expval_tape:
+            self.gates(x)
+            [qml.expval(qml.X(wire)) for wire in range(self.num_wires)]
+
+        np.testing.assert_allclose(self.backend.execute(probs_tape).numpy(), probs_circuit(x), atol=1e-10)
+        np.testing.assert_allclose(self.backend.execute(expval_tape).numpy(), expval_circuit(x), atol=1e-10)
+
+    def test_batched_parameters(self):
+        """
+        Test that a batch of parameters gives the same results as simulating each sample on its own.
+        """
+        x = torch.rand(3, 8, dtype=torch.float64)
+        params = [x[:, i] for i in range(8)]
+
+        with qml.tape.QuantumTape() as tape:
+            self.gates(params)
+            qml.probs(wires=[0, 1])
+        output = self.backend.execute(tape)
+        self.assertEqual(output.shape, (3, self.cutoff_dim ** self.num_wires))
+
+        for b in range(3):
+            with qml.tape.QuantumTape() as tape:
+                self.gates([p[b] for p in params])
+                qml.probs(wires=[0, 1])
+            np.testing.assert_allclose(output[b].numpy(), self.backend.execute(tape).numpy(), atol=1e-12)
+
+    def test_gradients(self):
+        """
+        Test that gradients flow back to the gate parameters.
+        """
+        x = torch.rand(3, 8, dtype=torch.float64, requires_grad=True)
+
+        with qml.tape.QuantumTape() as tape:
+            self.gates([x[:, i] for i in range(8)])
+            qml.expval(qml.X(0))
+        self.backend.execute(tape).sum().backward()
+
+        self.assertEqual(x.grad.shape, x.shape)
+        self.assertTrue(torch.all(torch.isfinite(x.grad)))
+
+    def test_unsupported_operation(self):
+        """
+        Test that an error is raised for gates the backend does not implement.
+        """
+        with qml.tape.QuantumTape() as tape:
+            qml.CubicPhase(0.1, wires=0)
+            qml.probs(wires=[0])
+
+        with self.assertRaises(ValueError):
+            self.backend.execute(tape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import numpy as np
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from thewalrus.fock_gradients import beamsplitter, displacement, squeezing
+from backends.fock_backend import FockBackend, beamsplitter_tensor, displacement_matrix, squeezing_matrix
+from backends.gate_cache import GateMatrixCache, gate_tables
+
+
+class TestGateCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a FockBackend with its own GateMatrixCache.
+        """
+        self.cache = GateMatrixCache(maxsize=2)
+        self.backend = FockBackend(2, 4, cache=self.cache)
+
+    def test_tables_match_thewalrus(self):
+        """
+        Test that the matrices evaluated from the recurrence tables match The Walrus.
+        """
+        for cutoff in (2, 5, 8):
+            for r, phi in [(0.3, 0.7), (1.1, -2.0)]:
+                np.testing.assert_allclose(displacement_matrix(r, phi, cutoff).numpy(),
+                                           displacement(r, phi, cutoff), atol=1e-12)
+                np.testing.assert_allclose(squeezing_matrix(r, phi, cutoff).numpy(),
+                                           squeezing(r, phi, cutoff), atol=1e-12)
+                np.testing.assert_allclose(beamsplitter_tensor(r, phi, cutoff).numpy(),
+                                           beamsplitter(r, phi, cutoff), atol=1e-12)
+
+    def test_converted_tables_cached(self):
+        """
+        Test that the tables converted to a dtype and device are built once and reused.
+        """
+        device = torch.device("cpu")
+        tables = gate_tables("Squeezing", 4, torch.float32, device)
+        self.assertEqual(tables["coef"].dtype, torch.float32)
+        self.assertEqual(tables["power"].dtype, torch.int64)
+        self.assertIs(gate_tables("Squeezing", 4, torch.float32, device)["coef"], tables["coef"])
+        self.assertEqual(squeezing_matrix(0.3, 0.7, 4, torch.complex64).dtype, torch.complex64)
+
+    def test_hits_and_misses(self):
+        """
+        Test that repeated parameter values are served from the LRU and that the counters are updated.
+        """
+        with qml.tape.QuantumTape() as tape:
+            qml.Squeezing(0.2, 0.1, wires=0)
+            qml.Squeezing(0.2, 0.1, wires=1)
+            qml.Beamsplitter(0.5, 0.3, wires=[0, 1])
+            qml.probs(wires=[0, 1])
+
+        first = self.backend.execute(tape)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        second = self.backend.execute(tape)
+        self.assertTrue(torch.equal(first, second))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (4, 2, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 4 / 6)
+
+    def test_eviction(self):
+        """
+        Test that the least recently used matrix is evicted when the cache is full.
+        """
+        for r in (0.1, 0.2, 0.3):
+            self.cache.get("Displacement", (r, 0.0), 4, torch.complex128, displacement_matrix)
+        self.cache.get("Displacement", (0.1, 0.0), 4, torch.complex128, displacement_matrix)
+        self.assertEqual(self.cache.stats()["misses"], 4)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    def test_bypass(self):
+        """
+        Test that batched and trainable parameters are never cached, so gradients stay correct.
+        """
+        weight = torch.tensor(0.4, dtype=torch.float64, requires_grad=True)
+        for _ in range(2):
+            with qml.tape.QuantumTape() as tape:
+                qml.Displacement(weight, 0.0, wires=0)
+                qml.Squeezing(torch.tensor([0.1, 0.2]), 0.0, wires=1)
+                qml.expval(qml.X(0))
+            tape_output = FockBackend(2, 4, gaussian_fast_path=False, cache=self.cache).execute(tape)
+            tape_output.sum().backward()
+
+        self.assertEqual(self.cache.stats()["bypasses"], 4)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertIsNotNone(weight.grad)
+
+    def test_inference_only(self):
+        """
+        Test that trainable parameters are cached under torch.no_grad(), and that parameters off the
+        CPU bypass the cache instead of being read at every gate.
+        """
+        weight = torch.tensor(0.4, dtype=torch.float64, requires_grad=True)
+        build = lambda r, phi, cutoff, dtype: torch.eye(cutoff, dtype=dtype)
+        with torch.no_grad():
+            for _ in range(2):
+                self.cache.get("Squeezing", (weight, 0.0), 4, torch.complex128, build)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        self.cache.get("Squeezing", (torch.tensor(0.4, device="meta"), 0.0), 4, torch.complex128, build)
+        self.assertEqual(self.cache.stats()["bypasses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
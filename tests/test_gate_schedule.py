@@ -0,0 +1,77 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.gate_schedule import GateSchedule
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+
+
+class TestGateSchedule(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize an encoder and a QNN layer on 3 wires.
+        """
+        self.num_wires = 3
+        self.encoder = QuantumDataEncoder(self.num_wires)
+        self.layer = QuantumNeuralNetworkLayer(self.num_wires)
+
+    def test_schedules_are_cached(self):
+        """
+        Test that schedules are compiled once per (num_wires, size) and shared between instances.
+        """
+        self.assertIs(self.encoder.schedule(22), QuantumDataEncoder(self.num_wires).schedule(22))
+        self.assertIs(self.layer.schedule(23), QuantumNeuralNetworkLayer(self.num_wires).schedule(23))
+        self.assertIsNot(self.encoder.schedule(22), self.encoder.schedule(21))
+
+    def test_arrays(self):
+        """
+        Test the read-only array view of a full QNN layer schedule.
+        """
+        schedule = self.layer.schedule(9 * self.num_wires - 4)
+
+        self.assertIsInstance(schedule, GateSchedule)
+        self.assertEqual(len(schedule), 7 * self.num_wires - 2)
+        self.assertEqual(schedule.gates[:3], ("Beamsplitter", "Beamsplitter", "Rotation"))
+        self.assertEqual(schedule.wires[0].tolist(), [0, 1])
+        self.assertEqual(schedule.wires[2].tolist(), [0, -1])
+        self.assertEqual(schedule.params[2 * self.num_wires - 1].tolist(), [7, -1])
+        with self.assertRaises(ValueError):
+            schedule.params[0, 0] = 1
+
+    def test_apply_matches_schedule(self):
+        """
+        Test that applying a schedule records the scheduled gates with the indexed parameters.
+        """
+        v = torch.rand(23)
+        with qml.tape.QuantumTape() as tape:
+            self.layer.apply(v)
+
+        schedule = self.layer.schedule(23)
+        self.assertEqual([op.name for op in tape.operations], list(schedule.gates))
+        for op, (_, wires, indices) in zip(tape.operations, schedule):
+            self.assertEqual(op.wires.tolist(), list(wires))
+            expected = [0.0 if idx is None else v[idx] for idx in indices]
+            self.assertEqual([float(p) for p in op.parameters], [float(p) for p in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
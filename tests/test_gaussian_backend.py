@@ -0,0 +1,124 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.gaussian_backend import GaussianBackend
+from layers.quantum_data_encoder import QuantumDataEncoder
+
+
+class TestGaussianBackend(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a GaussianBackend and a batch of small gate parameters.
+        """
+        self.num_wires = 3
+        self.backend = GaussianBackend(self.num_wires)
+        torch.manual_seed(0)
+        self.x = 0.2 * torch.randn(4, 12, dtype=torch.float64)
+
+    def record(self, x, kerr=0.0, measure_probs=False):
+        with qml.tape.QuantumTape() as tape:
+            qml.Displacement(x[:, 0], x[:, 1], wires=0)
+            qml.Squeezing(x[:, 2], x[:, 3], wires=0)
+            qml.Squeezing(x[:, 4], x[:, 5], wires=1)
+            qml.Beamsplitter(x[:, 6], x[:, 7], wires=[0, 1])
+            qml.Beamsplitter(x[:, 8], x[:, 9], wires=[1, 2])
+            qml.Rotation(x[:, 10], wires=1)
+            qml.Displacement(x[:, 11], 0.4, wires=2)
+            qml.Kerr(kerr, wires=1)
+            if measure_probs:
+                qml.probs(wires=[0])
+            else:
+                [qml.expval(qml.X(wire)) for wire in range(self.num_wires)]
+                qml.expval(qml.P(1))
+        return tape
+
+    def test_matches_fock_backend(self):
+        """
+        Test that the Gaussian simulation agrees with a Fock simulation at a large cutoff.
+        """
+        tape = self.record(self.x)
+        expected = FockBackend(self.num_wires, 14).execute(tape)
+        output = self.backend.execute(tape)
+
+        self.assertEqual(output.shape, (4, self.num_wires + 1))
+        self.assertTrue(torch.allclose(output, expected, atol=1e-5))
+
+    def test_supports(self):
+        """
+        Test that only Gaussian circuits measuring quadratures are supported.
+        """
+        self.assertTrue(self.backend.supports(self.record(self.x)))
+        self.assertTrue(self.backend.supports(self.record(self.x, kerr=torch.zeros(4))))
+        self.assertFalse(self.backend.supports(self.record(self.x, kerr=0.1)))
+        self.assertFalse(self.backend.supports(self.record(self.x, measure_probs=True)))
+
+    def test_fock_backend_dispatch(self):
+        """
+        Test that the FockBackend runs Gaussian circuits on the Gaussian engine only when the fast
+        path is enabled, the truncated simulation being the default.
+        """
+        tape = self.record(self.x)
+        fock = FockBackend(self.num_wires, 2, gaussian_fast_path=True)
+        self.assertTrue(torch.allclose(fock.execute(tape), self.backend.execute(tape)))
+
+        self.assertIsNone(FockBackend(self.num_wires, 2).gaussian)
+        self.assertFalse(torch.allclose(FockBackend(self.num_wires, 2).execute(tape), self.backend.execute(tape)))
+
+    def test_trainable_zero_kerr(self):
+        """
+        Test that a trainable Kerr parameter at zero keeps the circuit on the Fock simulation, so
+        that its gradient is not dropped with the gate.
+        """
+        kerr = torch.zeros(4, dtype=torch.float64, requires_grad=True)
+        tape = self.record(self.x, kerr=kerr)
+        self.assertFalse(self.backend.supports(tape))
+        with torch.no_grad():
+            self.assertTrue(self.backend.supports(tape))
+
+        gradients = []
+        for fast_path in (False, True):
+            output = FockBackend(self.num_wires, 4, gaussian_fast_path=fast_path).execute(tape)
+            gradients.append(torch.autograd.grad(output.sum(), kerr)[0])
+        self.assertGreater(gradients[0].abs().max().item(), 1e-6)
+        self.assertTrue(torch.allclose(gradients[1], gradients[0]))
+
+    def test_many_wires(self):
+        """
+        Test that encoding short inputs on many wires, which never reaches the Kerr gates,
+        runs on the Gaussian engine.
+        """
+        num_wires = 24
+        inputs = torch.rand(8, num_wires * 4, dtype=torch.float64, requires_grad=True)
+        with qml.tape.QuantumTape() as tape:
+            QuantumDataEncoder(num_wires).encode(inputs)
+            [qml.expval(qml.X(wire)) for wire in range(num_wires)]
+
+        output = FockBackend(num_wires, 2, gaussian_fast_path=True).execute(tape)
+        self.assertEqual(output.shape, (8, num_wires))
+
+        output.sum().backward()
+        self.assertEqual(inputs.grad.shape, inputs.shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
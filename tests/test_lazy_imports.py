@@ -0,0 +1,76 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import subprocess
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+HEAVY_MODULES = ("torch", "pennylane", "strawberryfields", "torchvision", "sklearn")
+
+
+def run_fresh(code):
+    """
+    Runs code in a fresh interpreter with src on the path and returns its standard output.
+    """
+    code = f"import sys\nsys.path.insert(0, {SRC_DIR!r})\n{code}"
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_packages_import_without_heavy_dependencies(self):
+        """
+        Test that importing the packages does not import PyTorch, PennyLane, Strawberry Fields,
+        torchvision or scikit-learn.
+        """
+        output = run_fresh(f"import layers, models, utils, backends\nfrom utils import config\n"
+                           f"print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+        self.assertEqual(output.strip(), "")
+
+    def test_names_are_loaded_on_first_access(self):
+        """
+        Test that the exported names resolve to the objects of their submodules.
+        """
+        output = run_fresh("import layers, models, backends\n"
+                           "print(models.QuantumNeuralNetwork.__module__, backends.FockBackend.__module__, "
+                           "'WeightInitializer' in dir(layers))")
+        self.assertEqual(output.split(), ["models.quantum_neural_network", "backends.fock_backend", "True"])
+
+    def test_qnn_circuit_export(self):
+        """
+        Test that layers.qnn_circuit is the circuit factory even after its submodule was imported directly.
+        """
+        output = run_fresh("import layers.qnn_circuit\nfrom layers import qnn_circuit, QNNCircuit\n"
+                           "print(isinstance(qnn_circuit, QNNCircuit))")
+        self.assertEqual(output.strip(), "True")
+
+    def test_top_level_package_single_import(self):
+        """
+        Test that the top-level package reuses the subpackages imported with src on the path
+        instead of loading them a second time under src.
+        """
+        root = os.path.dirname(SRC_DIR)
+        output = run_fresh(f"sys.path.insert(0, {root!r})\nimport src, models, utils.lazy_import\n"
+                           "print(src.QuantumNeuralNetwork is models.QuantumNeuralNetwork, "
+                           "type(src) is utils.lazy_import.LazyModule, "
+                           "*sorted(m for m in sys.modules if m.startswith('src.')))")
+        self.assertEqual(output.split(), ["True", "True"])
+
+
+if __name__ == '__main__':
+    unittest.main()
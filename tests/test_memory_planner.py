@@ -0,0 +1,86 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.memory_planner import ADJOINT_STATES, TRANSIENT_STATES, estimate_memory, plan_memory
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires
+
+
+class TestMemoryPlanner(unittest.TestCase):
+
+    def test_estimate(self):
+        """
+        Test that the estimate scales with the batch, the state size and the number of saved states.
+        """
+        estimate = estimate_memory(4, 3, 10, 7, torch.complex128)
+        self.assertEqual(estimate["state"], 81 * 16)
+        self.assertEqual(estimate["forward"], 10 * 81 * 16 * (7 + TRANSIENT_STATES))
+        self.assertEqual(estimate["backward"], 10 * 81 * 16 * (7 + TRANSIENT_STATES + ADJOINT_STATES))
+        self.assertEqual(estimate["peak"], estimate["backward"])
+        inference = estimate_memory(4, 3, 10, 7, torch.complex64, requires_grad=False)
+        self.assertEqual(inference["peak"], 10 * 81 * 8 * TRANSIENT_STATES)
+        self.assertEqual(inference["backward"], 0)
+
+    def test_plan(self):
+        """
+        Test that batches exceeding the budget are chunked, and refused when chunking is not allowed
+        or when a single sample does not fit.
+        """
+        per_sample = estimate_memory(6, 4, 1, 20)["peak"]
+        self.assertEqual(plan_memory(6, 4, 64, 20).num_chunks, 1)
+
+        plan = plan_memory(6, 4, 64, 20, budget=10 * per_sample + 100, overhead=100)
+        self.assertEqual((plan.chunk_size, plan.num_chunks), (10, 7))
+        self.assertLessEqual(plan.peak_bytes, plan.budget)
+        self.assertIn("7 chunk(s)", str(plan))
+
+        with self.assertRaises(ValueError):
+            plan_memory(6, 4, 64, 20, budget=10 * per_sample, auto_chunk=False)
+        with self.assertRaises(ValueError):
+            plan_memory(6, 4, 64, 20, budget=per_sample - 1)
+
+    def test_chunked_layer(self):
+        """
+        Test that a TorchFockLayer with a memory budget chunks the batch with the same outputs and gradients.
+        """
+        model = QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch")
+        layer = model.qlayers
+        budgeted = QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch", memory_budget=1).qlayers
+        with torch.no_grad():
+            layer.var.copy_(torch.as_tensor(model.weights))
+            budgeted.var.copy_(layer.var)
+        inputs = torch.rand(12, 10)
+
+        with self.assertRaises(ValueError):
+            budgeted(inputs)
+        budgeted.memory_budget = None
+        budgeted.memory_budget = budgeted.plan(inputs[:5]).peak_bytes
+        output = budgeted(inputs)
+        self.assertEqual(budgeted.last_plan.num_chunks, 3)
+        self.assertTrue(torch.allclose(output, layer(inputs), atol=1e-6))
+
+        layer(inputs).pow(2).sum().backward()
+        output.pow(2).sum().backward()
+        self.assertTrue(torch.allclose(budgeted.var.grad, layer.var.grad, atol=1e-6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.mps_backend import MPSBackend
+from backends.torch_fock_layer import TorchFockLayer
+from layers.qnn_circuit import qnn_circuit
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+from layers.weight_initializer import WeightInitializer
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires
+
+
+def make_circuit(wires):
+    def circuit(inputs, var):
+        QuantumDataEncoder(wires).encode(inputs)
+        layer = QuantumNeuralNetworkLayer(wires)
+        for v in var:
+            layer.apply(v)
+        return [qml.probs(wires=[2, 0]), qml.expval(qml.X(1)), qml.expval(qml.P(wires - 1))]
+    return circuit
+
+
+class TestMPSBackend(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a 4-wire QNN circuit with weights large enough to entangle the wires.
+        """
+        self.circuit = make_circuit(4)
+        self.weights = torch.as_tensor(WeightInitializer.init_weights(2, 4, active_sd=0.1, passive_sd=0.5))
+
+    def layer(self, backend):
+        layer = TorchFockLayer(self.circuit, {"var": self.weights.shape}, backend)
+        with torch.no_grad():
+            layer.var.copy_(self.weights)
+        return layer
+
+    def test_matches_fock_backend(self):
+        """
+        Test that without truncation the MPS backend reproduces the Fock backend outputs and gradients.
+        """
+        fock = self.layer(FockBackend(4, 3))
+        mps = self.layer(MPSBackend(4, 3))
+        inputs = torch.rand(5, 12, dtype=torch.float64, requires_grad=True)
+
+        grads = []
+        for layer in (fock, mps):
+            output = layer(inputs)
+            output.pow(2).sum().backward()
+            grads.append((output, layer.var.grad, inputs.grad.clone()))
+            inputs.grad = None
+
+        for expected, actual in zip(*grads):
+            self.assertTrue(torch.allclose(actual, expected, atol=1e-10))
+        self.assertEqual(mps.backend.truncation_error, 0.0)
+        self.assertEqual(mps.backend.max_bond_used, 9)
+
+    def test_bond_truncation(self):
+        """
+        Test that the bond dimension is capped and that the discarded weight bounds the error.
+        """
+        inputs = torch.rand(5, 12, dtype=torch.float64)
+        expected = self.layer(FockBackend(4, 3))(inputs)
+        mps = self.layer(MPSBackend(4, 3, max_bond=4))
+        output = mps(inputs)
+
+        self.assertEqual(mps.backend.max_bond_used, 4)
+        self.assertIsInstance(mps.backend.truncation_error, float)
+        self.assertGreater(mps.backend.truncation_error, 0.0)
+        self.assertLess((output - expected).abs().max().item(), 10 * mps.backend.truncation_error ** 0.5)
+
+    def test_truncation_error_is_schmidt_weight(self):
+        """
+        Test that the discarded weight of a truncation is that of the Schmidt decomposition of the state.
+        """
+        operations = [qml.Squeezing(0.4 + 0.1 * w, 0.3, wires=w) for w in range(4)]
+        operations += [qml.Beamsplitter(0.7, 0.2, wires=[0, 1]), qml.Beamsplitter(0.9, 0.4, wires=[2, 3])]
+        operations += [qml.Displacement(0.3, 0.1, wires=w) for w in range(4)]
+        operations.append(qml.Beamsplitter(0.6, 0.5, wires=[1, 2]))
+        fock = FockBackend(4, 3)
+        state = fock.apply(operations, fock.vacuum(1))
+        schmidt = torch.linalg.svdvals(state.reshape(9, 9))
+
+        mps = MPSBackend(4, 3, max_bond=4, dead_gate_tol=None)
+        sites = mps.apply(operations, mps.vacuum(1))
+
+        self.assertEqual(mps.max_bond_used, 4)
+        self.assertEqual(sites[1].shape[3], 4)
+        self.assertAlmostEqual(mps.truncation_error, (schmidt[4:] ** 2).sum().item(), places=10)
+
+    def test_many_wires(self):
+        """
+        Test that a 16-wire circuit is simulated with bounded bonds and finite gradients.
+        """
+        circuit = make_circuit(16)
+        weights = WeightInitializer.init_weights(1, 16)
+        layer = TorchFockLayer(circuit, {"var": weights.shape}, MPSBackend(16, 2, max_bond=8))
+        output = layer(torch.rand(3, 32))
+        output.sum().backward()
+
+        self.assertEqual(output.shape, (3, 4 + 2))
+        self.assertLessEqual(layer.backend.max_bond_used, 8)
+        self.assertTrue(torch.isfinite(layer.var.grad).all())
+
+    def test_non_neighbouring_gate(self):
+        """
+        Test that two-mode gates on non-neighbouring wires are rejected.
+        """
+        with qml.tape.QuantumTape() as tape:
+            qml.Beamsplitter(0.1, 0.2, wires=[0, 2])
+            qml.probs(wires=[0])
+        with self.assertRaises(ValueError):
+            MPSBackend(3, 2).execute(tape)
+
+    def test_quantum_neural_network_backend(self):
+        """
+        Test that QuantumNeuralNetwork builds a layer on the MPS backend.
+        """
+        qlayers = QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="mps", max_bond=8).qlayers
+        self.assertIsInstance(qlayers.backend, MPSBackend)
+        self.assertEqual(qlayers.backend.max_bond, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
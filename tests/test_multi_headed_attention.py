@@ -92,6 +92,76 @@ class TestMultiHeadedAttention(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.multi_head_attention(queries, keys, values)
 
+    def test_chunked_attention(self):
+        """
+        Test that the tiled attention matches the dense attention, with and without the causal mask,
+        in the forward and backward passes.
+        """
+        for mask in (None, True):
+            dense = MultiHeadedAttention(self.num_heads, self.embed_len, mask=mask).double()
+            chunked = MultiHeadedAttention(self.num_heads, self.embed_len, mask=mask, block_size=4).double()
+            chunked.load_state_dict(dense.state_dict())
+            x = torch.rand(2, 19, self.embed_len, dtype=torch.float64, requires_grad=True)
+
+            expected = dense(x, x, x)
+            gradient, = torch.autograd.grad(expected.pow(2).sum(), x)
+            output = chunked(x, x, x)
+            chunked_gradient, = torch.autograd.grad(output.pow(2).sum(), x)
+            self.assertTrue(torch.allclose(output, expected, atol=1e-12))
+            self.assertTrue(torch.allclose(chunked_gradient, gradient, atol=1e-12))
+
+    def test_packed_projection(self):
+        """
+        Test that checkpoints with separate q, k and v linear layers load into the packed projection,
+        and that the self-attention fast path matches separate projections.
+        """
+        torch.manual_seed(0)
+        separate = {projection: torch.nn.Linear(self.embed_len, self.embed_len) for projection in "qkv"}
+        state_dict = {f"{projection}_linear.{name}": getattr(layer, name).detach().clone()
+                      for projection, layer in separate.items() for name in ("weight", "bias")}
+        state_dict.update({f"output_linear.{name}": value
+                           for name, value in self.multi_head_attention.output_linear.state_dict().items()})
+        self.multi_head_attention.load_state_dict(state_dict)
+
+        def heads(projection, inputs):
+            output = separate[projection](inputs).reshape(self.batch_size, -1, self.num_heads, self.embed_len // self.num_heads)
+            return output.transpose(1, 2)
+
+        x = self.queries
+        attention = self.multi_head_attention.attention
+        expected = attention(heads("q", x), heads("k", x), heads("v", x)).transpose(1, 2).reshape(x.shape)
+        expected = self.multi_head_attention.output_linear(expected)
+        with torch.no_grad():
+            # Same tensor (packed path), and equal but distinct tensors (separate projections)
+            self.assertTrue(torch.allclose(self.multi_head_attention(x, x, x), expected, atol=1e-5))
+            self.assertTrue(torch.allclose(self.multi_head_attention(x, x.clone(), x.clone()), expected, atol=1e-5))
+
+        # The packed layout is saved, and loads back
+        packed = self.multi_head_attention.state_dict()
+        self.assertEqual(packed["qkv_linear.weight"].shape, (3 * self.embed_len, self.embed_len))
+        self.assertNotIn("q_linear.weight", packed)
+        MultiHeadedAttention(self.num_heads, self.embed_len).load_state_dict(packed)
+
+    def test_projection_views(self):
+        """
+        Test that q_linear, k_linear and v_linear are read-only views of the packed projection.
+        """
+        qkv = self.multi_head_attention.qkv_linear
+        x = self.queries
+        for index, name in enumerate(("q_linear", "k_linear", "v_linear")):
+            view = getattr(self.multi_head_attention, name)
+            rows = slice(index * self.embed_len, (index + 1) * self.embed_len)
+            self.assertEqual(view.weight.shape, (self.embed_len, self.embed_len))
+            self.assertEqual(view.weight.data_ptr(), qkv.weight[rows].data_ptr())
+            self.assertEqual(view.bias.data_ptr(), qkv.bias[rows].data_ptr())
+            self.assertTrue(torch.allclose(view(x), qkv(x)[..., rows]))
+            with self.assertRaises(AttributeError):
+                setattr(self.multi_head_attention, name, torch.nn.Linear(self.embed_len, self.embed_len))
+
+        self.multi_head_attention.k_linear(x).sum().backward()
+        self.assertEqual(qkv.weight.grad[:self.embed_len].abs().sum().item(), 0.0)
+        self.assertGreater(qkv.weight.grad[self.embed_len:2 * self.embed_len].abs().sum().item(), 0.0)
+
 
 if __name__ == '__main__':
     unittest.main()
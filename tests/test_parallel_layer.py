@@ -0,0 +1,107 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.parallel_layer import ParallelTorchLayer
+from layers.qnn_circuit import qnn_circuit
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires
+
+dev = qml.device("strawberryfields.fock", wires=2, cutoff_dim=3)
+
+
+@qml.qnode(dev, interface="torch")
+def circuit(inputs, var):
+    QuantumDataEncoder(2).encode(inputs)
+    layer = QuantumNeuralNetworkLayer(2)
+    for v in var:
+        layer.apply(v)
+    return qml.probs(wires=[0, 1])
+
+
+class TestParallelTorchLayer(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a TorchLayer and a ParallelTorchLayer with two workers and the same weights.
+        """
+        weight_shapes = {"var": (1, 14)}
+        self.reference = qml.qnn.TorchLayer(circuit, weight_shapes)
+        self.layer = ParallelTorchLayer(circuit, weight_shapes, num_workers=2)
+        with torch.no_grad():
+            self.reference.var.copy_(0.1 * torch.randn(1, 14))
+            self.layer.var.copy_(self.reference.var)
+
+    def tearDown(self):
+        self.layer.close()
+
+    def test_matches_torch_layer(self):
+        """
+        Test that the sharded outputs and gradients match the TorchLayer ones.
+        """
+        inputs = 0.1 * torch.rand(5, 4)
+        grads = []
+        for qlayer in (self.reference, self.layer):
+            x = inputs.clone().requires_grad_(True)
+            output = qlayer(x)
+            output.pow(2).sum().backward()
+            grads.append((output, qlayer.var.grad, x.grad))
+
+        for expected, actual in zip(*grads):
+            self.assertEqual(actual.shape, expected.shape)
+            self.assertTrue(torch.allclose(actual, expected, atol=1e-6))
+
+    def test_small_batch(self):
+        """
+        Test that batches with fewer samples than workers are supported.
+        """
+        inputs = 0.1 * torch.rand(1, 4)
+        self.assertTrue(torch.allclose(self.layer(inputs), self.reference(inputs), atol=1e-6))
+
+    def test_quantum_neural_network_workers(self):
+        """
+        Test that QuantumNeuralNetwork builds a ParallelTorchLayer when num_workers is set.
+        """
+        qlayer = QuantumNeuralNetwork(2, num_wires, qnn_circuit, num_workers=2).qlayers
+        self.assertIsInstance(qlayer, ParallelTorchLayer)
+        self.assertEqual(qlayer.start_method, "forkserver")
+        self.assertEqual(self.layer.start_method, "fork")
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch", num_workers=2)
+
+    def test_forkserver_factory(self):
+        """
+        Test that workers started with "forkserver" build the QNode from a picklable factory.
+        """
+        reference = qml.qnn.TorchLayer(qnn_circuit.qnode(2, 2), {"var": (1, 14)})
+        layer = QuantumNeuralNetwork(1, 2, qnn_circuit, num_basis=2, num_workers=2).qlayers
+        try:
+            with torch.no_grad():
+                layer.var.copy_(reference.var)
+            inputs = 0.1 * torch.rand(3, 4)
+            self.assertTrue(torch.allclose(layer(inputs), reference(inputs), atol=1e-6))
+        finally:
+            layer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.precision import validate_precision
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires
+
+
+class TestPrecision(unittest.TestCase):
+
+    def test_backend_precision(self):
+        """
+        Test that the backend precision is resolved into a complex dtype.
+        """
+        self.assertEqual(FockBackend(2, 3, dtype="single").dtype, torch.complex64)
+        self.assertEqual(FockBackend(2, 3, dtype="double").dtype, torch.complex128)
+        self.assertEqual(FockBackend(2, 3, dtype=torch.complex64).dtype, torch.complex64)
+        with self.assertRaises(ValueError):
+            FockBackend(2, 3, dtype="half")
+
+    def test_quantum_neural_network_precision(self):
+        """
+        Test that QuantumNeuralNetwork simulates in single precision with the torch backend only.
+        """
+        qnn = QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch", precision="single")
+        self.assertEqual(qnn.qlayers.backend.dtype, torch.complex64)
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, precision="single")
+
+    def test_validate_precision(self):
+        """
+        Test that the single precision probabilities deviate little from the double precision ones.
+        """
+        qnn = QuantumNeuralNetwork(2, num_wires, qnn_circuit)
+        weights = {"var": torch.as_tensor(qnn.weights)}
+        report = validate_precision(qnn_circuit, weights, torch.rand(16, 10), num_wires, 3)
+
+        self.assertGreater(report["max_deviation"], 0.0)
+        self.assertLess(report["max_deviation"], 1e-5)
+        self.assertLessEqual(report["mean_deviation"], report["max_deviation"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.measurements import basis_probs, marginal_probs, top_k_probs
+from backends.mps_backend import MPSBackend
+from backends.torch_fock_layer import TorchFockLayer
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+from layers.weight_initializer import WeightInitializer
+
+
+def make_circuit(wires, measurement):
+    def circuit(inputs, var):
+        QuantumDataEncoder(wires).encode(inputs)
+        layer = QuantumNeuralNetworkLayer(wires)
+        for v in var:
+            layer.apply(v)
+        return measurement()
+    return circuit
+
+
+class TestProbabilityOutputs(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize the joint probabilities of a 4-wire QNN circuit with cutoff 3 as a reference.
+        """
+        self.weights = torch.as_tensor(WeightInitializer.init_weights(2, 4, active_sd=0.1, passive_sd=0.5))
+        self.inputs = torch.rand(5, 12, dtype=torch.float64)
+        self.joint = self.evaluate(FockBackend(4, 3), lambda: qml.probs(wires=[0, 1, 2, 3]))
+
+    def evaluate(self, backend, measurement, inputs=None):
+        layer = TorchFockLayer(make_circuit(4, measurement), {"var": self.weights.shape}, backend)
+        with torch.no_grad():
+            layer.var.copy_(self.weights)
+        return layer(self.inputs if inputs is None else inputs)
+
+    def backends(self):
+        return [FockBackend(4, 3), MPSBackend(4, 3)]
+
+    def test_marginal_probs(self):
+        """
+        Test that the marginals are the sums of the joint probabilities over the other wires.
+        """
+        joint = self.joint.reshape(5, 3, 3, 3, 3)
+        expected = torch.cat([joint.sum(dim=[d for d in range(1, 5) if d != w + 1]) for w in (3, 1)], dim=-1)
+        for backend in self.backends():
+            output = self.evaluate(backend, lambda: marginal_probs(wires=[3, 1]))
+            self.assertEqual(output.shape, (5, 6))
+            self.assertTrue(torch.allclose(output, expected, atol=1e-12))
+
+    def test_basis_probs(self):
+        """
+        Test the probabilities of selected basis states of every wire and of a subset of the wires.
+        """
+        states = [(0, 0, 0, 0), (1, 0, 2, 0), (0, 1, 1, 1)]
+        expected = self.joint[:, [0, 33, 13]]
+        subset = self.joint.reshape(5, 3, 3, 3, 3).sum(dim=(1, 3))[:, [2, 1], [0, 1]]
+        for backend in self.backends():
+            self.assertTrue(torch.allclose(self.evaluate(backend, lambda: basis_probs(states)), expected, atol=1e-12))
+            output = self.evaluate(backend, lambda: basis_probs([(0, 2), (1, 1)], wires=[3, 1]))
+            self.assertTrue(torch.allclose(output, subset, atol=1e-12))
+
+    def test_top_k_probs(self):
+        """
+        Test that the top-k outputs are the largest joint probabilities and their indices, and that
+        they are differentiable.
+        """
+        values, indices = torch.topk(self.joint, 4)
+        for backend in self.backends():
+            inputs = self.inputs.clone().requires_grad_(True)
+            output = self.evaluate(backend, lambda: top_k_probs(4), inputs)
+            self.assertEqual(output.shape, (5, 2, 4))
+            self.assertTrue(torch.allclose(output[:, 0], values, atol=1e-12))
+            self.assertTrue(torch.equal(output[:, 1].long(), indices))
+            output[:, 0].sum().backward()
+            self.assertTrue(torch.isfinite(inputs.grad).all())
+
+    def test_invalid_basis_states(self):
+        """
+        Test that basis states with the wrong number of entries or photon numbers are rejected.
+        """
+        with self.assertRaises(ValueError):
+            basis_probs([(0, 1)], wires=[0, 1, 2])
+        for backend in self.backends():
+            with self.assertRaises(ValueError):
+                self.evaluate(backend, lambda: basis_probs([(0, 0, 0, 3)]))
+
+    def test_process_state(self):
+        """
+        Test the measurements on a device that evaluates them from the state vector.
+        """
+        dev = qml.device("default.qubit", wires=3)
+
+        def evaluate(measurement):
+            def circuit():
+                qml.RX(0.3, wires=0)
+                qml.RY(0.7, wires=1)
+                qml.CNOT(wires=[1, 2])
+                return measurement()
+            return qml.QNode(circuit, dev)()
+
+        probs = evaluate(lambda: qml.probs(wires=[2, 0]))
+        top_k = evaluate(lambda: top_k_probs(2, wires=[2, 0]))
+        self.assertTrue(torch.allclose(torch.as_tensor(top_k[0]), torch.as_tensor(probs[[0, 2]])))
+        self.assertEqual(top_k[1].tolist(), [0.0, 2.0])
+        basis = evaluate(lambda: basis_probs([(1, 0), (0, 1)], wires=[2, 0]))
+        self.assertTrue(torch.allclose(torch.as_tensor(basis), torch.as_tensor(probs[[2, 1]])))
+        marginals = evaluate(marginal_probs)
+        self.assertEqual(len(marginals), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
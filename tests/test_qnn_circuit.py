@@ -19,9 +19,11 @@ import pennylane as qml
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from layers.qnn_circuit import qnn_circuit
+from layers.qnn_circuit import QNNCircuit, build_device, qnn_circuit
 from layers.quantum_data_encoder import QuantumDataEncoder
 from layers.qnn_layer import QuantumNeuralNetworkLayer
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils import config
 from utils.config import num_wires, num_basis, single_output, multi_output, probabilities
 
 
@@ -78,6 +80,46 @@ class TestQNNCircuit(unittest.TestCase):
             self.assertAlmostEqual(sum(output[0]), 1.0,
                                    "The sum of the probabilities should be approximately 1.")
 
+
+class TestQNNCircuitFactory(unittest.TestCase):
+
+    def test_lazy_and_cached(self):
+        """
+        Test that circuits are built on first use only and cached by configuration.
+        """
+        factory = QNNCircuit()
+        self.assertIs(factory.circuit(4, 3), factory.circuit(4, 3))
+        self.assertIsNot(factory.circuit(4, 3), factory.circuit(5, 3))
+        self.assertIs(factory.circuit(4, 3), qnn_circuit.circuit(4, 3))
+
+        devices = build_device.cache_info().currsize
+        qnode = factory.qnode(3, 2)
+        self.assertIs(qnode, factory.qnode(3, 2))
+        self.assertEqual(len(qnode.device.wires), 3)
+        self.assertLessEqual(build_device.cache_info().currsize, devices + 1)
+
+    def test_config_is_read_when_building(self):
+        """
+        Test that changes to utils.config made after import are applied to the circuits built next.
+        """
+        original = config.num_wires
+        try:
+            config.num_wires = 3
+            self.assertEqual(qnn_circuit.config().num_wires, 3)
+            self.assertEqual(len(qnn_circuit.device.wires), 3)
+        finally:
+            config.num_wires = original
+
+    def test_models_of_different_sizes(self):
+        """
+        Test that QNNs of different sizes coexist in one process.
+        """
+        small = QuantumNeuralNetwork(2, 2, qnn_circuit, backend="torch", num_basis=3).qlayers
+        large = QuantumNeuralNetwork(2, 4, qnn_circuit, backend="torch", num_basis=2).qlayers
+        self.assertEqual(small(torch.rand(3, 6)).shape, (3, 3 ** 2))
+        self.assertEqual(large(torch.rand(3, 6)).shape, (3, 2 ** 4))
+
+
 if __name__ == '__main__':
     # Run the test suite
     result = unittest.main(exit=False)
@@ -109,6 +109,26 @@ class TestQuantumDataEncoder(unittest.TestCase):
         output = circuit(multiple_rounds_data)
         self.assertEqual(len(output), self.num_wires)
 
+    def test_batched_encoding(self):
+        """
+        Test that a (batch, num_features) tensor is encoded with one gate per layout entry,
+        whose parameters are the columns of the per-sample encodings.
+        """
+        batch = torch.randn(5, 8 * self.num_wires)
+
+        with qml.tape.QuantumTape() as batched_tape:
+            self.encoder.encode(batch)
+        with qml.tape.QuantumTape() as sample_tape:
+            self.encoder.encode(batch[3])
+
+        self.assertEqual(len(batched_tape.operations), len(self.encoder.schedule(8 * self.num_wires)))
+        self.assertEqual([op.name for op in batched_tape.operations], [op.name for op in sample_tape.operations])
+        for batched_op, sample_op in zip(batched_tape.operations, sample_tape.operations):
+            self.assertEqual(batched_op.wires, sample_op.wires)
+            for batched_param, sample_param in zip(batched_op.parameters, sample_op.parameters):
+                self.assertEqual(batched_param.shape, (5,))
+                self.assertEqual(batched_param[3], sample_param)
+
     def test_invalid_data_type(self):
         """
         Test that the QuantumDataEncoder raises an error when given invalid input data.
@@ -14,6 +14,7 @@
 # ==============================================================================
 
 # Test the FeedForwardBlock class
+import unittest
 import torch
 import sys
 import os
@@ -25,6 +26,7 @@ if src_dir not in sys.path:
     sys.path.append(src_dir)
 from models import QuantumFeedForward
 from layers import qnn_circuit
+from utils.config import num_layers, num_wires
 
 
 def test_feed_forward_block(num_layers, num_wires,quantum_nn,embed_len):
@@ -53,6 +55,39 @@ def test_feed_forward_block(num_layers, num_wires,quantum_nn,embed_len):
 
     print("Test passed!")
 
+class TestBatchedQuantumFeedForward(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a QuantumFeedForward block on the batched PyTorch backend.
+        """
+        self.embed_len = 2 ** num_wires
+        self.model = QuantumFeedForward(num_layers, num_wires, qnn_circuit, self.embed_len, dropout=0.0, backend="torch")
+        self.calls = []
+        self.model.qnn_model.register_forward_hook(lambda module, inputs, output: self.calls.append(inputs[0].shape[0]))
+
+    def test_single_batched_call(self):
+        """
+        Test that all the tokens of the batch are simulated in one call.
+        """
+        output = self.model(torch.rand(4, 5, self.embed_len))
+
+        self.assertEqual(output.shape, (4, 5, self.embed_len))
+        self.assertEqual(self.calls, [20])
+
+    def test_chunk_size(self):
+        """
+        Test that chunking bounds the number of tokens per call without changing the outputs.
+        """
+        x = torch.rand(4, 5, self.embed_len)
+        expected = self.model(x)
+        self.model.chunk_size = 8
+        self.calls.clear()
+
+        self.assertTrue(torch.allclose(self.model(x), expected, atol=1e-6))
+        self.assertEqual(self.calls, [8, 8, 4])
+
+
 def main():
     # Run all tests
     test_feed_forward_block()
@@ -0,0 +1,93 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.mps_backend import MPSBackend
+from backends.sampling import ShotSampler
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires
+
+
+class TestShotSampler(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a batched 3-wire circuit measuring two quadratures and the photon numbers of a wire.
+        """
+        torch.manual_seed(0)
+        inputs = torch.rand(4, 3)
+        with qml.tape.QuantumTape() as self.tape:
+            for wire in range(3):
+                qml.Displacement(inputs[:, wire], 0.3, wires=wire)
+                qml.Squeezing(0.2, 0.4, wires=wire)
+                qml.Kerr(0.3, wires=wire)
+            qml.Beamsplitter(0.5, 0.2, wires=[0, 1])
+            qml.Beamsplitter(0.5, 0.2, wires=[1, 2])
+            qml.expval(qml.X(0))
+            qml.expval(qml.P(2))
+            qml.probs(wires=[1])
+        self.exact = FockBackend(3, 5).execute(self.tape)
+
+    def test_estimates_converge(self):
+        """
+        Test that the shot estimates of both backends agree with the exact results within the shot noise.
+        """
+        for backend in (FockBackend(3, 5, sampler=ShotSampler(100000, seed=1)),
+                        MPSBackend(3, 5, sampler=ShotSampler(100000, seed=1))):
+            estimates = backend.execute(self.tape)
+            self.assertEqual(estimates.shape, self.exact.shape)
+            self.assertLess((estimates - self.exact).abs().max().item(), 0.02)
+
+    def test_seeded_reproducibility(self):
+        """
+        Test that the same seed reproduces the same shots and that reseeding restarts the stream.
+        """
+        sampler = ShotSampler(100, seed=3)
+        backend = FockBackend(3, 5, sampler=sampler)
+        first = backend.execute(self.tape)
+        self.assertFalse(torch.equal(first, backend.execute(self.tape)))
+        sampler.manual_seed(3)
+        self.assertTrue(torch.equal(first, backend.execute(self.tape)))
+        self.assertTrue(torch.equal(first, FockBackend(3, 5, sampler=ShotSampler(100, seed=3)).execute(self.tape)))
+
+    def test_counts(self):
+        """
+        Test that the counts of every sample sum to the number of shots.
+        """
+        probs = FockBackend(3, 5).execute(qml.tape.QuantumTape(self.tape.operations, [qml.probs(wires=[0, 1])]))
+        counts = ShotSampler(50, seed=0, counts=True).probabilities(probs)
+        self.assertEqual(counts.shape, (4, 25))
+        self.assertTrue(torch.equal(counts.sum(-1), torch.full((4,), 50.0, dtype=counts.dtype)))
+
+    def test_quantum_neural_network_shots(self):
+        """
+        Test the shots option of QuantumNeuralNetwork and that it is rejected on Strawberry Fields.
+        """
+        qlayers = QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch", shots=20, seed=0).qlayers
+        output = qlayers(torch.rand(3, 10))
+        self.assertTrue(torch.equal(output * 20, (output * 20).round()))
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, shots=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,7 @@ import time
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from layers.scaled_dot_product import ScaledDotProduct
+from layers.scaled_dot_product import ScaledDotProduct, blocked_causal_attention, causal_mask, chunked_attention
 
 
 def test_scaled_dot_product():
@@ -91,7 +91,69 @@ def test_edge_cases():
     print("Edge case for large tensors passed!")
 
 
+def reference_causal_attention(queries, keys, values):
+    # Masks the scores before the softmax over the whole (query_len, key_len) matrix
+    scores = torch.matmul(queries, keys.transpose(-2, -1)) / queries.size(-1) ** 0.5
+    scores = scores.masked_fill(~causal_mask(queries.size(-2), keys.size(-2)), float("-inf"))
+    return torch.matmul(torch.softmax(scores, dim=-1), values)
+
+
+def test_causal_attention():
+    # The fused and blocked causal paths match the reference, including queries that are the last
+    # positions of the sequence (incremental decoding)
+    torch.manual_seed(0)
+    keys = torch.rand(2, 4, 40, 8, dtype=torch.float64)
+    values = torch.rand(2, 4, 40, 8, dtype=torch.float64)
+    for query_len in (40, 7, 1):
+        queries = torch.rand(2, 4, query_len, 8, dtype=torch.float64)
+        expected = reference_causal_attention(queries, keys, values)
+        for fused in (True, False):
+            model = ScaledDotProduct(8, mask=True, fused=fused)
+            output = model(queries, keys, values)
+            assert torch.allclose(output, expected, atol=1e-10), f"Causal attention mismatch (fused={fused})"
+
+    queries = torch.rand(2, 4, 40, 8, dtype=torch.float64)
+    output = blocked_causal_attention(queries, keys, values, 8 ** -0.5, block_size=16)
+    assert torch.allclose(output, reference_causal_attention(queries, keys, values), atol=1e-10)
+
+    # The rows of the attention weights are normalized
+    output = ScaledDotProduct(8, mask=True)(queries, keys, torch.ones_like(values))
+    assert torch.allclose(output, torch.ones_like(output))
+
+    # Without a mask (None or False), every query attends to every key
+    full = torch.matmul(torch.softmax(torch.matmul(queries, keys.transpose(-2, -1)) / 8 ** 0.5, -1), values)
+    for mask in (None, False):
+        for fused in (True, False):
+            assert torch.allclose(ScaledDotProduct(8, mask=mask, fused=fused)(queries, keys, values), full, atol=1e-10)
+
+
+def test_chunked_attention():
+    # The tiled online-softmax attention matches the dense attention, including uneven blocks and
+    # queries that are the last positions of the keys
+    torch.manual_seed(0)
+    keys = torch.rand(2, 3, 50, 8, dtype=torch.float64)
+    values = torch.rand(2, 3, 50, 6, dtype=torch.float64)
+    for query_len in (50, 13, 1):
+        queries = torch.rand(2, 3, query_len, 8, dtype=torch.float64)
+        expected = reference_causal_attention(queries, keys, values)
+        for block_size in (1, 7, 64):
+            output = chunked_attention(queries, keys, values, 8 ** -0.5, causal=True, block_size=block_size)
+            assert torch.allclose(output, expected, atol=1e-12), f"Chunked causal mismatch (block_size={block_size})"
+
+        output = ScaledDotProduct(8, block_size=16)(queries, keys, values)
+        expected = ScaledDotProduct(8)(queries, keys, values)
+        assert torch.allclose(output, expected, atol=1e-12), "Chunked attention mismatch"
+
+    # Large scores do not overflow the online softmax
+    queries = 100 * torch.rand(1, 1, 40, 8, dtype=torch.float64)
+    output = chunked_attention(queries, keys[:1, :1, :40], values[:1, :1, :40], 1.0, causal=True, block_size=8)
+    assert torch.allclose(output, reference_causal_attention(queries, keys[:1, :1, :40] * 8 ** 0.5,
+                                                             values[:1, :1, :40]), atol=1e-10)
+
+
 if __name__ == '__main__':
     shape = test_scaled_dot_product()
     test_edge_cases()
+    test_causal_attention()
+    test_chunked_attention()
 
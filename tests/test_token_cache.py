@@ -0,0 +1,124 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_feed_forward import QuantumFeedForward
+from models.quantum_transformer import QuantumTransformer
+from models.output_cache import OutputCache
+from models.token_cache import TokenCache
+from utils.config import num_layers, num_wires
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a QuantumFeedForward block with a token cache, and a batch with repeated tokens.
+        """
+        self.embed_len = 2 ** num_wires
+        self.model = QuantumFeedForward(num_layers, num_wires, qnn_circuit, self.embed_len, dropout=0.0,
+                                        backend="torch", token_cache=TokenCache())
+        self.model.eval()
+        tokens = torch.rand(3, self.embed_len)
+        self.x = tokens[torch.tensor([[0, 1, 0, 2], [2, 2, 1, 0]])]
+
+    def test_outputs_and_hits(self):
+        """
+        Test that cached outputs match the uncached ones and that repeated tokens are hits.
+        """
+        expected = self.model(self.x)
+        with torch.no_grad():
+            output = self.model(self.x)
+            self.assertTrue(torch.allclose(output, expected, atol=1e-6))
+            self.assertEqual(self.model.token_cache.stats()["misses"], 3)
+            self.assertEqual(self.model.token_cache.stats()["hits"], 5)
+
+            self.model(self.x)
+            self.assertEqual(self.model.token_cache.stats()["hits"], 13)
+            self.assertEqual(self.model.token_cache.stats()["entries"], 3)
+
+    def test_invalidation(self):
+        """
+        Test that the cache is emptied when the weights change.
+        """
+        with torch.no_grad():
+            self.model(self.x)
+            self.model.qnn_model.var.add_(0.1)
+            output = self.model(self.x)
+
+        self.assertEqual(self.model.token_cache.stats()["invalidations"], 1)
+        self.assertEqual(self.model.token_cache.stats()["misses"], 6)
+        self.model.token_cache = None
+        with torch.no_grad():
+            self.assertTrue(torch.allclose(output, self.model(self.x), atol=1e-6))
+
+    def test_memory_budget(self):
+        """
+        Test that the least recently used entries are evicted to respect the byte budget.
+        """
+        entry_bytes = self.embed_len * 8 + self.embed_len * 4
+        self.model.token_cache = TokenCache(max_bytes=2 * entry_bytes)
+        with torch.no_grad():
+            self.model(self.x)
+
+        stats = self.model.token_cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+        self.assertLessEqual(stats["bytes"], 2 * entry_bytes)
+
+    def test_not_used_with_gradients(self):
+        """
+        Test that the cache is bypassed when gradients are required.
+        """
+        self.model(self.x).sum().backward()
+        self.assertEqual(self.model.token_cache.stats()["entries"], 0)
+        self.assertIsNotNone(self.model.qnn_model.var.grad)
+
+    def test_output_cache_is_abstract(self):
+        """
+        Test that an OutputCache subclass without keys cannot be instantiated.
+        """
+        class KeylessCache(OutputCache):
+            pass
+
+        with self.assertRaises(TypeError):
+            KeylessCache(2 ** 10)
+
+    def test_transformer_token_caches(self):
+        """
+        Test that QuantumTransformer gives every QuantumFeedForward block its own token cache, which
+        is used in inference.
+        """
+        torch.manual_seed(0)
+        model = QuantumTransformer(1, 1, self.embed_len, 8, num_layers, num_wires, qnn_circuit, 2, 20,
+                                   backend="torch", token_cache=TokenCache, causal_decoder=True).eval()
+        caches = [layer.quantum_feed_forward.token_cache for layer in [*model.encoder_layers, *model.decoder_layers]]
+        self.assertEqual(len({id(cache) for cache in caches}), 2)
+
+        plain = QuantumTransformer(1, 1, self.embed_len, 8, num_layers, num_wires, qnn_circuit, 2, 20,
+                                   backend="torch", causal_decoder=True).eval()
+        plain.load_state_dict(model.state_dict())
+        src = torch.randint(0, 20, (2, 4))
+        tgt = torch.zeros(2, 1, dtype=torch.long)
+        self.assertTrue(torch.equal(model.generate(src, tgt, 3), plain.generate(src, tgt, 3)))
+        self.assertTrue(all(cache.stats()["misses"] > 0 for cache in caches))
+
+
+if __name__ == '__main__':
+    unittest.main()
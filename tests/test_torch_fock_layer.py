@@ -0,0 +1,173 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import pennylane as qml
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from backends.fock_backend import FockBackend
+from backends.torch_fock_layer import TorchFockLayer
+from layers.qnn_circuit import qnn_circuit
+from layers.qnn_layer import QuantumNeuralNetworkLayer
+from layers.quantum_data_encoder import QuantumDataEncoder
+from models.quantum_neural_network import QuantumNeuralNetwork
+from utils.config import num_wires, num_basis
+
+
+class TestTorchFockLayer(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a TorchLayer on the Strawberry Fields device and a TorchFockLayer with the same weights.
+        """
+        self.weight_shapes = {"var": QuantumNeuralNetwork(2, num_wires, qnn_circuit).weights.shape}
+        self.reference = qml.qnn.TorchLayer(qnn_circuit, self.weight_shapes)
+        self.layer = TorchFockLayer(qnn_circuit, self.weight_shapes, FockBackend(num_wires, num_basis))
+        with torch.no_grad():
+            self.layer.var.copy_(self.reference.var)
+
+    def test_matches_torch_layer(self):
+        """
+        Test that the batched layer reproduces the per-sample TorchLayer outputs.
+        """
+        inputs = torch.rand(4, 10)
+        expected = self.reference(inputs)
+        output = self.layer(inputs)
+
+        self.assertEqual(output.shape, expected.shape)
+        self.assertTrue(torch.allclose(output, expected, atol=1e-5))
+
+    def test_extra_batch_dimensions(self):
+        """
+        Test that inputs with several leading dimensions are flattened and restored.
+        """
+        inputs = torch.rand(2, 3, 10)
+        output = self.layer(inputs)
+
+        self.assertEqual(output.shape[:2], (2, 3))
+        self.assertTrue(torch.allclose(output[1, 2], self.layer(inputs[1, 2:3])[0]))
+
+    def test_backward(self):
+        """
+        Test that the weights and the inputs receive gradients.
+        """
+        inputs = torch.rand(4, 10, requires_grad=True)
+        self.layer(inputs).sum().backward()
+
+        self.assertEqual(self.layer.var.grad.shape, self.layer.var.shape)
+        self.assertEqual(inputs.grad.shape, inputs.shape)
+
+    def test_hoisted_weights(self):
+        """
+        Test that hoisting the weight-only layers gives the same outputs and gradients.
+        """
+        plain = TorchFockLayer(qnn_circuit, self.weight_shapes, FockBackend(num_wires, num_basis), hoist_weights=False)
+        with torch.no_grad():
+            plain.var.copy_(self.layer.var)
+        inputs = torch.rand(4, 10)
+
+        self.layer(inputs).sum().backward()
+        plain(inputs).sum().backward()
+        self.assertTrue(torch.allclose(self.layer(inputs), plain(inputs), atol=1e-6))
+        self.assertTrue(torch.allclose(self.layer.var.grad, plain.var.grad, atol=1e-6))
+
+    def test_transfer_operator_reuse(self):
+        """
+        Test that the transfer operator is reused in inference until the weights change, and that
+        every forward pass with gradients builds its own.
+        """
+        inputs = torch.rand(4, 10)
+        with torch.no_grad():
+            self.layer(inputs)
+            transfer = self.layer._transfer[1]
+            self.layer(inputs)
+            self.assertIs(self.layer._transfer[1], transfer)
+            self.layer.var.add_(0.1)
+            self.layer(inputs)
+            self.assertIsNot(self.layer._transfer[1], transfer)
+
+        # Gradient accumulation: the second backward pass must not go through a freed graph
+        for _ in range(2):
+            self.layer(inputs).sum().backward()
+        self.assertIsNone(self.layer._transfer)
+
+        # Two pending graphs, backpropagated one after the other, match the unhoisted layer
+        plain = TorchFockLayer(qnn_circuit, self.weight_shapes, FockBackend(num_wires, num_basis), hoist_weights=False)
+        with torch.no_grad():
+            plain.var.copy_(self.layer.var)
+        for layer in (self.layer, plain):
+            layer.zero_grad()
+            first = layer(inputs).sum()
+            second = layer(torch.rand(4, 10, generator=torch.Generator().manual_seed(1))).sum()
+            first.backward()
+            second.backward()
+        self.assertTrue(torch.allclose(self.layer.var.grad, plain.var.grad, atol=1e-6))
+
+    def test_backprop_matches_parameter_shift(self):
+        """
+        Test that the backpropagated gradients of the weights and inputs match parameter-shift on the
+        Strawberry Fields device.
+        """
+        def circuit(inputs, var):
+            QuantumDataEncoder(2).encode(inputs)
+            layer = QuantumNeuralNetworkLayer(2)
+            for v in var:
+                layer.apply(v)
+            return qml.probs(wires=[0, 1])
+
+        dev = qml.device("strawberryfields.fock", wires=2, cutoff_dim=3)
+        weight_shapes = {"var": (1, 14)}
+        reference = qml.qnn.TorchLayer(qml.QNode(circuit, dev, interface="torch", diff_method="parameter-shift"),
+                                       weight_shapes)
+        layer = TorchFockLayer(circuit, weight_shapes, FockBackend(2, 3))
+        with torch.no_grad():
+            reference.var.copy_(0.1 * torch.randn(1, 14))
+            layer.var.copy_(reference.var)
+
+        inputs = 0.1 * torch.rand(2, 4)
+        grads = []
+        for qlayer in (reference, layer):
+            x = inputs.clone().requires_grad_(True)
+            qlayer(x).pow(2).sum().backward()
+            grads.append((qlayer.var.grad, x.grad))
+
+        self.assertTrue(torch.allclose(grads[0][0], grads[1][0], atol=1e-5))
+        self.assertTrue(torch.allclose(grads[0][1], grads[1][1], atol=1e-5))
+
+    def test_quantum_neural_network_backend(self):
+        """
+        Test that QuantumNeuralNetwork builds the layer selected by its backend argument.
+        """
+        self.assertIsInstance(QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch").qlayers, TorchFockLayer)
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="unknown")
+
+    def test_quantum_neural_network_diff_method(self):
+        """
+        Test that QuantumNeuralNetwork resolves and validates its differentiation method.
+        """
+        self.assertEqual(QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch").diff_method, "backprop")
+        qnn = QuantumNeuralNetwork(2, num_wires, qnn_circuit, diff_method="parameter-shift")
+        self.assertEqual(qnn.qlayers.qnode.diff_method, "parameter-shift")
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, diff_method="backprop")
+        with self.assertRaises(ValueError):
+            QuantumNeuralNetwork(2, num_wires, qnn_circuit, backend="torch", diff_method="parameter-shift")
+
+
+if __name__ == '__main__':
+    unittest.main()
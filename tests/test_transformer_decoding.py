@@ -0,0 +1,187 @@
+# Copyright 2024 The qAIntum.ai Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+import torch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from layers.multi_headed_attention import AttentionCache, MultiHeadedAttention
+from layers.qnn_circuit import qnn_circuit
+from models.quantum_decoder import QuantumDecoder
+from models.quantum_transformer import QuantumTransformer
+from utils.config import num_wires, num_basis
+
+
+class TestIncrementalDecoding(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialize a small transformer on the torch backend, whose QNN outputs num_basis ** num_wires
+        probabilities per token.
+        """
+        torch.manual_seed(0)
+        self.embed_len = num_basis ** num_wires
+        self.model = QuantumTransformer(2, 1, self.embed_len, 8, 2, num_wires, qnn_circuit, 2, 20,
+                                        backend="torch", causal_decoder=True).eval()
+        self.src = torch.randint(0, 20, (2, 5))
+
+    def test_attention_cache(self):
+        """
+        Test that attending with cached keys and values matches attending over the whole sequence.
+        """
+        attention = MultiHeadedAttention(4, 16)
+        x = torch.rand(2, 6, 16)
+        cache = AttentionCache()
+        steps = [attention(x[:, :3], x[:, :3], x[:, :3], cache=cache)]
+        steps += [attention(x[:, i:i + 1], x[:, i:i + 1], x[:, i:i + 1], cache=cache) for i in range(3, 6)]
+        self.assertEqual(len(cache), 6)
+        full = attention(x, x, x)
+        self.assertTrue(torch.allclose(steps[-1], full[:, -1:], atol=1e-6))
+
+    def test_generate_matches_forward(self):
+        """
+        Test that every token of greedy generation with caches is the argmax of the logits of the full
+        forward pass over the generated sequence, i.e. that the cached decoder attends to the whole
+        encoder output like the uncached one.
+        """
+        generated = self.model.generate(self.src, torch.zeros(2, 1, dtype=torch.long), max_new_tokens=4)
+        self.assertEqual(generated.shape, self.src.shape)
+        with torch.no_grad():
+            logits = self.model(self.src, generated)
+        self.assertTrue(torch.equal(generated[:, 1:], logits[:, :-1].argmax(-1)))
+
+    def test_causal_decoding(self):
+        """
+        Test that decoding a whole target with a stack of decoder layers matches decoding it token by
+        token with caches, i.e. that the decoder self attention is causal.
+        """
+        model = QuantumTransformer(1, 2, self.embed_len, 8, 2, num_wires, qnn_circuit, 2, 20, backend="torch",
+                                   causal_decoder=True).eval()
+        src = torch.randint(0, 20, (2, 6))
+        tgt = torch.randint(0, 20, (2, 6))
+        with torch.no_grad():
+            memory = model.encode(src)
+            full = model.decode(tgt, memory)
+            caches = [layer.init_cache() for layer in model.decoder_layers]
+            steps = [model.decode(tgt[:, i:i + 1], memory, caches, offset=i) for i in range(6)]
+        self.assertTrue(torch.allclose(full, torch.cat(steps, dim=1), atol=1e-5))
+
+    def test_decoder_mask_default(self):
+        """
+        Test that QuantumDecoder and QuantumTransformer keep an unmasked decoder self attention by
+        default, which incremental decoding rejects, and that causal_decoder makes it causal.
+        """
+        decoder = QuantumDecoder(self.embed_len, 2, 2, num_wires, qnn_circuit, backend="torch")
+        self.assertFalse(decoder.multihead_self_attention.attention.causal)
+        for layer in self.model.decoder_layers:
+            self.assertTrue(layer.multihead_self_attention.attention.causal)
+            self.assertFalse(layer.multihead_enc_dec_attention.attention.causal)
+
+        model = QuantumTransformer(1, 1, self.embed_len, 8, 2, num_wires, qnn_circuit, 2, 20, backend="torch").eval()
+        self.assertFalse(model.decoder_layers[0].multihead_self_attention.attention.causal)
+        tgt = torch.zeros(2, 1, dtype=torch.long)
+        with self.assertRaises(ValueError):
+            model.generate(self.src, tgt, 2)
+        with self.assertRaises(ValueError):
+            model.beam_search(self.src, tgt, 2, 2)
+
+    def test_generate_runs_only_new_tokens(self):
+        """
+        Test that every decoding step runs a single token per sequence through the decoder's QNN,
+        and that finished sequences stop the generation.
+        """
+        rows = []
+        qnn = self.model.decoder_layers[0].quantum_feed_forward.qnn_model
+        handle = qnn.register_forward_hook(lambda module, inputs, output: rows.append(inputs[0].shape[0]))
+        generated = self.model.generate(self.src, torch.zeros(2, 3, dtype=torch.long), max_new_tokens=5)
+        handle.remove()
+        self.assertEqual(generated.shape, (2, 8))
+        self.assertEqual(rows, [2 * 3] + [2] * 4)
+
+        first = generated[:, 3]
+        generated = self.model.generate(self.src, torch.zeros(2, 3, dtype=torch.long), max_new_tokens=5,
+                                        end_token=int(first[0]))
+        self.assertEqual(int(generated[0, -1]), int(first[0]))
+        if int(first[1]) == int(first[0]):
+            self.assertEqual(generated.shape, (2, 4))
+
+    def test_beam_search_greedy(self):
+        """
+        Test that beam search with a single beam is greedy decoding.
+        """
+        tgt = torch.zeros(2, 1, dtype=torch.long)
+        sequences, scores = self.model.beam_search(self.src, tgt, beam_size=1, max_new_tokens=4)
+        self.assertEqual(sequences.shape, (2, 1, 5))
+        self.assertTrue(torch.equal(sequences[:, 0], self.model.generate(self.src, tgt, max_new_tokens=4)))
+
+    def test_beam_search_scores(self):
+        """
+        Test that the beams are distinct, sorted, and scored by their log-probability under the full
+        decoder.
+        """
+        sequences, scores = self.model.beam_search(self.src, torch.zeros(2, 1, dtype=torch.long), beam_size=3,
+                                                   max_new_tokens=3, length_penalty=0.0)
+        self.assertEqual(sequences.shape, (2, 3, 4))
+        with torch.no_grad():
+            memory = self.model.encode(self.src)
+            for i in range(2):
+                self.assertEqual(len({tuple(beam.tolist()) for beam in sequences[i]}), 3)
+                self.assertTrue(torch.all(scores[i, :-1] >= scores[i, 1:]))
+                expected = torch.zeros(3)
+                for t in range(1, 4):
+                    logits = self.model.decode(sequences[i, :, :t], memory[i:i + 1].expand(3, -1, -1),
+                                               [QuantumDecoder.init_cache()])
+                    expected += torch.log_softmax(logits[:, -1], -1).gather(-1, sequences[i, :, t:t + 1])[:, 0]
+                self.assertTrue(torch.allclose(scores[i], expected, atol=1e-5))
+
+    def test_beam_search_batches_beams(self):
+        """
+        Test that each step runs the last token of all the beams through the decoder's QNN at once,
+        and that finished sequences leave the batch.
+        """
+        rows = []
+        qnn = self.model.decoder_layers[0].quantum_feed_forward.qnn_model
+        handle = qnn.register_forward_hook(lambda module, inputs, output: rows.append(inputs[0].shape[0]))
+        self.model.beam_search(self.src, torch.zeros(2, 2, dtype=torch.long), beam_size=3, max_new_tokens=4)
+        self.assertEqual(rows, [2 * 2] + [2 * 3] * 3)
+
+        # Make the end token the most likely one, so that the hypotheses end early
+        rows.clear()
+        end_token = 7
+        self.model.output_linear.bias.data[end_token] += 3.0
+        sequences, scores = self.model.beam_search(self.src, torch.zeros(2, 1, dtype=torch.long), beam_size=2,
+                                                   max_new_tokens=6, end_token=end_token)
+        handle.remove()
+        self.assertLess(len(rows), 6)
+        self.assertTrue(all(row <= 2 * 2 for row in rows))
+        self.assertTrue(all(end_token in beam[1:].tolist() for beam in sequences.flatten(0, 1)))
+        self.assertTrue(torch.all(torch.isfinite(scores)))
+
+    def test_beam_search_encoder_output(self):
+        """
+        Test beam search from a held encoder output, and that invalid sizes are rejected.
+        """
+        tgt = torch.zeros(2, 1, dtype=torch.long)
+        expected, _ = self.model.beam_search(self.src, tgt, beam_size=2, max_new_tokens=2)
+        sequences, _ = self.model.beam_search(None, tgt, beam_size=2, max_new_tokens=2,
+                                              encoder_output=self.model.encode(self.src))
+        self.assertTrue(torch.equal(sequences, expected))
+        with self.assertRaises(ValueError):
+            self.model.beam_search(self.src, tgt, beam_size=0, max_new_tokens=2)
+
+
+if __name__ == '__main__':
+    unittest.main()